@@ -11,6 +11,8 @@ from app.database.models.processing_job import (
     ProcessingJobRecord,
 )
 from app.database.models.upscaling_task import UpscalingTaskRecord
+from app.database.models.job_submission import JobSubmissionRecord
+from app.database.models.user_credential import UserCredentialRecord
 
 
 # this is the Alembic Config object, which provides
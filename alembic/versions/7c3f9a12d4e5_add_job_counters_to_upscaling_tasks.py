@@ -0,0 +1,56 @@
+"""add job counters to upscaling tasks
+
+Revision ID: 7c3f9a12d4e5
+Revises: 4b7d2e91c0a3
+Create Date: 2025-12-03 14:27:09.104512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3f9a12d4e5'
+down_revision: Union[str, Sequence[str], None] = '4b7d2e91c0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = {
+    'jobs_created': 'CREATED',
+    'jobs_queued': 'QUEUED',
+    'jobs_running': 'RUNNING',
+    'jobs_finished': 'FINISHED',
+    'jobs_failed': 'FAILED',
+    'jobs_canceled': 'CANCELED',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('upscaling_tasks', sa.Column('jobs_total', sa.Integer(), nullable=False, server_default='0'))
+    for column in COUNTERS:
+        op.add_column('upscaling_tasks', sa.Column(column, sa.Integer(), nullable=False, server_default='0'))
+
+    # Initialise the counters of the existing upscaling tasks
+    assignments = ', '.join(
+        [
+            'jobs_total = (SELECT COUNT(*) FROM processing_jobs '
+            'WHERE processing_jobs.upscaling_task_id = upscaling_tasks.id)'
+        ]
+        + [
+            f'{column} = (SELECT COUNT(*) FROM processing_jobs '
+            'WHERE processing_jobs.upscaling_task_id = upscaling_tasks.id '
+            f"AND processing_jobs.status = '{status}')"
+            for column, status in COUNTERS.items()
+        ]
+    )
+    op.execute(f'UPDATE upscaling_tasks SET {assignments}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in reversed(list(COUNTERS)):
+        op.drop_column('upscaling_tasks', column)
+    op.drop_column('upscaling_tasks', 'jobs_total')
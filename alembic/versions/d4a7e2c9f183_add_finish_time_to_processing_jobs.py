@@ -0,0 +1,32 @@
+"""add finish time to processing jobs
+
+Revision ID: d4a7e2c9f183
+Revises: b2d9f6e4a153
+Create Date: 2025-12-19 17:21:06.583914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7e2c9f183'
+down_revision: Union[str, Sequence[str], None] = 'b2d9f6e4a153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('processing_jobs', sa.Column('finished_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_processing_jobs_finished_at'), 'processing_jobs', ['finished_at'], unique=False)
+    # The finished jobs were last updated when they finished
+    op.execute("UPDATE processing_jobs SET finished_at = updated WHERE status = 'FINISHED'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_processing_jobs_finished_at'), table_name='processing_jobs')
+    op.drop_column('processing_jobs', 'finished_at')
@@ -0,0 +1,33 @@
+"""add credential expiry to job submissions
+
+Revision ID: e3b7c1d9a542
+Revises: c6a8d2f4e913
+Create Date: 2025-12-19 09:32:18.604127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b7c1d9a542'
+down_revision: Union[str, Sequence[str], None] = 'c6a8d2f4e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_submissions', sa.Column('credential_expires_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_job_submissions_credential_expires_at'), 'job_submissions', ['credential_expires_at'], unique=False)
+    # Queued submissions hold the plain access token of their user instead of an encrypted
+    # offline token, they are marked as expired so that their jobs are failed
+    op.execute("UPDATE job_submissions SET credential_expires_at = CURRENT_TIMESTAMP")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_submissions_credential_expires_at'), table_name='job_submissions')
+    op.drop_column('job_submissions', 'credential_expires_at')
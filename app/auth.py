@@ -128,6 +128,65 @@ async def _exchange_token_for_provider(
 
     :return: The token response (dict) on success.
 
+    :raise: Raises AuthException with an appropriate status and message on error.
+    """
+    return await _request_token(
+        {
+            "grant_type": "urn:ietf:params:oauth:grant-type:token-exchange",
+            "subject_token": initial_token,
+            "requested_issuer": provider,
+        },
+        provider,
+    )
+
+
+async def exchange_offline_token(user_token: str) -> Dict[str, Any]:
+    """
+    Exchange the access token of a user for an offline token of the dispatcher client, using the
+    Keycloak Token Exchange. The offline token allows background processes to retrieve new
+    access tokens on behalf of the user after the access token of the user expired.
+
+    :param user_token: The access token of the user.
+    :return: The token response (dict), of which `refresh_token` holds the offline token and
+        `refresh_expires_in` its lifetime in seconds, or 0 if it does not expire.
+
+    :raise: Raises AuthException with an appropriate status and message on error.
+    """
+    return await _request_token(
+        {
+            "grant_type": "urn:ietf:params:oauth:grant-type:token-exchange",
+            "subject_token": user_token,
+            "requested_token_type": "urn:ietf:params:oauth:token-type:refresh_token",
+            "scope": "offline_access",
+        },
+        settings.keycloak_realm,
+    )
+
+
+async def refresh_access_token(offline_token: str) -> Dict[str, Any]:
+    """
+    Retrieve a new access token of a user through an offline token of the user.
+
+    :param offline_token: The offline token of the user.
+    :return: The token response (dict), with the `access_token` and its lifetime `expires_in`.
+
+    :raise: Raises AuthException with an appropriate status and message on error.
+    """
+    return await _request_token(
+        {"grant_type": "refresh_token", "refresh_token": offline_token},
+        settings.keycloak_realm,
+    )
+
+
+async def _request_token(payload: Dict[str, Any], provider: str) -> Dict[str, Any]:
+    """
+    Request a token from the token endpoint of Keycloak, authenticating as the dispatcher client.
+
+    :param payload: The grant specific parameters of the token request.
+    :param provider: Name of the provider for which the token is requested, used in errors.
+
+    :return: The token response (dict) on success.
+
     :raise: Raises AuthException with an appropriate status and message on error.
     """
     token_url = f"{KEYCLOAK_BASE_URL}/protocol/openid-connect/token"
@@ -140,11 +199,9 @@ async def _exchange_token_for_provider(
         )
 
     payload = {
-        "grant_type": "urn:ietf:params:oauth:grant-type:token-exchange",
         "client_id": settings.keycloak_client_id,
         "client_secret": settings.keycloak_client_secret,
-        "subject_token": initial_token,
-        "requested_issuer": provider,
+        **payload,
     }
 
     try:
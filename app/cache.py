@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Generic, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class TTLCache(Generic[T]):
+    """
+    Bounded cache of values that expire, such as the authenticated connections to the
+    processing platforms or the access tokens of the users. Each value is kept until its own
+    expiry, typically the expiry of the access token it holds or was authenticated with. When
+    the cache is full, the least recently used value is evicted. The cache can be used from
+    multiple threads, while a lock per key makes sure that only a single coroutine retrieves the
+    value for a key.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, Tuple[float, T]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def get(self, key: str) -> Optional[T]:
+        """
+        Retrieve the value for a key, if it is cached and not expired. Expired values are
+        evicted.
+
+        :param key: The key of the value.
+        :return: The cached value or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] <= time.time():
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: T, expires_at: float):
+        """
+        Store the value for a key, evicting the least recently used values when the cache is
+        full.
+
+        :param key: The key of the value.
+        :param value: The value to store.
+        :param expires_at: Time (as a UNIX timestamp) at which the value expires.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            logger.debug(
+                f"Cache: {len(self._entries)} entries, {self.hits} hits, "
+                f"{self.misses} misses, {self.evictions} evictions"
+            )
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        """
+        Hold the lock of a key while its value is retrieved, for example while a connection is
+        set up. The lock is removed once no coroutine holds or awaits it.
+
+        :param key: The key of the value.
+        """
+        with self._lock:
+            key_lock, users = self._key_locks.get(key, (asyncio.Lock(), 0))
+            self._key_locks[key] = (key_lock, users + 1)
+        try:
+            async with key_lock:
+                yield
+        finally:
+            with self._lock:
+                key_lock, users = self._key_locks[key]
+                if users > 1:
+                    self._key_locks[key] = (key_lock, users - 1)
+                else:
+                    del self._key_locks[key]
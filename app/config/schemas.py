@@ -13,3 +13,7 @@ class BackendAuthConfig(BaseModel):
     client_credentials: Optional[str] = None
     token_provider: Optional[str] = None
     token_prefix: Optional[str] = None
+    status_concurrency: Optional[int] = None
+    submission_rate_limit: Optional[float] = None
+    max_inflight_jobs: Optional[int] = None
+    max_inflight_jobs_per_user: Optional[int] = None
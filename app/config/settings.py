@@ -1,5 +1,5 @@
 import json
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -50,6 +50,103 @@ class Settings(BaseSettings):
     )
     backend_auth_config: Dict[str, BackendAuthConfig] = Field(default_factory=dict)
 
+    # Status refresh
+    status_refresh_concurrency: int = Field(
+        default=10, json_schema_extra={"env": "STATUS_REFRESH_CONCURRENCY"}
+    )
+    status_refresh_timeout: float = Field(
+        default=10.0, json_schema_extra={"env": "STATUS_REFRESH_TIMEOUT"}
+    )
+    status_poll_min_interval: float = Field(
+        default=10.0, json_schema_extra={"env": "STATUS_POLL_MIN_INTERVAL"}
+    )
+    status_poll_max_interval: float = Field(
+        default=1800.0, json_schema_extra={"env": "STATUS_POLL_MAX_INTERVAL"}
+    )
+    status_poll_backoff_factor: float = Field(
+        default=2.0, json_schema_extra={"env": "STATUS_POLL_BACKOFF_FACTOR"}
+    )
+    status_listing_threshold: int = Field(
+        default=10, json_schema_extra={"env": "STATUS_LISTING_THRESHOLD"}
+    )
+    status_listing_limit: int = Field(
+        default=1000, json_schema_extra={"env": "STATUS_LISTING_LIMIT"}
+    )
+    status_reconciler_enabled: bool = Field(
+        default=False, json_schema_extra={"env": "STATUS_RECONCILER_ENABLED"}
+    )
+    status_reconciler_interval: float = Field(
+        default=30.0, json_schema_extra={"env": "STATUS_RECONCILER_INTERVAL"}
+    )
+    status_cache_ttl: float = Field(
+        default=5.0, json_schema_extra={"env": "STATUS_CACHE_TTL"}
+    )
+    status_snapshot_interval: int = Field(
+        default=10, json_schema_extra={"env": "STATUS_SNAPSHOT_INTERVAL"}
+    )
+
+    # Upscaling
+    upscaling_submission_concurrency: int = Field(
+        default=10, json_schema_extra={"env": "UPSCALING_SUBMISSION_CONCURRENCY"}
+    )
+    upscaling_submission_rate_limit: float = Field(
+        default=0.0, json_schema_extra={"env": "UPSCALING_SUBMISSION_RATE_LIMIT"}
+    )
+    max_grid_tiles: int = Field(
+        default=50000, json_schema_extra={"env": "MAX_GRID_TILES"}
+    )
+
+    # UDP documents
+    udp_cache_size: int = Field(default=256, json_schema_extra={"env": "UDP_CACHE_SIZE"})
+    udp_cache_ttl: float = Field(default=300.0, json_schema_extra={"env": "UDP_CACHE_TTL"})
+
+    # openEO client
+    openeo_connection_cache_size: int = Field(
+        default=1000, json_schema_extra={"env": "OPENEO_CONNECTION_CACHE_SIZE"}
+    )
+    openeo_executor_workers: int = Field(
+        default=32, json_schema_extra={"env": "OPENEO_EXECUTOR_WORKERS"}
+    )
+    openeo_metadata_ttl: float = Field(
+        default=3600.0, json_schema_extra={"env": "OPENEO_METADATA_TTL"}
+    )
+
+    # Job cancellation
+    cancel_concurrency: int = Field(
+        default=10, json_schema_extra={"env": "CANCEL_CONCURRENCY"}
+    )
+
+    # Job submission queue
+    submission_worker_enabled: bool = Field(
+        default=True, json_schema_extra={"env": "SUBMISSION_WORKER_ENABLED"}
+    )
+    submission_worker_interval: float = Field(
+        default=2.0, json_schema_extra={"env": "SUBMISSION_WORKER_INTERVAL"}
+    )
+    submission_batch_size: int = Field(
+        default=50, json_schema_extra={"env": "SUBMISSION_BATCH_SIZE"}
+    )
+    submission_lease: float = Field(
+        default=600.0, json_schema_extra={"env": "SUBMISSION_LEASE"}
+    )
+    inflight_stale_after: float = Field(
+        default=900.0, json_schema_extra={"env": "INFLIGHT_STALE_AFTER"}
+    )
+    submission_max_attempts: int = Field(
+        default=3, json_schema_extra={"env": "SUBMISSION_MAX_ATTEMPTS"}
+    )
+    submission_user_weights: Dict[str, float] = Field(
+        default_factory=dict, json_schema_extra={"env": "SUBMISSION_USER_WEIGHTS"}
+    )
+    submission_credential_key: str | None = Field(
+        default=None, json_schema_extra={"env": "SUBMISSION_CREDENTIAL_KEY"}
+    )
+
+    # Result reuse
+    result_reuse_max_age: float = Field(
+        default=604800.0, json_schema_extra={"env": "RESULT_REUSE_MAX_AGE"}
+    )
+
     def load_backends_auth_config(self):
         """
         Populate self.backends from BACKENDS_JSON if provided, otherwise keep defaults.
@@ -79,6 +176,73 @@ class Settings(BaseSettings):
                 # Fall back or raise as appropriate
                 raise
 
+        # Jobs that are held back by the limits of a backend are only released once the earlier
+        # jobs on the backend are known to have completed
+        if self.get_inflight_limits() and not self.status_reconciler_enabled:
+            raise ValueError(
+                "STATUS_RECONCILER_ENABLED must be set when a backend defines "
+                "'max_inflight_jobs' or 'max_inflight_jobs_per_user'"
+            )
+        # Jobs that were due for polling during a full reconciler interval are not reconciled
+        if self.get_inflight_limits() and (
+            self.inflight_stale_after <= self.status_reconciler_interval
+        ):
+            raise ValueError(
+                "INFLIGHT_STALE_AFTER must be larger than STATUS_RECONCILER_INTERVAL"
+            )
+
+    def get_status_concurrency(self, endpoint: str) -> int:
+        """
+        Retrieve the maximum number of concurrent status requests towards a backend. Falls back
+        to STATUS_REFRESH_CONCURRENCY when the backend does not define its own limit.
+
+        :param endpoint: URL of the backend.
+        :return: Maximum number of concurrent status requests.
+        """
+        backend = self.backend_auth_config.get(endpoint)
+        if backend and backend.status_concurrency:
+            return backend.status_concurrency
+        return self.status_refresh_concurrency
+
+    def get_submission_rate_limit(self, endpoint: str) -> float:
+        """
+        Retrieve the maximum number of job submissions per second towards a backend. Falls back
+        to UPSCALING_SUBMISSION_RATE_LIMIT when the backend does not define its own limit.
+
+        :param endpoint: URL of the backend.
+        :return: Maximum number of job submissions per second, 0 when unlimited.
+        """
+        backend = self.backend_auth_config.get(endpoint)
+        if backend and backend.submission_rate_limit:
+            return backend.submission_rate_limit
+        return self.upscaling_submission_rate_limit
+
+    def get_inflight_limits(self) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+        """
+        Retrieve the maximum number of in-flight processing jobs of the backends that limit
+        them. In-flight jobs are jobs that were submitted to the backend and did not complete yet.
+
+        :return: The maximum number of in-flight jobs on the backend and the maximum number of
+            in-flight jobs of a single user on the backend, keyed by backend URL. A limit is
+            None when the backend does not define it.
+        """
+        return {
+            endpoint: (backend.max_inflight_jobs, backend.max_inflight_jobs_per_user)
+            for endpoint, backend in self.backend_auth_config.items()
+            if backend.max_inflight_jobs or backend.max_inflight_jobs_per_user
+        }
+
+    def get_submission_weight(self, user_id: str) -> float:
+        """
+        Retrieve the weight of a user when sharing the job submissions between users. A user
+        with a weight of 2 gets twice as many jobs submitted as a user with the default
+        weight of 1 while both have queued jobs.
+
+        :param user_id: ID of the user.
+        :return: Weight of the user.
+        """
+        return self.submission_user_weights.get(user_id, 1.0)
+
 
 settings = Settings()
 settings.load_backends_auth_config()
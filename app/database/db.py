@@ -1,5 +1,5 @@
 import os
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from dotenv import load_dotenv
 from loguru import logger
@@ -25,6 +25,17 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def get_column_values(record: Any) -> Dict[str, Any]:
+    """
+    Get the values of the columns that are set on a record, e.g. to insert records in bulk.
+    """
+    return {
+        column.key: getattr(record, column.key)
+        for column in record.__table__.columns
+        if getattr(record, column.key) is not None
+    }
+
+
 def get_db():
     """
     Yield a new database session, committing if no exceptions occur,
@@ -0,0 +1,430 @@
+import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
+
+from loguru import logger
+from sqlalchemy import (
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    and_,
+    delete,
+    func,
+    insert,
+    not_,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.orm import Mapped, Session, mapped_column
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.database.db import Base, get_column_values
+from app.schemas.enum import SubmissionPriorityEnum
+
+
+class JobSubmissionRecord(Base):
+    """
+    Pending submission of a processing job, either a unit job or a job of an upscaling task.
+    Submissions are stored in the database so that they survive restarts and can be processed
+    by any number of workers. Each submission holds the encrypted offline token with which the
+    job is submitted on behalf of its user.
+    """
+
+    __tablename__ = "job_submissions"
+    __table_args__ = (
+        Index("ix_job_submissions_schedule", "priority", "virtual_finish"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, index=True, autoincrement=True
+    )
+    upscaling_task_id: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("upscaling_tasks.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    processing_job_id: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("processing_jobs.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    user_id: Mapped[str] = mapped_column(String(255), index=True)
+    # URL of the backend to which the job is submitted
+    endpoint: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
+    # Encrypted offline token of the user, required to submit the job on behalf of the user,
+    # see app.services.credentials
+    token: Mapped[str] = mapped_column(LONGTEXT())
+    # Expiry of the offline token, after which the job can no longer be submitted
+    credential_expires_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime, nullable=True, index=True
+    )
+    # Serialized BaseJobRequest of the processing job
+    request: Mapped[str] = mapped_column(LONGTEXT())
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # Scheduling of the submission, see app.services.scheduler
+    priority: Mapped[int] = mapped_column(
+        Integer,
+        default=SubmissionPriorityEnum.BATCH,
+        server_default=str(SubmissionPriorityEnum.BATCH.value),
+    )
+    virtual_finish: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+    claimed_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime, nullable=True, index=True
+    )
+    created: Mapped[datetime.datetime] = mapped_column(
+        DateTime, default=datetime.datetime.utcnow, index=True
+    )
+
+
+class BackendLockRecord(Base):
+    """
+    Lock of a backend that limits its number of in-flight jobs. A job submission worker holds
+    the lock of a backend while it counts the in-flight jobs of the backend and claims its
+    submissions, so that concurrent workers cannot both claim the last free slots.
+    """
+
+    __tablename__ = "backend_locks"
+
+    # URL of the backend
+    endpoint: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+
+def save_job_submissions_to_db(
+    database: Session, submissions: List[JobSubmissionRecord]
+):
+    """
+    Add a list of job submissions to the queue through a single batched INSERT statement and
+    commit them, together with any other pending changes of the session, in one transaction.
+
+    :param database: The database session to use.
+    :param submissions: The job submissions to queue.
+    """
+    logger.debug(f"Queueing {len(submissions)} job submissions")
+    if submissions:
+        database.execute(
+            insert(JobSubmissionRecord),
+            [get_column_values(submission) for submission in submissions],
+        )
+    database.commit()
+
+
+def get_virtual_finish_times(
+    database: Session, priority: int, user_ids: List[str]
+) -> Tuple[float, Dict[str, float]]:
+    """
+    Retrieve the virtual finish times of the queued submissions of a priority class, which are
+    used to schedule new submissions through weighted fair queuing.
+
+    :param database: The database session to use.
+    :param priority: The priority class of the submissions.
+    :param user_ids: The users for which to retrieve the latest virtual finish time.
+    :return: The earliest virtual finish time of the class, which is used as the current virtual
+        time, and the latest virtual finish time of each of the users that has queued
+        submissions in the class.
+    """
+    virtual_time = (
+        database.query(func.min(JobSubmissionRecord.virtual_finish))
+        .filter(JobSubmissionRecord.priority == priority)
+        .scalar()
+    )
+    user_finish_times = (
+        database.query(
+            JobSubmissionRecord.user_id, func.max(JobSubmissionRecord.virtual_finish)
+        )
+        .filter(
+            JobSubmissionRecord.priority == priority,
+            JobSubmissionRecord.user_id.in_(user_ids),
+        )
+        .group_by(JobSubmissionRecord.user_id)
+        .all()
+    )
+    return virtual_time or 0.0, {
+        user_id: finish_time for user_id, finish_time in user_finish_times
+    }
+
+
+def get_job_submission_stats(database: Session) -> List[Tuple[int, int, int, Any]]:
+    """
+    Retrieve the statistics of the queued submissions of each priority class through a single
+    grouped query.
+
+    :param database: The database session to use.
+    :return: The priority class, the number of queued submissions, the number of distinct users
+        and the creation time of the oldest submission of each class that has submissions.
+    """
+    return [
+        (priority, count, users, oldest)
+        for priority, count, users, oldest in database.query(
+            JobSubmissionRecord.priority,
+            func.count(JobSubmissionRecord.id),
+            func.count(func.distinct(JobSubmissionRecord.user_id)),
+            func.min(JobSubmissionRecord.created),
+        )
+        .group_by(JobSubmissionRecord.priority)
+        .order_by(JobSubmissionRecord.priority)
+    ]
+
+
+def _is_claimed(lease: float) -> ColumnElement[bool]:
+    claimed_after = datetime.datetime.utcnow() - datetime.timedelta(seconds=lease)
+    return JobSubmissionRecord.claimed_at > claimed_after
+
+
+def count_claimed_job_submissions(
+    database: Session, endpoints: List[str], lease: float
+) -> Dict[Tuple[str, str], int]:
+    """
+    Count the number of job submissions towards the given backends that are being submitted by
+    a worker, per backend and per user, through a single grouped query.
+
+    :param database: The database session to use.
+    :param endpoints: The URLs of the backends to count the submissions for.
+    :param lease: Time (in seconds) after which a claimed submission can be claimed again.
+    :return: The number of claimed submissions, keyed by backend URL and user ID.
+    """
+    if not endpoints:
+        return {}
+
+    rows = (
+        database.query(
+            JobSubmissionRecord.endpoint,
+            JobSubmissionRecord.user_id,
+            func.count(JobSubmissionRecord.id),
+        )
+        .filter(JobSubmissionRecord.endpoint.in_(endpoints), _is_claimed(lease))
+        .group_by(JobSubmissionRecord.endpoint, JobSubmissionRecord.user_id)
+        .all()
+    )
+    return {(cast(str, endpoint), user_id): count for endpoint, user_id, count in rows}
+
+
+def lock_backends(database: Session, endpoints: List[str]) -> Set[str]:
+    """
+    Lock the given backends with `SELECT ... FOR UPDATE SKIP LOCKED` until the next commit of
+    the session. The locks of backends that were never locked before are created first.
+    Backends that are locked by another worker are skipped, so that the workers do not wait
+    for each other.
+
+    :param database: The database session to use.
+    :param endpoints: URLs of the backends to lock.
+    :return: URLs of the backends that were locked.
+    """
+    if not endpoints:
+        return set()
+
+    existing = set(
+        database.scalars(
+            select(BackendLockRecord.endpoint).where(BackendLockRecord.endpoint.in_(endpoints))
+        ).all()
+    )
+    database.add_all(
+        BackendLockRecord(endpoint=endpoint) for endpoint in endpoints if endpoint not in existing
+    )
+    # The locks are acquired in a new transaction, so that the reads after acquiring them see
+    # the submissions that were claimed by other workers in the meantime
+    try:
+        database.commit()
+    except IntegrityError:
+        # The lock was created concurrently by another worker
+        database.rollback()
+
+    return set(
+        database.scalars(
+            select(BackendLockRecord.endpoint)
+            .where(BackendLockRecord.endpoint.in_(endpoints))
+            .order_by(BackendLockRecord.endpoint)
+            .with_for_update(skip_locked=True)
+        ).all()
+    )
+
+
+def claim_job_submissions(
+    database: Session,
+    limit: int,
+    lease: float,
+    excluded: Optional[List[Tuple[str, Optional[str]]]] = None,
+) -> List[JobSubmissionRecord]:
+    """
+    Claim a batch of pending job submissions, in order of their priority class and of their
+    virtual finish time. The submissions are locked with `SELECT ... FOR UPDATE SKIP LOCKED`,
+    so that concurrent workers each claim a different batch. Submissions that were claimed more
+    than `lease` seconds ago without being completed, for example because their worker crashed,
+    are claimed again.
+
+    :param database: The database session to use.
+    :param limit: Maximum number of submissions to claim.
+    :param lease: Time (in seconds) after which a claimed submission can be claimed again.
+    :param excluded: Backends, or users on a backend, of which no submissions should be
+        claimed, as pairs of backend URL and user ID. A user ID of None excludes the backend
+        for all users.
+    :return: The claimed submissions, in the order in which they should be submitted.
+    """
+    now = datetime.datetime.utcnow()
+    query = database.query(JobSubmissionRecord).filter(
+        or_(
+            JobSubmissionRecord.claimed_at.is_(None),
+            JobSubmissionRecord.claimed_at <= now - datetime.timedelta(seconds=lease),
+        )
+    )
+    for endpoint, user_id in excluded or []:
+        condition = JobSubmissionRecord.endpoint == endpoint
+        if user_id is not None:
+            condition = and_(condition, JobSubmissionRecord.user_id == user_id)
+        query = query.filter(
+            or_(JobSubmissionRecord.endpoint.is_(None), not_(condition))
+        )
+    submissions = (
+        query.order_by(
+            JobSubmissionRecord.priority,
+            JobSubmissionRecord.virtual_finish,
+            JobSubmissionRecord.id,
+        )
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for submission in submissions:
+        submission.claimed_at = now
+        submission.attempts = (submission.attempts or 0) + 1
+    database.commit()
+    if submissions:
+        logger.info(f"Claimed {len(submissions)} job submissions")
+    return submissions
+
+
+def renew_job_submission_claim(
+    database: Session, submission: JobSubmissionRecord, lease: float
+) -> bool:
+    """
+    Renew the lease of a claimed job submission right before it is submitted, and commit it in
+    one transaction. The lease is only renewed if the submission was not claimed again by
+    another worker, or removed, since it was claimed.
+
+    :param database: The database session to use.
+    :param submission: The claimed submission.
+    :param lease: Time (in seconds) after which a claimed submission can be claimed again.
+    :return: Whether the submission is still claimed by this worker.
+    """
+    now = datetime.datetime.utcnow()
+    result = cast(
+        CursorResult,
+        database.execute(
+            update(JobSubmissionRecord)
+            .where(
+                JobSubmissionRecord.id == submission.id,
+                JobSubmissionRecord.claimed_at == submission.claimed_at,
+                JobSubmissionRecord.claimed_at
+                > now - datetime.timedelta(seconds=lease),
+            )
+            .values(claimed_at=now)
+            .execution_options(synchronize_session=False)
+        ),
+    )
+    database.commit()
+    if not result.rowcount:
+        return False
+    set_committed_value(submission, "claimed_at", now)
+    return True
+
+
+def release_job_submissions(database: Session, submissions: List[JobSubmissionRecord]):
+    """
+    Release claimed job submissions without submitting them, so that they can be claimed again
+    without counting as a failed attempt, and commit it in one transaction.
+
+    :param database: The database session to use.
+    :param submissions: The claimed submissions to release.
+    """
+    if not submissions:
+        return
+
+    logger.debug(f"Releasing {len(submissions)} job submissions")
+    for submission in submissions:
+        submission.claimed_at = None
+        submission.attempts = submission.attempts - 1
+    database.commit()
+
+
+def remove_job_submissions(database: Session, submission_ids: List[int]):
+    """
+    Remove completed job submissions from the queue and commit it, together with any other
+    pending changes of the session, in one transaction.
+
+    :param database: The database session to use.
+    :param submission_ids: The IDs of the completed submissions.
+    """
+    if not submission_ids:
+        return
+
+    database.execute(
+        delete(JobSubmissionRecord).where(JobSubmissionRecord.id.in_(submission_ids))
+    )
+    database.commit()
+
+
+def get_claimed_job_ids(
+    database: Session, processing_job_ids: List[int], lease: float
+) -> Set[int]:
+    """
+    Retrieve which of the given processing jobs have a submission that is being submitted by a
+    worker, through a single query.
+
+    :param database: The database session to use.
+    :param processing_job_ids: The IDs of the processing jobs to check.
+    :param lease: Time (in seconds) after which a claimed submission can be claimed again.
+    :return: The IDs of the processing jobs of which the submission is claimed.
+    """
+    if not processing_job_ids:
+        return set()
+
+    return {
+        cast(int, job_id)
+        for (job_id,) in database.query(JobSubmissionRecord.processing_job_id).filter(
+            JobSubmissionRecord.processing_job_id.in_(processing_job_ids),
+            _is_claimed(lease),
+        )
+    }
+
+
+def remove_pending_job_submissions(
+    database: Session,
+    lease: float,
+    processing_job_ids: Optional[List[int]] = None,
+    upscaling_task_id: Optional[int] = None,
+):
+    """
+    Remove the queued submissions of processing jobs, or of all processing jobs of an upscaling
+    task, so that the jobs are no longer submitted. Submissions that are being submitted by a
+    worker are left in the queue, the worker cancels their job on the platform once it finds
+    that the job was canceled. The changes are not committed.
+
+    :param database: The database session to use.
+    :param lease: Time (in seconds) after which a claimed submission can be claimed again.
+    :param processing_job_ids: The IDs of the processing jobs of which to remove the
+        submissions.
+    :param upscaling_task_id: The ID of the upscaling task of which to remove the submissions.
+    """
+    conditions: List[ColumnElement[bool]] = []
+    if processing_job_ids:
+        conditions.append(JobSubmissionRecord.processing_job_id.in_(processing_job_ids))
+    if upscaling_task_id is not None:
+        conditions.append(JobSubmissionRecord.upscaling_task_id == upscaling_task_id)
+    if not conditions:
+        return
+
+    logger.debug("Removing the queued submissions of canceled processing jobs")
+    database.execute(
+        delete(JobSubmissionRecord).where(
+            or_(*conditions),
+            or_(JobSubmissionRecord.claimed_at.is_(None), not_(_is_claimed(lease))),
+        )
+    )
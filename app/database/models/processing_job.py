@@ -1,13 +1,36 @@
 import datetime
 import json
-from typing import List, Optional
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple, cast
 
 from loguru import logger
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    bindparam,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    inspect,
+    literal,
+    or_,
+    update,
+)
 from sqlalchemy.dialects.mysql import LONGTEXT
-from sqlalchemy.orm import Mapped, Session, mapped_column
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.orm import InstanceState, Mapped, Session, mapped_column
 
-from app.database.db import Base
+from app.database.db import Base, get_column_values
+from app.database.models.user_credential import UserCredentialRecord
+from app.database.models.job_submission import JobSubmissionRecord
+from app.database.models.upscaling_task import JOB_COUNTER_COLUMNS, UpscalingTaskRecord
 from app.schemas.unit_job import ProcessingStatusEnum, ProcessTypeEnum
 
 from stac_pydantic import Collection
@@ -28,6 +51,10 @@ class ProcessingJobRecord(Base):
     platform_job_id: Mapped[Optional[str]] = mapped_column(String(255), index=True)
     parameters: Mapped[str] = mapped_column(LONGTEXT())
     service: Mapped[str] = mapped_column(LONGTEXT())
+    # URL of the backend of the service, used to limit the number of in-flight jobs per backend
+    endpoint: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True, index=True
+    )
     created: Mapped[datetime.datetime] = mapped_column(
         DateTime, default=datetime.datetime.utcnow, index=True
     )
@@ -38,11 +65,51 @@ class ProcessingJobRecord(Base):
         index=True,
     )
 
+    # Time at which the job finished on the platform, a job that reuses the results of another
+    # job keeps the time at which that job finished
+    finished_at: Mapped[Optional[datetime.datetime]] = mapped_column(
+        DateTime, nullable=True, index=True
+    )
+
     upscaling_task_id: Mapped[int | None] = mapped_column(
         Integer,
         ForeignKey("upscaling_tasks.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
+    )
+
+    # Hash of the service, parameters and format of the request, used to reuse the results of
+    # identical jobs
+    request_hash: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, index=True
+    )
+
+    # Position of the job in the dimension of its upscaling task and the key identifying it
+    # within the task, used to create the jobs of a task only once when it is resumed
+    dimension_index: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    idempotency_key: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, unique=True, index=True
+    )
+
+    # Adaptive status polling schedule
+    next_poll_at: Mapped[Optional[datetime.datetime]] = mapped_column(
+        DateTime, nullable=True, index=True
     )
+    poll_interval: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+
+def add_job_to_db(database: Session, job: ProcessingJobRecord) -> ProcessingJobRecord:
+    """
+    Add a processing job record to the database and update the ID of the job. The changes are
+    not committed.
+
+    :param database: The database session to use.
+    :param job: The ProcessingJobRecord instance to add.
+    """
+    database.add(job)
+    database.flush()
+    update_upscale_task_counters(database, [(job.upscaling_task_id, None, job.status)])
+    return job
 
 
 def save_job_to_db(
@@ -54,13 +121,315 @@ def save_job_to_db(
     :param db_session: The database session to use for saving the job.
     :param job: The ProcessingJobRecord instance to save.
     """
-    db_session.add(job)
+    add_job_to_db(db_session, job)
     db_session.commit()
     db_session.refresh(job)  # Refresh to get the ID after commit
     logger.debug(f"Processing job saved with ID: {job.id}")
     return job
 
 
+def add_upscaling_jobs_to_db(
+    database: Session, upscaling_task_id: int, jobs: List[ProcessingJobRecord]
+) -> List[ProcessingJobRecord]:
+    """
+    Add the processing jobs of an upscaling task to the database in bulk. The jobs are inserted
+    through a single batched INSERT statement that returns the inserted jobs, or, on databases
+    that cannot return the rows of a batched INSERT, after which they are read back through
+    their idempotency key with a single query. The job counters of the task are updated as
+    well. The changes are not committed.
+
+    :param database: The database session to use.
+    :param upscaling_task_id: The ID of the upscaling task the jobs belong to.
+    :param jobs: The processing job records to add, each with a unique idempotency key.
+    :return: The added jobs, including their ID, in the order in which they were added.
+    """
+    logger.debug(f"Adding {len(jobs)} processing jobs to upscaling task {upscaling_task_id}")
+    values = [
+        {**get_column_values(job), "upscaling_task_id": upscaling_task_id} for job in jobs
+    ]
+    if database.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        records = list(
+            database.scalars(
+                insert(ProcessingJobRecord).returning(
+                    ProcessingJobRecord, sort_by_parameter_order=True
+                ),
+                values,
+            )
+        )
+    else:
+        database.execute(insert(ProcessingJobRecord), values)
+        keys = [job.idempotency_key for job in jobs]
+        inserted = {
+            record.idempotency_key: record
+            for record in database.query(ProcessingJobRecord).filter(
+                ProcessingJobRecord.idempotency_key.in_(keys)
+            )
+        }
+        records = [inserted[key] for key in keys]
+    update_upscale_task_counters(
+        database, [(upscaling_task_id, None, record.status) for record in records]
+    )
+    return records
+
+
+def get_upscaling_job_indices(
+    database: Session, upscaling_task_id: int, indices: List[int]
+) -> Set[int]:
+    """
+    Retrieve which of the given positions in the dimension of an upscaling task already have a
+    processing job, through a single query.
+
+    :param database: The database session to use.
+    :param upscaling_task_id: The ID of the upscaling task.
+    :param indices: The positions in the dimension of the task to check.
+    :return: The positions for which a processing job exists.
+    """
+    if not indices:
+        return set()
+
+    return {
+        cast(int, index)
+        for (index,) in database.query(ProcessingJobRecord.dimension_index).filter(
+            ProcessingJobRecord.upscaling_task_id == upscaling_task_id,
+            ProcessingJobRecord.dimension_index.in_(indices),
+        )
+    }
+
+
+def count_unindexed_upscaling_jobs(database: Session, upscaling_task_id: int) -> int:
+    """
+    Count the processing jobs of an upscaling task that have no position in the dimension of the
+    task, which is the case for jobs created before the positions were tracked.
+
+    :param database: The database session to use.
+    :param upscaling_task_id: The ID of the upscaling task.
+    :return: The number of processing jobs without a position.
+    """
+    return (
+        database.query(func.count(ProcessingJobRecord.id))
+        .filter(
+            ProcessingJobRecord.upscaling_task_id == upscaling_task_id,
+            ProcessingJobRecord.dimension_index.is_(None),
+        )
+        .scalar()
+    ) or 0
+
+
+def get_unqueued_upscaling_jobs(
+    database: Session, upscaling_task_id: int
+) -> List[ProcessingJobRecord]:
+    """
+    Retrieve the processing jobs of an upscaling task that still need to be submitted but that
+    no longer have a pending submission, for example because the submission was lost.
+
+    :param database: The database session to use.
+    :param upscaling_task_id: The ID of the upscaling task.
+    :return: The queued jobs without platform job ID nor pending submission, in order of their
+        position in the dimension of the task.
+    """
+    return (
+        database.query(ProcessingJobRecord)
+        .filter(
+            ProcessingJobRecord.upscaling_task_id == upscaling_task_id,
+            ProcessingJobRecord.status == ProcessingStatusEnum.QUEUED,
+            ProcessingJobRecord.platform_job_id.is_(None),
+            ~exists().where(
+                JobSubmissionRecord.processing_job_id == ProcessingJobRecord.id
+            ),
+        )
+        .order_by(ProcessingJobRecord.dimension_index, ProcessingJobRecord.id)
+        .all()
+    )
+
+
+def get_submitted_job_ids(database: Session, job_ids: List[int]) -> Set[int]:
+    """
+    Retrieve which of the given processing jobs were already submitted to the platform, through
+    a single query.
+
+    :param database: The database session to use.
+    :param job_ids: The IDs of the processing jobs to check.
+    :return: The IDs of the jobs that have a platform job ID.
+    """
+    if not job_ids:
+        return set()
+
+    return {
+        job_id
+        for (job_id,) in database.query(ProcessingJobRecord.id).filter(
+            ProcessingJobRecord.id.in_(job_ids),
+            ProcessingJobRecord.platform_job_id.isnot(None),
+        )
+    }
+
+
+def get_submitted_upscaling_jobs(
+    database: Session, upscaling_task_id: int
+) -> List[ProcessingJobRecord]:
+    """
+    Retrieve the processing jobs of an upscaling task that were submitted to the platform and
+    that did not complete yet.
+
+    :param database: The database session to use.
+    :param upscaling_task_id: The ID of the upscaling task.
+    :return: The active jobs that have a platform job ID.
+    """
+    return (
+        database.query(ProcessingJobRecord)
+        .filter(
+            ProcessingJobRecord.upscaling_task_id == upscaling_task_id,
+            ProcessingJobRecord.platform_job_id.isnot(None),
+            ProcessingJobRecord.status.notin_(
+                [
+                    ProcessingStatusEnum.CANCELED,
+                    ProcessingStatusEnum.FAILED,
+                    ProcessingStatusEnum.FINISHED,
+                ]
+            ),
+        )
+        .all()
+    )
+
+
+def cancel_queued_jobs(database: Session, job_ids: List[int]) -> Set[int]:
+    """
+    Mark the given processing jobs that were not submitted to the platform yet as canceled
+    through a single UPDATE statement and commit it, together with any other pending changes of
+    the session, in one transaction. Jobs that were submitted in the meantime are left
+    untouched, so that they can be canceled on the platform instead.
+
+    :param database: The database session to use.
+    :param job_ids: The IDs of the processing jobs to cancel.
+    :return: The IDs of the jobs that were canceled.
+    """
+    if not job_ids:
+        return set()
+
+    queued = _lock_job_statuses(
+        database,
+        ProcessingJobRecord.id.in_(job_ids),
+        ProcessingJobRecord.status == ProcessingStatusEnum.QUEUED,
+        ProcessingJobRecord.platform_job_id.is_(None),
+    )
+    if queued:
+        database.execute(
+            update(ProcessingJobRecord)
+            .where(ProcessingJobRecord.id.in_(queued))
+            .values(
+                status=ProcessingStatusEnum.CANCELED, updated=datetime.datetime.utcnow()
+            )
+            .execution_options(synchronize_session=False)
+        )
+    logger.info(f"Canceled {len(queued)} queued processing jobs")
+    update_upscale_task_counters(
+        database,
+        [
+            (task_id, status, ProcessingStatusEnum.CANCELED)
+            for task_id, status in queued.values()
+        ],
+    )
+    database.commit()
+    return set(queued)
+
+
+def fail_expired_job_submissions(database: Session, lease: float) -> int:
+    """
+    Mark the processing jobs of which the queued submission holds an expired credential as
+    failed, as they can no longer be submitted on behalf of their user, and remove their
+    submissions. Submissions that are being submitted by a worker are left untouched. The
+    changes are committed in one transaction.
+
+    :param database: The database session to use.
+    :param lease: Time (in seconds) after which a claimed submission can be claimed again.
+    :return: The number of submissions that were removed.
+    """
+    now = datetime.datetime.utcnow()
+    expired = (
+        database.query(JobSubmissionRecord.id, JobSubmissionRecord.processing_job_id)
+        .filter(
+            JobSubmissionRecord.credential_expires_at <= now,
+            or_(
+                JobSubmissionRecord.claimed_at.is_(None),
+                JobSubmissionRecord.claimed_at <= now - datetime.timedelta(seconds=lease),
+            ),
+        )
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not expired:
+        database.commit()
+        return 0
+
+    queued = _lock_job_statuses(
+        database,
+        ProcessingJobRecord.id.in_([job_id for _, job_id in expired if job_id]),
+        ProcessingJobRecord.status == ProcessingStatusEnum.QUEUED,
+        ProcessingJobRecord.platform_job_id.is_(None),
+    )
+    logger.warning(
+        f"Failing {len(queued)} queued processing jobs as the credentials of their users "
+        "expired before the jobs could be submitted"
+    )
+    if queued:
+        database.execute(
+            update(ProcessingJobRecord)
+            .where(ProcessingJobRecord.id.in_(queued))
+            .values(status=ProcessingStatusEnum.FAILED, updated=now)
+            .execution_options(synchronize_session=False)
+        )
+    database.execute(
+        delete(JobSubmissionRecord).where(
+            JobSubmissionRecord.id.in_([submission_id for submission_id, _ in expired])
+        )
+    )
+    update_upscale_task_counters(
+        database,
+        [
+            (task_id, status, ProcessingStatusEnum.FAILED)
+            for task_id, status in queued.values()
+        ],
+    )
+    database.commit()
+    return len(expired)
+
+
+def cancel_queued_upscaling_jobs(database: Session, upscaling_task_id: int) -> int:
+    """
+    Mark the processing jobs of an upscaling task that were not submitted to the platform yet
+    as canceled through a single UPDATE statement and commit it, together with any other
+    pending changes of the session, in one transaction.
+
+    :param database: The database session to use.
+    :param upscaling_task_id: The ID of the upscaling task.
+    :return: The number of processing jobs that were canceled.
+    """
+    criteria = [
+        ProcessingJobRecord.upscaling_task_id == upscaling_task_id,
+        ProcessingJobRecord.status == ProcessingStatusEnum.QUEUED,
+        ProcessingJobRecord.platform_job_id.is_(None),
+    ]
+    # The queued jobs stay locked until the commit, so the update changes the same jobs
+    queued = _lock_job_statuses(database, *criteria)
+    database.execute(
+        update(ProcessingJobRecord)
+        .where(*criteria)
+        .values(status=ProcessingStatusEnum.CANCELED, updated=datetime.datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    logger.info(
+        f"Canceled {len(queued)} queued processing jobs of upscaling task {upscaling_task_id}"
+    )
+    update_upscale_task_counters(
+        database,
+        [
+            (task_id, status, ProcessingStatusEnum.CANCELED)
+            for task_id, status in queued.values()
+        ],
+    )
+    database.commit()
+    return len(queued)
+
+
 def get_jobs_by_user_id(
     database: Session, user_id: str, upscaling_task_id: Optional[int]
 ) -> List[ProcessingJobRecord]:
@@ -81,6 +450,170 @@ def get_jobs_by_user_id(
     )
 
 
+def get_jobs_by_upscaling_task_ids(
+    database: Session, user_id: str, upscaling_task_ids: List[int]
+) -> List[ProcessingJobRecord]:
+    if not upscaling_task_ids:
+        return []
+
+    logger.info(
+        f"Retrieving all processing jobs for user {user_id} for {len(upscaling_task_ids)} "
+        "upscaling tasks"
+    )
+    return (
+        database.query(ProcessingJobRecord)
+        .filter(
+            ProcessingJobRecord.user_id == user_id,
+            ProcessingJobRecord.upscaling_task_id.in_(upscaling_task_ids),
+        )
+        .order_by(ProcessingJobRecord.upscaling_task_id, ProcessingJobRecord.id)
+        .all()
+    )
+
+
+def get_reusable_jobs(
+    database: Session,
+    user_id: str,
+    request_hashes: List[str],
+    finished_after: datetime.datetime,
+) -> Dict[str, ProcessingJobRecord]:
+    """
+    Retrieve the most recently finished job of a user for each of the given request hashes
+    through a single query. Only jobs that finished after `finished_after` are considered. Jobs
+    that reuse the results of another job are considered to have finished together with that
+    job, so that results are not reused beyond their maximal age by reusing them again.
+
+    :param database: The database session to use.
+    :param user_id: The ID of the user owning the jobs.
+    :param request_hashes: The hashes of the requests to find a finished job for.
+    :param finished_after: Oldest time at which a reusable job may have finished.
+    :return: The finished jobs, keyed by request hash.
+    """
+    if not request_hashes:
+        return {}
+
+    logger.info(
+        f"Retrieving reusable processing jobs of user {user_id} for {len(request_hashes)} "
+        "requests"
+    )
+    records = (
+        database.query(ProcessingJobRecord)
+        .filter(
+            ProcessingJobRecord.user_id == user_id,
+            ProcessingJobRecord.request_hash.in_(request_hashes),
+            ProcessingJobRecord.status == ProcessingStatusEnum.FINISHED,
+            ProcessingJobRecord.platform_job_id.isnot(None),
+            ProcessingJobRecord.finished_at >= finished_after,
+        )
+        .order_by(ProcessingJobRecord.finished_at)
+        .all()
+    )
+    # Later jobs override earlier ones, so that the most recent job is reused
+    return {cast(str, record.request_hash): record for record in records}
+
+
+def count_inflight_jobs(
+    database: Session, endpoints: List[str], stale_after: float
+) -> Dict[Tuple[str, str], int]:
+    """
+    Count the number of jobs that were submitted to the given backends and that did not
+    complete yet, per backend and per user, through a single grouped query. Only the jobs of
+    which the status is still being reconciled are counted: jobs of users without a valid
+    stored credential, and jobs that were not polled for longer than the given time, are
+    skipped by the status reconciler and would otherwise hold their slot forever.
+
+    :param database: The database session to use.
+    :param endpoints: The URLs of the backends to count the jobs for.
+    :param stale_after: Time (in seconds) after which a job that was due for polling and was not
+        polled is no longer counted.
+    :return: The number of in-flight jobs, keyed by backend URL and user ID.
+    """
+    if not endpoints:
+        return {}
+
+    now = datetime.datetime.utcnow()
+    rows = (
+        database.query(
+            ProcessingJobRecord.endpoint,
+            ProcessingJobRecord.user_id,
+            func.count(ProcessingJobRecord.id),
+        )
+        .join(
+            UserCredentialRecord,
+            UserCredentialRecord.user_id == ProcessingJobRecord.user_id,
+        )
+        .filter(
+            ProcessingJobRecord.endpoint.in_(endpoints),
+            ProcessingJobRecord.platform_job_id.isnot(None),
+            ProcessingJobRecord.status.in_(
+                [
+                    ProcessingStatusEnum.CREATED,
+                    ProcessingStatusEnum.QUEUED,
+                    ProcessingStatusEnum.RUNNING,
+                ]
+            ),
+            or_(
+                UserCredentialRecord.expires_at.is_(None),
+                UserCredentialRecord.expires_at > now,
+            ),
+            # Jobs are due from their next poll time on, or right after their submission
+            func.coalesce(ProcessingJobRecord.next_poll_at, ProcessingJobRecord.updated)
+            >= now - datetime.timedelta(seconds=stale_after),
+        )
+        .group_by(ProcessingJobRecord.endpoint, ProcessingJobRecord.user_id)
+        .all()
+    )
+    return {(cast(str, endpoint), user_id): count for endpoint, user_id, count in rows}
+
+
+def get_due_jobs(
+    database: Session, now: datetime.datetime
+) -> List[ProcessingJobRecord]:
+    logger.info(f"Retrieving all active processing jobs that are due for polling at {now}")
+    return (
+        database.query(ProcessingJobRecord)
+        .filter(
+            ProcessingJobRecord.status.notin_(
+                [
+                    ProcessingStatusEnum.CANCELED,
+                    ProcessingStatusEnum.FAILED,
+                    ProcessingStatusEnum.FINISHED,
+                ]
+            ),
+            ProcessingJobRecord.platform_job_id.isnot(None),
+            or_(
+                ProcessingJobRecord.next_poll_at.is_(None),
+                ProcessingJobRecord.next_poll_at <= now,
+            ),
+        )
+        .all()
+    )
+
+
+def reload_jobs(
+    database: Session, jobs: List[ProcessingJobRecord]
+) -> List[ProcessingJobRecord]:
+    """
+    Reload the processing job records that were expired, for example because changes that were
+    stored in bulk were committed, through a single query instead of reloading each record when
+    it is accessed. Records that are not expired are left untouched.
+
+    :param database: The database session to use.
+    :param jobs: The processing job records to reload.
+    :return: The given records, with their stored values.
+    """
+    # The identity of an expired record is known without loading the record
+    states: List[InstanceState] = [inspect(record) for record in jobs]
+    expired = [
+        state.identity[0] for state in states if state.identity and state.expired_attributes
+    ]
+    if expired:
+        database.query(ProcessingJobRecord).filter(
+            ProcessingJobRecord.id.in_(expired)
+        ).populate_existing().all()
+    return jobs
+
+
 def get_job_by_id(database: Session, job_id: int) -> Optional[ProcessingJobRecord]:
     logger.info(f"Retrieving processing job with ID {job_id}")
     return (
@@ -107,7 +640,13 @@ def remove_job_by_id(database: Session, job_id: int, user_id: str) -> bool:
     logger.info(f"Removing processing job with ID {job_id} for user {user_id}")
     job = get_job_by_user_id(database, job_id, user_id)
     if job:
+        # The status of the job might have changed since it was loaded
+        current = _lock_job_statuses(database, ProcessingJobRecord.id == job.id)
         database.delete(job)
+        database.flush()
+        update_upscale_task_counters(
+            database, [(task_id, status, None) for task_id, status in current.values()]
+        )
         database.commit()
         return True
     else:
@@ -121,17 +660,254 @@ def remove_job_by_id(database: Session, job_id: int, user_id: str) -> bool:
 def update_job_status_by_id(
     database: Session, job_id: int, status: ProcessingStatusEnum
 ):
-    logger.info(f"Updating the status of processing job with ID {job_id} to {status}")
-    job = get_job_by_id(database, job_id)
+    update_job_statuses(database, {job_id: status})
 
-    if job:
-        job.status = status
-        database.commit()
-        database.refresh(job)
-    else:
+
+def update_job_statuses(database: Session, statuses: Dict[int, ProcessingStatusEnum]):
+    """
+    Update the status of multiple processing jobs through a single UPDATE statement and commit
+    it, together with any other pending changes of the session, in one transaction.
+
+    :param database: The database session to use.
+    :param statuses: The new status of each job, keyed by job ID.
+    """
+    if statuses:
+        logger.info(f"Updating the status of {len(statuses)} processing jobs")
+        current = _lock_job_statuses(database, ProcessingJobRecord.id.in_(statuses.keys()))
+        now = datetime.datetime.utcnow()
+        finished = [
+            job_id
+            for job_id, (_, status) in current.items()
+            if status != ProcessingStatusEnum.FINISHED
+            and statuses[job_id] == ProcessingStatusEnum.FINISHED
+        ]
+        values = {
+            "status": case(
+                {
+                    job_id: literal(status, ProcessingJobRecord.status.type)
+                    for job_id, status in statuses.items()
+                },
+                value=ProcessingJobRecord.id,
+            ),
+            "updated": now,
+        }
+        if finished:
+            # Jobs that finish record the time at which they finished, for reusing their results
+            values["finished_at"] = case(
+                (ProcessingJobRecord.id.in_(finished), now),
+                else_=ProcessingJobRecord.finished_at,
+            )
+        statement = (
+            update(ProcessingJobRecord)
+            .where(ProcessingJobRecord.id.in_(statuses.keys()))
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        result = cast(CursorResult, database.execute(statement))
+        if result.rowcount != len(statuses):
+            logger.warning(
+                f"Could only update the status of {result.rowcount} out of {len(statuses)} "
+                "processing jobs as the others could not be found in the database"
+            )
+
+        update_upscale_task_counters(
+            database,
+            [
+                (task_id, status, statuses[job_id])
+                for job_id, (task_id, status) in current.items()
+            ],
+        )
+    database.commit()
+
+
+def update_job_poll_schedules(
+    database: Session, schedules: Dict[int, Tuple[datetime.datetime, float]]
+):
+    """
+    Store the polling schedule of multiple processing jobs through a single executemany UPDATE
+    statement. The schedule is bookkeeping of the status polling and leaves the time at which
+    the jobs were last updated untouched. The changes are not committed.
+
+    :param database: The database session to use.
+    :param schedules: The next poll time and poll interval of each job, keyed by job ID.
+    """
+    if not schedules:
+        return
+
+    table = ProcessingJobRecord.__table__
+    database.execute(
+        update(table)
+        .where(table.c.id == bindparam("job_id"))
+        # Assigning the column to itself prevents its onupdate default from being applied
+        .values(updated=table.c.updated),
+        [
+            {"job_id": job_id, "next_poll_at": next_poll_at, "poll_interval": poll_interval}
+            for job_id, (next_poll_at, poll_interval) in schedules.items()
+        ],
+    )
+
+
+def update_submitted_jobs(
+    database: Session, platform_job_ids: Dict[int, Optional[str]]
+) -> Set[int]:
+    """
+    Store the platform job IDs of a batch of submitted processing jobs through a single bulk
+    update, after which the jobs are no longer queued locally. Jobs for which no platform job ID
+    is available could not be submitted and are marked as failed. Only jobs that are still
+    queued without a platform job ID are updated, so that a job that was submitted twice keeps
+    referring to the job it was first submitted as, and a job that was canceled or removed while
+    being submitted is not stored as created. The polling schedule of the jobs is reset, so that
+    their status is polled as soon as they exist on the platform. The changes are not committed.
+
+    :param database: The database session to use.
+    :param platform_job_ids: The ID of each job on the platform, keyed by processing job ID.
+    :return: The IDs of the processing jobs of which the platform job ID was rejected, their job
+        on the platform should be canceled.
+    """
+    if not platform_job_ids:
+        return set()
+
+    logger.info(f"Storing the platform job IDs of {len(platform_job_ids)} submitted jobs")
+    queued = _lock_job_statuses(
+        database,
+        ProcessingJobRecord.id.in_(platform_job_ids),
+        ProcessingJobRecord.status == ProcessingStatusEnum.QUEUED,
+        ProcessingJobRecord.platform_job_id.is_(None),
+    )
+    database.execute(
+        update(ProcessingJobRecord)
+        .where(
+            ProcessingJobRecord.status == ProcessingStatusEnum.QUEUED,
+            ProcessingJobRecord.platform_job_id.is_(None),
+        )
+        .execution_options(synchronize_session=None),
+        [
+            {
+                "id": job_id,
+                "platform_job_id": platform_job_id,
+                "status": (
+                    ProcessingStatusEnum.CREATED
+                    if platform_job_id
+                    else ProcessingStatusEnum.FAILED
+                ),
+                "next_poll_at": None,
+                "poll_interval": None,
+            }
+            for job_id, platform_job_id in platform_job_ids.items()
+        ],
+    )
+    # The bulk update does not synchronize the records that are loaded in the session, they
+    # are reloaded together with the stored platform job IDs
+    stored = {
+        record.id: record.platform_job_id
+        for record in database.query(ProcessingJobRecord)
+        .filter(ProcessingJobRecord.id.in_(platform_job_ids))
+        .populate_existing()
+    }
+    rejected = {
+        job_id
+        for job_id, platform_job_id in platform_job_ids.items()
+        if platform_job_id and stored.get(job_id) != platform_job_id
+    }
+    if rejected:
         logger.warning(
-            f"Could not update job status of job {job_id} as it could not be found in the database"
+            f"Could not store the platform job IDs of {len(rejected)} processing jobs as they "
+            "were canceled, removed or already submitted in the meantime"
+        )
+    update_upscale_task_counters(
+        database,
+        [
+            (
+                task_id,
+                status,
+                (
+                    ProcessingStatusEnum.CREATED
+                    if platform_job_ids[job_id]
+                    else ProcessingStatusEnum.FAILED
+                ),
+            )
+            for job_id, (task_id, status) in queued.items()
+        ],
+    )
+    return rejected
+
+
+def _lock_job_statuses(
+    database: Session, *criteria: ColumnElement[bool]
+) -> Dict[int, Tuple[Optional[int], ProcessingStatusEnum]]:
+    """
+    Lock the processing jobs that match the given criteria with `SELECT ... FOR UPDATE` and
+    retrieve their current status, so that the status of the jobs cannot change until the
+    transaction is committed.
+
+    :param database: The database session to use.
+    :param criteria: The criteria of the jobs to lock.
+    :return: The upscaling task ID and status of each locked job, keyed by job ID.
+    """
+    return {
+        job_id: (task_id, status)
+        for job_id, task_id, status in database.query(
+            ProcessingJobRecord.id,
+            ProcessingJobRecord.upscaling_task_id,
+            ProcessingJobRecord.status,
         )
+        .filter(*criteria)
+        .order_by(ProcessingJobRecord.id)
+        .with_for_update()
+    }
+
+
+def update_upscale_task_counters(
+    database: Session,
+    transitions: List[
+        Tuple[
+            Optional[int], Optional[ProcessingStatusEnum], Optional[ProcessingStatusEnum]
+        ]
+    ],
+):
+    """
+    Update the number of processing jobs per status of upscaling tasks for the given status
+    transitions of their jobs. The counters are incremented atomically in the database through
+    a single executemany UPDATE statement, so that concurrent transactions do not overwrite
+    each other's changes and the cost does not depend on the number of jobs of a task. The
+    changes are not committed.
+
+    :param database: The database session to use.
+    :param transitions: The ID of the upscaling task, the previous status and the new status of
+        each job that changed status. A job without previous status was added and a job without
+        new status was removed. Jobs that do not belong to an upscaling task are ignored.
+    """
+    deltas: Dict[int, Counter] = defaultdict(Counter)
+    for task_id, previous, current in transitions:
+        if not task_id or previous == current:
+            continue
+        task_deltas = deltas[task_id]
+        if previous is None:
+            task_deltas["jobs_total"] += 1
+        elif previous in JOB_COUNTER_COLUMNS:
+            task_deltas[JOB_COUNTER_COLUMNS[previous]] -= 1
+        if current is None:
+            task_deltas["jobs_total"] -= 1
+        elif current in JOB_COUNTER_COLUMNS:
+            task_deltas[JOB_COUNTER_COLUMNS[current]] += 1
+    if not deltas:
+        return
+
+    logger.debug(f"Updating the job counters of {len(deltas)} upscaling tasks")
+    table = UpscalingTaskRecord.__table__
+    columns = ["jobs_total", *JOB_COUNTER_COLUMNS.values()]
+    database.execute(
+        update(table)
+        .where(table.c.id == bindparam("task_id"))
+        .values({column: table.c[column] + bindparam(f"{column}_delta") for column in columns}),
+        [
+            {
+                "task_id": task_id,
+                **{f"{column}_delta": task_deltas[column] for column in columns},
+            }
+            for task_id, task_deltas in deltas.items()
+        ],
+    )
 
 
 def update_job_result_by_id(database: Session, job_id: int, result: Collection):
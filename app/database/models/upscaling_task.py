@@ -1,10 +1,11 @@
 import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, cast
 
 from loguru import logger
-from sqlalchemy import DateTime, Enum, Integer, String
+from sqlalchemy import DateTime, Enum, Integer, String, case, inspect, literal, update
 from sqlalchemy.dialects.mysql import LONGTEXT
-from sqlalchemy.orm import Mapped, Session, mapped_column
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.orm import InstanceState, Mapped, Session, mapped_column
 
 from app.database.db import Base
 from app.schemas.unit_job import ProcessingStatusEnum, ProcessTypeEnum
@@ -23,6 +24,9 @@ class UpscalingTaskRecord(Base):
     )
     user_id: Mapped[str] = mapped_column(String(255), index=True)
     service: Mapped[str] = mapped_column(LONGTEXT)
+    # Hash of the request with which the task was created, used to verify the request with
+    # which the task is resumed
+    request_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     created: Mapped[datetime.datetime] = mapped_column(
         DateTime, default=datetime.datetime.utcnow, index=True
     )
@@ -33,6 +37,39 @@ class UpscalingTaskRecord(Base):
         index=True,
     )
 
+    # Number of processing jobs of the task per status
+    jobs_total: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    jobs_created: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    jobs_queued: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    jobs_running: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    jobs_finished: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    jobs_failed: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    jobs_canceled: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    def get_job_counts(self) -> Dict[ProcessingStatusEnum, int]:
+        """
+        Get the number of processing jobs of the task per status.
+        """
+        counts = {
+            status: getattr(self, column) or 0
+            for status, column in JOB_COUNTER_COLUMNS.items()
+        }
+        counts[ProcessingStatusEnum.UNKNOWN] = (self.jobs_total or 0) - sum(
+            counts.values()
+        )
+        return counts
+
+
+# Column of the upscaling task that keeps track of the number of jobs in each status
+JOB_COUNTER_COLUMNS = {
+    ProcessingStatusEnum.CREATED: "jobs_created",
+    ProcessingStatusEnum.QUEUED: "jobs_queued",
+    ProcessingStatusEnum.RUNNING: "jobs_running",
+    ProcessingStatusEnum.FINISHED: "jobs_finished",
+    ProcessingStatusEnum.FAILED: "jobs_failed",
+    ProcessingStatusEnum.CANCELED: "jobs_canceled",
+}
+
 
 def save_upscaling_task_to_db(
     db_session: Session, task: UpscalingTaskRecord
@@ -85,21 +122,90 @@ def get_upscale_task_by_user_id(
     )
 
 
+def reload_upscale_tasks(
+    database: Session, tasks: List[UpscalingTaskRecord]
+) -> List[UpscalingTaskRecord]:
+    """
+    Reload the upscaling task records that were expired, for example because changes that were
+    stored in bulk were committed, through a single query instead of reloading each record when
+    it is accessed. Records that are not expired are left untouched.
+
+    :param database: The database session to use.
+    :param tasks: The upscaling task records to reload.
+    :return: The given records, with their stored values.
+    """
+    # The identity of an expired record is known without loading the record
+    states: List[InstanceState] = [inspect(record) for record in tasks]
+    expired = [
+        state.identity[0] for state in states if state.identity and state.expired_attributes
+    ]
+    if expired:
+        database.query(UpscalingTaskRecord).filter(
+            UpscalingTaskRecord.id.in_(expired)
+        ).populate_existing().all()
+    return tasks
+
+
+def update_upscale_task_request_hash(database: Session, task_id: int, request_hash: str):
+    """
+    Store the hash of the request with which an upscaling task was created and commit it in one
+    transaction.
+
+    :param database: The database session to use.
+    :param task_id: The ID of the upscaling task.
+    :param request_hash: The hash of the request of the task.
+    """
+    database.execute(
+        update(UpscalingTaskRecord)
+        .where(UpscalingTaskRecord.id == task_id)
+        .values(request_hash=request_hash)
+        .execution_options(synchronize_session=False)
+    )
+    database.commit()
+
+
 def update_upscale_task_status_by_id(
     database: Session, task_id: int, status: ProcessingStatusEnum
 ):
-    logger.info(f"Updating the status of upscale task with ID {task_id} to {status}")
-    task = get_upscale_task_by_id(database, task_id)
-
-    if task:
-        task.status = status
-        database.commit()
-        database.refresh(task)
-    else:
+    update_upscale_task_statuses(database, {task_id: status})
+
+
+def update_upscale_task_statuses(
+    database: Session, statuses: Dict[int, ProcessingStatusEnum]
+):
+    """
+    Update the status of multiple upscaling tasks through a single UPDATE statement and commit
+    it in one transaction.
+
+    :param database: The database session to use.
+    :param statuses: The new status of each task, keyed by task ID.
+    """
+    if not statuses:
+        return
+
+    logger.info(f"Updating the status of {len(statuses)} upscale tasks")
+    statement = (
+        update(UpscalingTaskRecord)
+        .where(UpscalingTaskRecord.id.in_(statuses.keys()))
+        .values(
+            status=case(
+                {
+                    task_id: literal(status, UpscalingTaskRecord.status.type)
+                    for task_id, status in statuses.items()
+                },
+                value=UpscalingTaskRecord.id,
+            ),
+            updated=datetime.datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = cast(CursorResult, database.execute(statement))
+    if result.rowcount != len(statuses):
         logger.warning(
-            f"Could not update upscaling task status of task {task_id} as it could not be found "
-            "in the database"
+            f"Could only update the status of {result.rowcount} out of {len(statuses)} "
+            "upscaling tasks as the others could not be found in the database"
         )
+    database.commit()
 
 
 # def get_jobs_by_user_id(database: Session, user_id: str) -> List[ProcessingJobRecord]:
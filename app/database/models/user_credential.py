@@ -0,0 +1,90 @@
+import datetime
+from typing import Dict, List, Optional, Tuple, cast
+
+from loguru import logger
+from sqlalchemy import DateTime, String, update
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.database.db import Base
+
+
+class UserCredentialRecord(Base):
+    """
+    Latest credential of a user with which background processes act on behalf of the user,
+    such as the status reconciler, which polls the status of the jobs of the user long after
+    their submissions were removed from the queue.
+    """
+
+    __tablename__ = "user_credentials"
+
+    user_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # Encrypted offline token of the user, see app.services.credentials
+    token: Mapped[str] = mapped_column(LONGTEXT())
+    # Expiry of the offline token, after which it can no longer be used
+    expires_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime, nullable=True)
+    updated: Mapped[datetime.datetime] = mapped_column(
+        DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow
+    )
+
+
+def _update_user_credential(
+    database: Session, user_id: str, token: str, expires_at: Optional[datetime.datetime]
+) -> bool:
+    result = cast(
+        CursorResult,
+        database.execute(
+            update(UserCredentialRecord)
+            .where(UserCredentialRecord.user_id == user_id)
+            .values(token=token, expires_at=expires_at)
+            .execution_options(synchronize_session=False)
+        ),
+    )
+    return result.rowcount > 0
+
+
+def save_user_credentials(
+    database: Session, credentials: Dict[str, Tuple[str, Optional[datetime.datetime]]]
+):
+    """
+    Store the latest credential of each of the given users, replacing the credential that was
+    stored before. The changes are not committed.
+
+    :param database: The database session to use.
+    :param credentials: The encrypted offline token and its expiry, keyed by user ID.
+    """
+    for user_id, (token, expires_at) in credentials.items():
+        if _update_user_credential(database, user_id, token, expires_at):
+            continue
+        try:
+            with database.begin_nested():
+                database.add(
+                    UserCredentialRecord(user_id=user_id, token=token, expires_at=expires_at)
+                )
+        except IntegrityError:
+            # The first credential of the user was stored concurrently by another request
+            logger.debug(f"Replacing the credential of user {user_id} stored concurrently")
+            _update_user_credential(database, user_id, token, expires_at)
+
+
+def get_user_credentials(
+    database: Session, user_ids: List[str]
+) -> Dict[str, UserCredentialRecord]:
+    """
+    Retrieve the stored credential of each of the given users through a single query.
+
+    :param database: The database session to use.
+    :param user_ids: The IDs of the users.
+    :return: The stored credentials, keyed by user ID. Users without credential are omitted.
+    """
+    if not user_ids:
+        return {}
+
+    return {
+        record.user_id: record
+        for record in database.query(UserCredentialRecord).filter(
+            UserCredentialRecord.user_id.in_(user_ids)
+        )
+    }
@@ -62,6 +62,24 @@ class TaskNotFoundException(DispatcherException):
     message: str = "The requested task was not found."
 
 
+class TaskConflictException(DispatcherException):
+    http_status: int = status.HTTP_409_CONFLICT
+    error_code: str = "TASK_CONFLICT"
+    message: str = "The request conflicts with the current state of the task."
+
+
+class TileLimitException(DispatcherException):
+    http_status: int = status.HTTP_400_BAD_REQUEST
+    error_code: str = "TILE_LIMIT_EXCEEDED"
+    message: str = "The area of interest is split in more tiles than allowed."
+
+
+class UnsupportedMediaTypeException(DispatcherException):
+    http_status: int = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    error_code: str = "UNSUPPORTED_MEDIA_TYPE"
+    message: str = "The content type of the request body is not supported."
+
+
 class InternalException(DispatcherException):
     http_status: int = status.HTTP_500_INTERNAL_SERVER_ERROR
     error_code: str = "INTERNAL_ERROR"
@@ -1,9 +1,16 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.middleware.correlation_id import add_correlation_id
 from app.middleware.error_handling import register_exception_handlers
 from app.platforms.dispatcher import load_processing_platforms
+from app.platforms.implementations.openeo import udp_cache
+from app.services.credentials import validate_submission_credential_key
+from app.services.reconciler import run_status_reconciler
+from app.services.submission import run_submission_worker
 from app.services.tiles.base import load_grids
 from app.config.logger import setup_logging
 from app.config.settings import settings
@@ -22,10 +29,29 @@ setup_logging()
 load_processing_platforms()
 load_grids()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Every processing job is queued with the encrypted credential of its user
+    validate_submission_credential_key()
+    background_tasks = []
+    if settings.status_reconciler_enabled:
+        background_tasks.append(asyncio.create_task(run_status_reconciler()))
+    if settings.submission_worker_enabled:
+        background_tasks.append(asyncio.create_task(run_submission_worker()))
+    yield
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await udp_cache.aclose()
+
+
 app = FastAPI(
     title=settings.app_name,
     description=settings.app_description,
     version=settings.app_version,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
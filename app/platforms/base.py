@@ -1,15 +1,34 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Optional
 
 from fastapi import Response
+from loguru import logger
+
+from app.config.settings import settings
 
 from app.schemas.enum import OutputFormatEnum, ProcessingStatusEnum
 from app.schemas.parameters import Parameter
 from app.schemas.unit_job import ServiceDetails
+from app.services.rate_limiter import get_concurrency_limiter
 
 from stac_pydantic import Collection
 
 
+def get_status_limiter(endpoint: str) -> asyncio.Semaphore:
+    """
+    Retrieve the limiter of the status requests towards a backend. The limiter is shared by the
+    status refreshes of all users, so that at most STATUS_REFRESH_CONCURRENCY, or the status
+    concurrency of the backend, requests are sent to the backend at once.
+
+    :param endpoint: URL of the backend.
+    :return: The semaphore limiting the concurrent status requests.
+    """
+    return get_concurrency_limiter(
+        f"status:{endpoint}", settings.get_status_concurrency(endpoint)
+    )
+
+
 class BaseProcessingPlatform(ABC):
     """
     Abstract base class for processing platforms.
@@ -72,6 +91,80 @@ class BaseProcessingPlatform(ABC):
         """
         pass
 
+    async def get_job_statuses(
+        self, user_token: str, job_ids: List[str], details: ServiceDetails
+    ) -> Dict[str, ProcessingStatusEnum]:
+        """
+        Retrieve the job status of multiple processing jobs that are running on the platform.
+        The default implementation retrieves the status of each job separately, limited by the
+        status concurrency of the platform endpoint, which is shared by all callers. Platforms
+        that can list jobs should override this method to retrieve the statuses in bulk.
+
+        :param user_token: The access token of the user executing the jobs.
+        :param job_ids: The IDs of the jobs on the platform
+        :param details: The service details containing the service ID and application.
+        :return: Return the processing status of each job, keyed by job ID. Jobs for which the
+        status could not be retrieved are omitted.
+        """
+        semaphore = get_status_limiter(details.endpoint)
+
+        async def _get_status(job_id: str) -> Optional[ProcessingStatusEnum]:
+            async with semaphore:
+                try:
+                    return await self.get_job_status(user_token, job_id, details)
+                except Exception as e:
+                    logger.error(f"Could not retrieve the status of job {job_id}: {e}")
+                    return None
+
+        statuses = await asyncio.gather(*[_get_status(job_id) for job_id in job_ids])
+        # Platforms report an unknown status when the status could not be retrieved
+        return {
+            job_id: status
+            for job_id, status in zip(job_ids, statuses)
+            if status is not None and status != ProcessingStatusEnum.UNKNOWN
+        }
+
+    @abstractmethod
+    async def cancel_job(
+        self, user_token: str, job_id: str, details: ServiceDetails
+    ) -> None:
+        """
+        Cancel a processing job that is running on the platform.
+
+        :param user_token: The access token of the user executing the job.
+        :param job_id: The ID of the job on the platform
+        :param details: The service details containing the service ID and application.
+        """
+        pass
+
+    async def cancel_jobs(
+        self, user_token: str, job_ids: List[str], details: ServiceDetails
+    ) -> List[str]:
+        """
+        Cancel multiple processing jobs that are running on the platform. The default
+        implementation cancels each job separately, limited by CANCEL_CONCURRENCY. Platforms
+        that can cancel jobs in bulk should override this method.
+
+        :param user_token: The access token of the user executing the jobs.
+        :param job_ids: The IDs of the jobs on the platform
+        :param details: The service details containing the service ID and application.
+        :return: Return the IDs of the jobs that were canceled. Jobs that could not be canceled
+        are omitted.
+        """
+        semaphore = asyncio.Semaphore(settings.cancel_concurrency)
+
+        async def _cancel(job_id: str) -> bool:
+            async with semaphore:
+                try:
+                    await self.cancel_job(user_token, job_id, details)
+                    return True
+                except Exception as e:
+                    logger.error(f"Could not cancel job {job_id}: {e}")
+                    return False
+
+        canceled = await asyncio.gather(*[_cancel(job_id) for job_id in job_ids])
+        return [job_id for job_id, success in zip(job_ids, canceled) if success]
+
     @abstractmethod
     async def get_job_results(
         self, user_token: str, job_id: str, details: ServiceDetails
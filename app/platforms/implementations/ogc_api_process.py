@@ -1,6 +1,8 @@
 import re
+from collections import defaultdict
 from typing import List
 from app.auth import exchange_token
+from app.config.settings import settings
 from fastapi import Response
 from loguru import logger
 
@@ -172,6 +174,83 @@ class OGCAPIProcessPlatform(BaseProcessingPlatform):
         status_info: StatusInfo = api_client.get_status(job_id=internal_job_id)
         return self._map_ogcapi_status(status_info.status)
 
+    async def get_job_statuses(
+        self, user_token: str, job_ids: List[str], details: ServiceDetails
+    ) -> Dict[str, ProcessingStatusEnum]:
+        logger.debug(
+            f"Fetching job status for {len(job_ids)} OGC API jobs on {details.endpoint}"
+        )
+        # A listing returns the jobs of the user in the namespace, which only pays off when
+        # the status of many jobs is requested
+        if len(job_ids) < settings.status_listing_threshold:
+            return await super().get_job_statuses(user_token, job_ids, details)
+
+        logger.debug("Exchanging user token for OGC API Process execution...")
+        exchanged_token = await exchange_token(
+            user_token=user_token, url=details.endpoint
+        )
+
+        # Job IDs are composed of namespace and internal job id, list the jobs per namespace
+        job_ids_by_namespace: Dict[str, List[str]] = defaultdict(list)
+        for job_id in job_ids:
+            namespace, _ = self._split_job_id(job_id)
+            job_ids_by_namespace[namespace].append(job_id)
+
+        statuses: Dict[str, ProcessingStatusEnum] = {}
+        missing: List[str] = []
+        for namespace, namespace_job_ids in job_ids_by_namespace.items():
+            try:
+                api_client = await self._create_api_client_instance(
+                    details.endpoint, namespace, exchanged_token
+                )
+                listed_statuses = {
+                    job.job_id: self._map_ogcapi_status(job.status)
+                    for job in api_client.get_jobs().jobs
+                }
+            except Exception as e:
+                # Falling back to a request per job would flood a platform that is already
+                # failing, the statuses are retrieved again at the next poll instead
+                logger.error(
+                    f"Error occurred while listing jobs on {details.endpoint} for "
+                    f"namespace {namespace}: {e}"
+                )
+                continue
+
+            for job_id in namespace_job_ids:
+                _, internal_job_id = self._split_job_id(job_id)
+                if internal_job_id in listed_statuses:
+                    statuses[job_id] = listed_statuses[internal_job_id]
+                else:
+                    missing.append(job_id)
+
+        # Jobs can be missing from the listing, e.g. when the platform pages its results
+        if missing:
+            logger.debug(
+                f"{len(missing)} jobs not found in job listing, fetching status separately"
+            )
+            statuses.update(
+                await super().get_job_statuses(user_token, missing, details)
+            )
+        return statuses
+
+    async def cancel_job(
+        self, user_token: str, job_id: str, details: ServiceDetails
+    ) -> None:
+        logger.debug(f"Dismissing OGC API job with ID {job_id}")
+
+        logger.debug("Exchanging user token for OGC API Process execution...")
+        exchanged_token = await exchange_token(
+            user_token=user_token, url=details.endpoint
+        )
+
+        # Job ID is composed of namespace and internal job id
+        namespace, internal_job_id = self._split_job_id(job_id)
+        api_client = await self._create_api_client_instance(
+            details.endpoint, namespace, exchanged_token
+        )
+
+        api_client.dismiss(job_id=internal_job_id)
+
     async def get_job_results(
         self, user_token: str, job_id: str, details: ServiceDetails
     ) -> Collection:
@@ -1,29 +1,86 @@
-import datetime
+import asyncio
+import functools
 import hashlib
-from typing import List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar
 
 from fastapi import Response
+import httpx
 import jwt
 import openeo
-import requests
 from dotenv import load_dotenv
 from loguru import logger
 from stac_pydantic import Collection
 
 from app.auth import exchange_token
+from app.cache import TTLCache
 from app.config.schemas import AuthMethod
 from app.config.settings import settings
 from app.error import AuthException
-from app.platforms.base import BaseProcessingPlatform
+from app.platforms.base import BaseProcessingPlatform, get_status_limiter
 from app.platforms.dispatcher import register_platform
+from app.platforms.openeo_metadata import CachedMetadataConnection
+from app.platforms.udp_cache import UDPCache
 from app.schemas.enum import OutputFormatEnum, ProcessingStatusEnum, ProcessTypeEnum
 from app.schemas.parameters import ParamTypeEnum, Parameter
 from app.schemas.unit_job import ServiceDetails
 
 from openeo.rest import OpenEoApiError
+from openeo.rest.models.general import JobListingResponse
 
 load_dotenv()
 
+# The UDP documents are shared by all jobs that execute the same service
+udp_cache = UDPCache(max_size=settings.udp_cache_size, ttl=settings.udp_cache_ttl)
+
+# The openEO client performs blocking HTTP requests, which are run in a bounded thread pool so
+# that a slow backend does not block the event loop
+openeo_executor = ThreadPoolExecutor(
+    max_workers=settings.openeo_executor_workers, thread_name_prefix="openeo"
+)
+
+T = TypeVar("T")
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking call of the openEO client in the thread pool of the openEO platform.
+
+    :param func: The blocking function to call.
+    :return: The result of the function.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        openeo_executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+class ResolvedService:
+    """
+    Process ID and parameters of an openEO service, as resolved from a revision of its UDP
+    document. The parameters are only parsed when they are first used, so that a service whose
+    parameters can not be parsed can still be executed.
+    """
+
+    def __init__(
+        self,
+        revision: str,
+        document: Dict[str, Any],
+        parse_parameters: Callable[[Dict[str, Any]], List[Parameter]],
+    ):
+        self.revision = revision
+        self.process_id: Optional[str] = document.get("id")
+        self._document = document
+        self._parse_parameters = parse_parameters
+        self._parameters: Optional[List[Parameter]] = None
+
+    @property
+    def parameters(self) -> List[Parameter]:
+        if self._parameters is None:
+            self._parameters = self._parse_parameters(self._document)
+        return self._parameters
+
 
 @register_platform(ProcessTypeEnum.OPENEO)
 class OpenEOPlatform(BaseProcessingPlatform):
@@ -32,7 +89,10 @@ class OpenEOPlatform(BaseProcessingPlatform):
     This class handles the execution of processing jobs on the OpenEO platform.
     """
 
-    _connection_cache: dict[str, openeo.Connection] = {}
+    _connection_cache: TTLCache[openeo.Connection] = TTLCache(
+        max_size=settings.openeo_connection_cache_size
+    )
+    _resolved_services: OrderedDict[str, ResolvedService] = OrderedDict()
     _token_expiry_buffer_seconds = 60
 
     def _build_connection_cache_key(self, user_token: str, url: str) -> str:
@@ -42,40 +102,37 @@ class OpenEOPlatform(BaseProcessingPlatform):
     def _is_auth_error(self, error: OpenEoApiError) -> bool:
         return error.http_status_code in (403, 401)
 
-    def _connection_expired(self, connection: openeo.Connection) -> bool:
+    def _get_connection_expiry(self, connection: openeo.Connection) -> Optional[float]:
         """
-        Check if the cached connection is still valid.
-        This method can be used to determine if a new connection needs to be established.
+        Determine until when a connection can be reused, based on the expiry of the JWT bearer
+        token with which it was authenticated.
+
+        :param connection: The authenticated connection.
+        :return: The time (as a UNIX timestamp) at which the connection expires or None if the
+            connection has no valid bearer token.
         """
         bearer = getattr(getattr(connection, "auth", None), "bearer", None)
         if not bearer:
             logger.warning("No JWT bearer token found in connection.")
-            return True
+            return None
 
         jwt_bearer_token = bearer.split("/")[-1]
         if jwt_bearer_token:
             try:
-                # Check if the token is still valid by decoding it
                 payload = jwt.decode(
                     jwt_bearer_token, options={"verify_signature": False}
                 )
                 exp = payload.get("exp")
                 if not exp:
                     logger.warning("JWT bearer token does not contain 'exp' field.")
-                    return True
-                now = datetime.datetime.now(datetime.timezone.utc).timestamp()
-                if exp <= now + self._token_expiry_buffer_seconds:
-                    logger.warning("JWT bearer token has expired.")
-                    return True  # Token is expired
-                else:
-                    logger.debug("JWT bearer token is valid.")
-                    return False  # Token is valid
+                    return None
+                return exp - self._token_expiry_buffer_seconds
             except Exception as e:
                 logger.error(f"JWT token validation failed: {e}")
-                return True  # Token is expired or invalid
+                return None
 
         logger.warning("No JWT bearer token found in connection.")
-        return True
+        return None
 
     async def _authenticate_user(
         self, user_token: str, url: str, connection: openeo.Connection
@@ -101,7 +158,8 @@ class OpenEOPlatform(BaseProcessingPlatform):
             )
             provider_id, client_id, client_secret = self._get_client_credentials(url)
 
-            connection.authenticate_oidc_client_credentials(
+            await run_blocking(
+                connection.authenticate_oidc_client_credentials,
                 provider_id=provider_id,
                 client_id=client_id,
                 client_secret=client_secret,
@@ -122,21 +180,23 @@ class OpenEOPlatform(BaseProcessingPlatform):
         This method can be used to initialize any required client or session.
         """
         cache_key = self._build_connection_cache_key(user_token, url)
-        if (
-            not force_refresh
-            and cache_key in self._connection_cache
-            and not self._connection_expired(self._connection_cache[cache_key])
-        ):
-            logger.debug(
-                f"Reusing cached OpenEO connection to {url} (key: {cache_key})"
-            )
-            return self._connection_cache[cache_key]
+        # Only a single coroutine authenticates per key, the others reuse its connection
+        async with self._connection_cache.lock(cache_key):
+            if not force_refresh:
+                connection = self._connection_cache.get(cache_key)
+                if connection is not None:
+                    logger.debug(
+                        f"Reusing cached OpenEO connection to {url} (key: {cache_key})"
+                    )
+                    return connection
 
-        logger.debug(f"Setting up OpenEO connection to {url}")
-        connection = openeo.connect(url)
-        connection = await self._authenticate_user(user_token, url, connection)
-        self._connection_cache[cache_key] = connection
-        return connection
+            logger.debug(f"Setting up OpenEO connection to {url}")
+            connection = await run_blocking(CachedMetadataConnection, url)
+            connection = await self._authenticate_user(user_token, url, connection)
+            expires_at = self._get_connection_expiry(connection)
+            if expires_at is not None:
+                self._connection_cache.put(cache_key, connection, expires_at)
+            return connection
 
     async def _refresh_connection(self, user_token: str, url: str) -> openeo.Connection:
         logger.info(
@@ -153,9 +213,9 @@ class OpenEOPlatform(BaseProcessingPlatform):
         format: OutputFormatEnum,
     ) -> str:
         service = await self._build_datacube(user_token, title, details, parameters)
-        job = service.create_job(title=title, out_format=format)
+        job = await run_blocking(service.create_job, title=title, out_format=format)
         logger.info(f"Executing OpenEO batch job with title={title}")
-        job.start()
+        await run_blocking(job.start)
         return job.job_id
 
     async def _execute_synchronous_job_once(
@@ -168,7 +228,7 @@ class OpenEOPlatform(BaseProcessingPlatform):
     ) -> Response:
         service = await self._build_datacube(user_token, title, details, parameters)
         logger.info("Executing synchronous OpenEO job")
-        response = service.execute(auto_decode=False)
+        response = await run_blocking(service.execute, auto_decode=False)
         return Response(
             content=response.content,
             status_code=response.status_code,
@@ -180,14 +240,60 @@ class OpenEOPlatform(BaseProcessingPlatform):
     ) -> ProcessingStatusEnum:
         connection = await self._setup_connection(user_token, details.endpoint)
         job = connection.job(job_id)
-        return self._map_openeo_status(job.status())
+        return self._map_openeo_status(await run_blocking(job.status))
+
+    async def _list_job_statuses_once(
+        self, user_token: str, job_ids: List[str], details: ServiceDetails
+    ) -> Dict[str, ProcessingStatusEnum]:
+        connection = await self._setup_connection(user_token, details.endpoint)
+        jobs = await run_blocking(connection.list_jobs, limit=settings.status_listing_limit)
+        statuses = self._map_listed_statuses(jobs)
+
+        # The listing is paginated, the next pages are only requested as long as jobs are missing
+        missing = set(job_ids).difference(statuses)
+        requested: Set[str] = set()
+        while missing:
+            next_url = next((link.href for link in jobs.links if link.rel == "next"), None)
+            if not next_url or next_url in requested:
+                break
+            requested.add(next_url)
+            jobs = await run_blocking(self._get_job_listing_page, connection, next_url)
+            page_statuses = self._map_listed_statuses(jobs)
+            statuses.update(page_statuses)
+            missing.difference_update(page_statuses)
+        return statuses
+
+    @staticmethod
+    def _get_job_listing_page(
+        connection: openeo.Connection, url: str
+    ) -> JobListingResponse:
+        return JobListingResponse(
+            response_data=connection.get(url, expected_status=200).json(),
+            connection=connection,
+        )
+
+    def _map_listed_statuses(
+        self, jobs: JobListingResponse
+    ) -> Dict[str, ProcessingStatusEnum]:
+        return {
+            job["id"]: self._map_openeo_status(job.get("status"))
+            for job in jobs
+            if "id" in job
+        }
 
     async def _get_job_results_once(
         self, user_token: str, job_id: str, details: ServiceDetails
     ) -> Collection:
         connection = await self._setup_connection(user_token, details.endpoint)
         job = connection.job(job_id)
-        return Collection(**job.get_results().get_metadata())
+        metadata = await run_blocking(lambda: job.get_results().get_metadata())
+        return Collection(**metadata)
+
+    async def _cancel_job_once(
+        self, user_token: str, job_id: str, details: ServiceDetails
+    ) -> None:
+        connection = await self._setup_connection(user_token, details.endpoint)
+        await run_blocking(connection.job(job_id).stop_job)
 
     def _get_client_credentials(self, url: str) -> tuple[str, str, str]:
         """
@@ -213,7 +319,31 @@ class OpenEOPlatform(BaseProcessingPlatform):
         provider_id, client_id, client_secret = parts
         return provider_id, client_id, client_secret
 
-    def _get_process_id(self, url: str) -> str:
+    async def _resolve_service(self, url: str) -> ResolvedService:
+        """
+        Resolve the process ID and parameters of the service described by the UDP document
+        hosted at the given URL. The UDP document is resolved once per revision, after which the
+        resolved service is shared by all jobs that execute the service.
+
+        :param url: The URL of the UDP document.
+        :return: The resolved service.
+        """
+        entry = await udp_cache.get_entry(url)
+        service = self._resolved_services.get(url)
+        if service is None or service.revision != entry.revision:
+            logger.debug(f"Resolving openEO service at {url} (revision {entry.revision})")
+            service = ResolvedService(
+                revision=entry.revision,
+                document=entry.document,
+                parse_parameters=self._parse_service_parameters,
+            )
+        self._resolved_services[url] = service
+        self._resolved_services.move_to_end(url)
+        while len(self._resolved_services) > max(settings.udp_cache_size, 1):
+            self._resolved_services.popitem(last=False)
+        return service
+
+    async def _get_process_id(self, url: str) -> str:
         """
         Get the process ID from a JSON file hosted at the given URL.
 
@@ -222,22 +352,20 @@ class OpenEOPlatform(BaseProcessingPlatform):
         """
         logger.debug(f"Fetching process ID from {url}")
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-        except requests.RequestException as e:
+            service = await self._resolve_service(url)
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Error fetching process ID from {url}: {e}")
             raise ValueError(f"Failed to fetch process ID from {url}")
 
-        process_id = response.json().get("id")
-        if not process_id:
+        if not service.process_id:
             raise ValueError(f"No 'id' field found in process definition at {url}")
 
-        return process_id
+        return service.process_id
 
     async def _build_datacube(
         self, user_token: str, title: str, details: ServiceDetails, parameters: dict
     ) -> openeo.DataCube:
-        process_id = self._get_process_id(details.application)
+        process_id = await self._get_process_id(details.application)
 
         logger.debug(
             f"Executing OpenEO job with title={title}, service={details}, "
@@ -378,6 +506,63 @@ class OpenEOPlatform(BaseProcessingPlatform):
             )
             return ProcessingStatusEnum.UNKNOWN
 
+    async def _list_job_statuses(
+        self, user_token: str, job_ids: List[str], details: ServiceDetails
+    ) -> Optional[Dict[str, ProcessingStatusEnum]]:
+        try:
+            return await self._list_job_statuses_once(user_token, job_ids, details)
+        except OpenEoApiError as e:
+            if self._is_auth_error(e):
+                try:
+                    await self._refresh_connection(user_token, details.endpoint)
+                    return await self._list_job_statuses_once(user_token, job_ids, details)
+                except Exception as retry_error:
+                    logger.error(
+                        f"Error occurred while listing jobs on {details.endpoint} after "
+                        f"refresh: {retry_error}"
+                    )
+                    return None
+            logger.error(f"Error occurred while listing jobs on {details.endpoint}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error occurred while listing jobs on {details.endpoint}: {e}")
+            return None
+
+    async def get_job_statuses(
+        self, user_token: str, job_ids: List[str], details: ServiceDetails
+    ) -> Dict[str, ProcessingStatusEnum]:
+        logger.debug(
+            f"Fetching job status for {len(job_ids)} openEO jobs on {details.endpoint}"
+        )
+        # A page of the listing returns up to STATUS_LISTING_LIMIT jobs of the user, which only
+        # pays off when the status of many jobs is requested
+        if len(job_ids) < settings.status_listing_threshold:
+            return await super().get_job_statuses(user_token, job_ids, details)
+
+        async with get_status_limiter(details.endpoint):
+            listed_statuses = await self._list_job_statuses(user_token, job_ids, details)
+        if listed_statuses is None:
+            # Falling back to a request per job would flood a backend that is already failing,
+            # the statuses are retrieved again at the next poll instead
+            return {}
+        statuses = {
+            job_id: listed_statuses[job_id]
+            for job_id in job_ids
+            if job_id in listed_statuses
+        }
+
+        # Jobs can be missing from the listing, for example when the backend does not paginate
+        # its listing but caps it
+        missing = [job_id for job_id in job_ids if job_id not in listed_statuses]
+        if missing:
+            logger.debug(
+                f"{len(missing)} jobs not found in job listing, fetching status separately"
+            )
+            statuses.update(
+                await super().get_job_statuses(user_token, missing, details)
+            )
+        return statuses
+
     async def get_job_results(
         self, user_token: str, job_id: str, details: ServiceDetails
     ) -> Collection:
@@ -401,18 +586,39 @@ class OpenEOPlatform(BaseProcessingPlatform):
         except Exception as e:
             raise e
 
+    async def cancel_job(
+        self, user_token: str, job_id: str, details: ServiceDetails
+    ) -> None:
+        try:
+            logger.debug(f"Canceling openEO job with ID {job_id}")
+            await self._cancel_job_once(user_token, job_id, details)
+        except OpenEoApiError as e:
+            if self._is_auth_error(e):
+                try:
+                    await self._refresh_connection(user_token, details.endpoint)
+                    await self._cancel_job_once(user_token, job_id, details)
+                    return
+                except OpenEoApiError as retry_error:
+                    if self._is_auth_error(retry_error):
+                        raise AuthException(
+                            retry_error.http_status_code,
+                            "Authentication error when canceling job "
+                            f"{job_id}: {retry_error.message}",
+                        )
+                    raise retry_error
+            raise e
+
     async def get_service_parameters(
         self, user_token: str, details: ServiceDetails
     ) -> List[Parameter]:
-        parameters = []
         logger.debug(
             f"Fetching service parameters for OpenEO service at {details.application}"
         )
-        udp = requests.get(details.application)
-        udp.raise_for_status()
-        udp_params = udp.json().get("parameters", [])
+        return (await self._resolve_service(details.application)).parameters
 
-        for param in udp_params:
+    def _parse_service_parameters(self, udp: dict) -> List[Parameter]:
+        parameters = []
+        for param in udp.get("parameters", []):
             schemas = param.get("schema", {})
             if not isinstance(schemas, list):
                 schemas = [schemas]
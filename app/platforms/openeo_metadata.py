@@ -0,0 +1,128 @@
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, cast
+
+import openeo
+from loguru import logger
+from openeo.rest.auth.auth import NullAuth
+from openeo.rest.capabilities import OpenEoCapabilities
+from openeo.rest.auth.oidc import OidcProviderInfo
+
+from app.config.settings import settings
+
+T = TypeVar("T")
+
+# Metadata is identified by the URL of the backend, the kind of metadata and an optional name
+MetadataKey = Tuple[str, str, Optional[str]]
+
+
+class BackendMetadataCache:
+    """
+    Cache for the metadata of the openEO backends, such as their capabilities and OIDC providers,
+    that is shared by the connections of all users. The metadata is loaded from the backend at
+    most once per key and kept for a limited time. The cache is used from the threads in which
+    the blocking calls of the openEO client are executed, so concurrent loads of the same key
+    wait for a single load.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[MetadataKey, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[MetadataKey, threading.Lock] = {}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key: MetadataKey) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            return None
+
+    def get_or_load(self, key: MetadataKey, load: Callable[[], T]) -> T:
+        """
+        Retrieve the metadata for a key, either from the cache or by loading it.
+
+        :param key: The key of the metadata.
+        :param load: Function that loads the metadata from the backend.
+        :return: The metadata.
+        """
+        value = self.get(key)
+        if value is not None:
+            return cast(T, value)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # The metadata might have been loaded while waiting for the lock
+            value = self.get(key)
+            if value is not None:
+                return cast(T, value)
+
+            logger.debug(f"Loading openEO backend metadata {key}")
+            value = load()
+            self.store(key, value)
+            return value
+
+    def store(self, key: MetadataKey, value: Any):
+        if self.ttl > 0:
+            with self._lock:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+
+
+metadata_cache = BackendMetadataCache(ttl=settings.openeo_metadata_ttl)
+
+
+class CachedMetadataConnection(openeo.Connection):
+    """
+    Connection to an openEO backend that shares the metadata of the backend with the other
+    connections to the same backend. The API version discovery, the anonymous capabilities and
+    the OIDC provider discovery are only performed by the first connection, so that setting up a
+    connection for a new user only requires the authentication itself.
+
+    Process graphs are not validated by the client before a job is created, as this requires the
+    capabilities of every authenticated connection and an additional request per job, while the
+    backend validates the process graph when the job is started.
+    """
+
+    def __init__(self, url: str, **kwargs):
+        # The capabilities are already retrieved while initializing the connection
+        self._backend_url = url
+        kwargs.setdefault("auto_validate", False)
+        super().__init__(url, **kwargs)
+
+    @classmethod
+    def version_discovery(cls, url: str, *args, **kwargs) -> str:
+        key: MetadataKey = (url, "root_url", None)
+        root_url = metadata_cache.get(key)
+        if root_url is not None:
+            return root_url
+
+        root_url = super().version_discovery(url, *args, **kwargs)
+        # A failed discovery falls back to the given URL and is retried by the next connection
+        if root_url != url:
+            metadata_cache.store(key, root_url)
+        return root_url
+
+    def capabilities(self) -> OpenEoCapabilities:
+        # Backends can expose more capabilities to authenticated users, so only the anonymous
+        # capabilities are shared, authenticated connections keep their own copy
+        if not isinstance(self.auth, NullAuth):
+            return super().capabilities()
+        return metadata_cache.get_or_load(
+            (self._backend_url, "capabilities", None), super().capabilities
+        )
+
+    def _get_oidc_provider(
+        self, provider_id: Optional[str] = None, parse_info: bool = True
+    ) -> Tuple[str, Optional[OidcProviderInfo]]:
+        # The openEO client has no public hook for the provider discovery, which is performed by
+        # each OIDC authentication, its signature is verified by the tests
+        return metadata_cache.get_or_load(
+            (self._backend_url, "oidc_provider", f"{provider_id}:{parse_info}"),
+            functools.partial(super()._get_oidc_provider, provider_id, parse_info),
+        )
@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from typing import Any, Dict, NamedTuple, Optional
+
+import httpx
+from loguru import logger
+
+
+class UDPEntry(NamedTuple):
+    expires_at: float
+    etag: Optional[str]
+    # Identifies the content of the document, which is its ETag or a hash of its content
+    revision: str
+    document: Dict[str, Any]
+
+
+class UDPCache:
+    """
+    In-memory cache for the User Defined Process (UDP) documents that describe the services
+    executed on the platforms. The documents are downloaded through a shared HTTP client and
+    kept for a limited time, after which they are revalidated through their ETag, so that an
+    unchanged document is not downloaded again. Concurrent requests for the same document are
+    coalesced into a single download. When the cache is full, the least recently used document
+    is evicted.
+
+    The cached documents are shared by all callers and should not be modified.
+    """
+
+    def __init__(self, max_size: int, ttl: float, timeout: float = 10.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.timeout = timeout
+        self._entries: OrderedDict[str, UDPEntry] = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def clear(self):
+        self._entries.clear()
+
+    async def aclose(self):
+        """Close the HTTP client of the cache, which is recreated when it is used again."""
+        client, self._client, self._client_loop = self._client, None, None
+        if client is not None:
+            # The connections of a client opened in an event loop that has been closed since
+            # can no longer be closed gracefully
+            with suppress(Exception):
+                await client.aclose()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # The connections of a client are bound to the event loop in which they were opened
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            await self.aclose()
+            self._client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True)
+            self._client_loop = loop
+        return self._client
+
+    def _store(self, url: str, entry: UDPEntry) -> UDPEntry:
+        if self.max_size <= 0:
+            return entry
+        self._entries[url] = entry
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            logger.debug(f"Evicted UDP document {evicted} from the cache")
+        return entry
+
+    async def _download(self, url: str, entry: Optional[UDPEntry]) -> UDPEntry:
+        headers = {"If-None-Match": entry.etag} if entry and entry.etag else {}
+        client = await self._get_client()
+        response = await client.get(url, headers=headers)
+        expires_at = time.monotonic() + self.ttl
+        if entry and response.status_code == httpx.codes.NOT_MODIFIED:
+            logger.debug(f"UDP document {url} was not modified")
+            return self._store(url, entry._replace(expires_at=expires_at))
+
+        response.raise_for_status()
+        document = response.json()
+        if not isinstance(document, dict):
+            raise ValueError(f"UDP document at {url} is not a JSON object")
+        logger.debug(f"Downloaded UDP document {url}")
+        etag = response.headers.get("ETag")
+        revision = etag or hashlib.sha256(response.content).hexdigest()
+        return self._store(url, UDPEntry(expires_at, etag, revision, document))
+
+    async def get(self, url: str) -> Dict[str, Any]:
+        """
+        Retrieve the UDP document hosted at the given URL.
+
+        :param url: The URL of the UDP document.
+        :return: The parsed UDP document.
+        :raises httpx.HTTPError: If the document could not be downloaded.
+        :raises ValueError: If the document is not a JSON object.
+        """
+        return (await self.get_entry(url)).document
+
+    async def get_entry(self, url: str) -> UDPEntry:
+        """
+        Retrieve the UDP document hosted at the given URL, together with its revision, either
+        from the cache, from a concurrent download of the same document or by downloading it.
+
+        :param url: The URL of the UDP document.
+        :return: The cache entry of the UDP document.
+        :raises httpx.HTTPError: If the document could not be downloaded.
+        :raises ValueError: If the document is not a JSON object.
+        """
+        entry = self._entries.get(url)
+        if entry and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(url)
+            return entry
+
+        if url in self._in_flight:
+            return await asyncio.shield(self._in_flight[url])
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[url] = future
+        try:
+            entry = await self._download(url, entry)
+            future.set_result(entry)
+            return entry
+        except Exception as e:
+            future.set_exception(e)
+            # Avoid warnings about an exception that was never retrieved by another caller
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._in_flight[url]
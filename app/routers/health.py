@@ -1,9 +1,13 @@
+from typing import List
+
 from fastapi import APIRouter, Depends
 from loguru import logger
 from sqlalchemy.orm import Session
 
 from app.database.db import get_db
 from app.database.models.processing_job import ProcessingJobRecord
+from app.schemas.submission import SubmissionQueueMetrics
+from app.services.scheduler import get_submission_queue_metrics
 from fastapi.responses import JSONResponse
 from fastapi import status as http_status
 
@@ -47,3 +51,11 @@ async def health(db: Session = Depends(get_db)):
             "database": db_status,
         },
     )
+
+
+@router.get("/health/submissions")
+async def submission_queue_health(
+    db: Session = Depends(get_db),
+) -> List[SubmissionQueueMetrics]:
+    """Retrieve the depth and waiting time of the job submission queue per priority class."""
+    return get_submission_queue_metrics(db)
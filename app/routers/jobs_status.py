@@ -1,4 +1,3 @@
-import asyncio
 import json
 from typing import List
 
@@ -6,14 +5,16 @@ from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
 from loguru import logger
 
+from app.config.settings import settings
 from app.database.db import SessionLocal, get_db
 from app.error import DispatcherException, ErrorResponse, InternalException
 from app.middleware.error_handling import get_dispatcher_error_response
 from app.schemas.jobs_status import JobsFilter, JobsStatusResponse
 from app.schemas.websockets import WSStatusMessage
 from app.services.processing import get_processing_jobs_by_user_id
+from app.services.status_hub import StatusDeltaEncoder, status_hub
 from app.services.upscaling import get_upscaling_tasks_by_user_id
-from app.auth import oauth2_scheme, websocket_authenticate
+from app.auth import get_current_user_id, oauth2_scheme, websocket_authenticate
 
 router = APIRouter()
 
@@ -82,9 +83,13 @@ async def ws_jobs_status(
     websocket: WebSocket,
     interval: int = 10,
     filter: List[JobsFilter] = Query(DEFAULT_FILTERS),
+    delta: bool = False,
 ):
     """
     Return combined list of upscaling tasks and processing jobs for the authenticated user.
+    When delta is enabled, only the first message and a periodic snapshot contain the full
+    status. All other messages only contain the changes since the previous message, and no
+    message is sent when the status did not change.
     """
 
     token = await websocket_authenticate(websocket)
@@ -95,23 +100,46 @@ async def ws_jobs_status(
         WSStatusMessage(type="init", message="Starting status stream").model_dump()
     )
 
+    async def compute_status(user_token: str):
+        with SessionLocal() as db:
+            status = await get_jobs_status(db, user_token, filter=filter)
+            return json.loads(status.model_dump_json())
+
+    encoder = StatusDeltaEncoder(settings.status_snapshot_interval) if delta else None
+
     try:
-        while True:
-            with SessionLocal() as db:
-                await websocket.send_json(
-                    WSStatusMessage(
-                        type="loading",
-                        message="Starting retrieval of status",
-                    ).model_dump()
-                )
-                status = await get_jobs_status(db, token, filter=filter)
-                await websocket.send_json(
-                    WSStatusMessage(
-                        type="status",
-                        data=json.loads(status.model_dump_json()),
-                    ).model_dump()
-                )
-                await asyncio.sleep(interval)
+        user = get_current_user_id(token)
+        # Connections of the same user share a single status computation
+        topic = ("jobs_status", user, tuple(sorted(filter)), interval)
+        async with status_hub.subscribe(
+            topic, token, compute_status, interval
+        ) as updates:
+            while True:
+                update = await updates.get()
+                if update.error:
+                    raise update.error
+                if update.type == "loading":
+                    # In delta mode, nothing is sent until the status has changed
+                    if not encoder:
+                        await websocket.send_json(
+                            WSStatusMessage(
+                                type="loading",
+                                message="Starting retrieval of status",
+                            ).model_dump()
+                        )
+                elif encoder:
+                    encoded = encoder.encode(update.data)
+                    if encoded:
+                        message_type, data, sequence = encoded
+                        await websocket.send_json(
+                            WSStatusMessage(
+                                type=message_type, data=data, sequence=sequence
+                            ).model_dump()
+                        )
+                else:
+                    await websocket.send_json(
+                        WSStatusMessage(type="status", data=update.data).model_dump()
+                    )
 
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
@@ -130,5 +158,3 @@ async def ws_jobs_status(
             ).model_dump()
         )
         await websocket.close(code=1011, reason="INTERNAL_ERROR")
-    finally:
-        db.close()
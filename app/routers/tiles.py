@@ -3,7 +3,12 @@ from fastapi import APIRouter, status, Body
 from geojson_pydantic import GeometryCollection, Polygon
 from loguru import logger
 
-from app.error import DispatcherException, ErrorResponse, InternalException
+from app.error import (
+    DispatcherException,
+    ErrorResponse,
+    InternalException,
+    TileLimitException,
+)
 from app.middleware.error_handling import get_dispatcher_error_response
 from app.schemas.tiles import GridTypeEnum, TileRequest
 from app.services.tiles.base import split_polygon_by_grid
@@ -57,6 +62,17 @@ router = APIRouter()
                 }
             },
         },
+        TileLimitException.http_status: {
+            "description": "Area of interest is split in more than MAX_GRID_TILES tiles",
+            "model": ErrorResponse,
+            "content": {
+                "application/json": {
+                    "example": get_dispatcher_error_response(
+                        TileLimitException(), "request-id"
+                    )
+                }
+            },
+        },
         InternalException.http_status: {
             "description": "Internal server error",
             "model": ErrorResponse,
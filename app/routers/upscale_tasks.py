@@ -1,25 +1,30 @@
-import asyncio
 import json
-from typing import Annotated
+from typing import Annotated, Any, AsyncIterator
 from fastapi import (
-    BackgroundTasks,
     Body,
     APIRouter,
     Depends,
+    Request,
     WebSocket,
     WebSocketDisconnect,
     status,
 )
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
 from loguru import logger
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from app.auth import oauth2_scheme, websocket_authenticate
+from app.auth import get_current_user_id, oauth2_scheme, websocket_authenticate
+from app.config.settings import settings
 from app.database.db import SessionLocal, get_db
 from app.error import (
     DispatcherException,
     ErrorResponse,
     InternalException,
+    TaskConflictException,
     TaskNotFoundException,
+    UnsupportedMediaTypeException,
 )
 from app.middleware.error_handling import get_dispatcher_error_response
 from app.schemas.enum import OutputFormatEnum, ProcessTypeEnum
@@ -30,19 +35,27 @@ from app.schemas.upscale_task import (
     ParameterDimension,
     UpscalingTask,
     UpscalingTaskRequest,
+    UpscalingTaskStreamRequest,
     UpscalingTaskSummary,
 )
 from app.schemas.websockets import WSTaskStatusMessage
+from app.services.credentials import get_submission_credential
+from app.services.status_hub import StatusDeltaEncoder, status_hub
 from app.services.upscaling import (
-    create_upscaling_processing_jobs,
+    cancel_upscaling_task,
     create_upscaling_task,
     get_upscaling_task_by_user_id,
+    queue_streamed_upscaling_processing_jobs,
+    queue_upscaling_processing_jobs,
+    resume_upscaling_task,
 )
 
 # from app.auth import get_current_user
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 @router.post(
     "/upscale_tasks",
@@ -124,21 +137,18 @@ async def create_upscale_task(
             },
         ),
     ],
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme),
 ) -> UpscalingTaskSummary:
-    """Create a new upscaling job with the provided data."""
+    """
+    Create a new upscaling job with the provided data. The processing jobs are created in a
+    worker thread, as splitting up large dimensions and inserting the jobs would otherwise block
+    the handling of other requests. When not all processing jobs could be created, the upscaling
+    task is canceled together with the processing jobs that were already queued.
+    """
     try:
-        task = create_upscaling_task(token, db, payload)
-        background_tasks.add_task(
-            create_upscaling_processing_jobs,
-            token=token,
-            database=db,
-            request=payload,
-            upscaling_task_id=task.id,
-        )
-        return task
+        credential = await get_submission_credential(token)
+        task = await run_in_threadpool(create_upscaling_task, token, db, payload)
     except DispatcherException as de:
         raise de
     except Exception as e:
@@ -148,6 +158,171 @@ async def create_upscale_task(
             details={"error": str(e)},
         )
 
+    try:
+        await run_in_threadpool(
+            queue_upscaling_processing_jobs, token, db, payload, task.id, credential
+        )
+        return task
+    except Exception as e:
+        logger.error(f"Error queueing the processing jobs of upscaling task {task.id}: {e}")
+        await _cancel_incomplete_upscale_task(token, db, task.id)
+        if isinstance(e, DispatcherException):
+            raise e
+        raise InternalException(
+            message="An error occurred while retrieving processing job results.",
+            details={"error": str(e), "task_id": task.id},
+        )
+
+
+async def _cancel_incomplete_upscale_task(token: str, db: Session, task_id: int):
+    """
+    Cancel an upscaling task of which not all processing jobs could be created, so that the
+    jobs that were already queued do not run as a partial task.
+    """
+    try:
+        db.rollback()
+        await cancel_upscaling_task(token, db, task_id)
+    except Exception as e:
+        logger.error(f"Could not cancel incomplete upscaling task {task_id}: {e}")
+
+
+async def _iter_ndjson(stream: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """
+    Parse a newline-delimited JSON body while it is being received. Only the current line is
+    kept in memory. Empty lines are skipped.
+    """
+    line_number = 0
+    buffer = bytearray()
+
+    def parse(line: bytearray) -> Any:
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "json_invalid",
+                        "loc": ("body", line_number),
+                        "msg": f"Invalid JSON: {e}",
+                    }
+                ]
+            )
+
+    async for chunk in stream:
+        buffer.extend(chunk)
+        *lines, rest = buffer.split(b"\n")
+        buffer = bytearray(rest)
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield parse(line)
+    if buffer.strip():
+        line_number += 1
+        yield parse(buffer)
+
+
+@router.post(
+    "/upscale_tasks/stream",
+    status_code=status.HTTP_201_CREATED,
+    tags=["Upscale Tasks"],
+    summary="Create a new upscaling task from a stream of dimension values",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "description": "Newline-delimited JSON (`application/x-ndjson`) body. The first "
+            "line contains the upscaling task request, in which the dimension only holds the "
+            "`name` of the parameter. Each subsequent line contains one value of the dimension.",
+            "content": {
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {"type": "string"},
+                    "example": '{"title": "Example openEO Job", "label": "openeo", '
+                    '"service": {"endpoint": "https://openeofed.dataspace.copernicus.eu", '
+                    '"application": "https://example.com/udp.json"}, "format": "gtiff", '
+                    '"parameters": {}, "dimension": {"name": "spatial_extent"}}\n'
+                    '{"type": "Point", "coordinates": [4.81, 51.23]}\n'
+                    '{"type": "Point", "coordinates": [4.83, 51.33]}\n',
+                }
+            },
+        }
+    },
+    responses={
+        UnsupportedMediaTypeException.http_status: {
+            "description": "Request body is not newline-delimited JSON",
+            "model": ErrorResponse,
+            "content": {
+                "application/json": {
+                    "example": get_dispatcher_error_response(
+                        UnsupportedMediaTypeException(), "request-id"
+                    )
+                }
+            },
+        },
+        InternalException.http_status: {
+            "description": "Internal server error",
+            "model": ErrorResponse,
+            "content": {
+                "application/json": {
+                    "example": get_dispatcher_error_response(
+                        InternalException(), "request-id"
+                    )
+                }
+            },
+        },
+    },
+)
+async def create_streamed_upscale_task(
+    request: Request,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+) -> UpscalingTaskSummary:
+    """
+    Create a new upscaling task of which the dimension values are streamed in the request body.
+    The processing jobs are queued in batches while the values are being received, which allows
+    upscaling tasks with a very large number of values. When an invalid line is received or the
+    upload is interrupted, the upscaling task is canceled together with the processing jobs
+    that were already queued. As in the creation of regular upscaling tasks, the task and its
+    jobs are stored in a worker thread.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type != NDJSON_MEDIA_TYPE:
+        raise UnsupportedMediaTypeException(
+            message=f"The request body must be newline-delimited JSON ({NDJSON_MEDIA_TYPE}).",
+            details={"content_type": content_type},
+        )
+
+    lines = _iter_ndjson(request.stream())
+    try:
+        payload = UpscalingTaskStreamRequest.model_validate(await anext(lines, None))
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+    try:
+        credential = await get_submission_credential(token)
+        task = await run_in_threadpool(create_upscaling_task, token, db, payload)
+    except DispatcherException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Error creating streamed upscaling task: {e}")
+        raise InternalException(
+            message="An error occurred while creating the upscaling task.",
+            details={"error": str(e)},
+        )
+
+    try:
+        await queue_streamed_upscaling_processing_jobs(
+            token, db, payload, lines, task.id, credential
+        )
+        return task
+    except Exception as e:
+        logger.error(f"Error streaming the values of upscaling task {task.id}: {e}")
+        await _cancel_incomplete_upscale_task(token, db, task.id)
+        if isinstance(e, (DispatcherException, RequestValidationError)):
+            raise e
+        raise InternalException(
+            message="An error occurred while creating the upscaling task.",
+            details={"error": str(e), "task_id": task.id},
+        )
+
 
 @router.get(
     "/upscale_tasks/{task_id}",
@@ -198,35 +373,184 @@ async def get_upscale_task(
         )
 
 
+@router.post(
+    "/upscale_tasks/{task_id}/resume",
+    tags=["Upscale Tasks"],
+    summary="Resume the creation of the processing jobs of an upscaling task",
+    responses={
+        TaskNotFoundException.http_status: {
+            "description": "Upscaling task not found",
+            "model": ErrorResponse,
+            "content": {
+                "application/json": {
+                    "example": get_dispatcher_error_response(
+                        TaskNotFoundException(), "request-id"
+                    )
+                }
+            },
+        },
+        TaskConflictException.http_status: {
+            "description": "Request does not match the upscaling task, or the task is "
+            "canceled or has no missing processing jobs",
+            "model": ErrorResponse,
+            "content": {
+                "application/json": {
+                    "example": get_dispatcher_error_response(
+                        TaskConflictException(), "request-id"
+                    )
+                }
+            },
+        },
+        InternalException.http_status: {
+            "description": "Internal server error",
+            "model": ErrorResponse,
+            "content": {
+                "application/json": {
+                    "example": get_dispatcher_error_response(
+                        InternalException(), "request-id"
+                    )
+                }
+            },
+        },
+    },
+)
+async def resume_upscale_task(
+    task_id: int,
+    payload: UpscalingTaskRequest,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+) -> UpscalingTaskSummary:
+    """
+    Resume an upscaling task of which the creation of the processing jobs was interrupted. The
+    request body must contain the request with which the task was created. Only the processing
+    jobs that are missing are created and submitted, so the request can safely be retried.
+    """
+    try:
+        credential = await get_submission_credential(token)
+        task = await run_in_threadpool(
+            resume_upscaling_task, token, db, task_id, payload, credential
+        )
+        if not task:
+            logger.error(f"Upscale task {task_id} not found")
+            raise TaskNotFoundException()
+        return task
+    except DispatcherException as de:
+        raise de
+    except Exception as e:
+        logger.error(f"Error resuming upscale task {task_id}: {e}")
+        raise InternalException(
+            message="An error occurred while resuming the upscale task.",
+            details={"error": str(e)},
+        )
+
+
+@router.post(
+    "/upscale_tasks/{task_id}/cancel",
+    tags=["Upscale Tasks"],
+    summary="Cancel an upscaling task and all of its active processing jobs",
+    responses={
+        TaskNotFoundException.http_status: {
+            "description": "Upscaling task not found",
+            "model": ErrorResponse,
+            "content": {
+                "application/json": {
+                    "example": get_dispatcher_error_response(
+                        TaskNotFoundException(), "request-id"
+                    )
+                }
+            },
+        },
+        InternalException.http_status: {
+            "description": "Internal server error",
+            "model": ErrorResponse,
+            "content": {
+                "application/json": {
+                    "example": get_dispatcher_error_response(
+                        InternalException(), "request-id"
+                    )
+                }
+            },
+        },
+    },
+)
+async def cancel_upscale_task(
+    task_id: int,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+) -> UpscalingTaskSummary:
+    """
+    Cancel an upscaling task. Processing jobs that were not submitted yet are no longer
+    submitted and the jobs that are running on the platforms are canceled.
+    """
+    try:
+        task = await cancel_upscaling_task(token, db, task_id)
+        if not task:
+            logger.error(f"Upscale task {task_id} not found")
+            raise TaskNotFoundException()
+        return task
+    except DispatcherException as de:
+        raise de
+    except Exception as e:
+        logger.error(f"Error canceling upscale task {task_id}: {e}")
+        raise InternalException(
+            message="An error occurred while canceling the upscale task.",
+            details={"error": str(e)},
+        )
+
+
 @router.websocket("/ws/upscale_tasks/{task_id}")
 async def ws_task_status(
     websocket: WebSocket,
     task_id: int,
     interval: int = 10,
+    delta: bool = False,
 ):
+    """
+    Stream the status of an upscaling task. When delta is enabled, only the first message and a
+    periodic snapshot contain the full task. All other messages only contain the changes since
+    the previous message, and no message is sent when the task did not change.
+    """
     token = await websocket_authenticate(websocket)
     if not token:
         return
 
     logger.info("WebSocket connected", extra={"token": token, "task_id": task_id})
 
+    async def compute_status(user_token: str):
+        with SessionLocal() as db:
+            task = await get_upscale_task(task_id, db, user_token)
+            return json.loads(task.model_dump_json()) if task else None
+
+    encoder = StatusDeltaEncoder(settings.status_snapshot_interval) if delta else None
+
     try:
         await websocket.send_json(
             WSTaskStatusMessage(
                 type="init", task_id=task_id, message="Starting status stream"
             ).model_dump()
         )
-        while True:
-            with SessionLocal() as db:
-                await websocket.send_json(
-                    WSTaskStatusMessage(
-                        type="loading",
-                        task_id=task_id,
-                        message="Starting retrieval of status",
-                    ).model_dump()
-                )
-                status = await get_upscale_task(task_id, db, token)
-                if not status:
+        user = get_current_user_id(token)
+        # Connections of the same user to the same task share a single status computation
+        topic = ("upscale_task", user, task_id, interval)
+        async with status_hub.subscribe(
+            topic, token, compute_status, interval
+        ) as updates:
+            while True:
+                update = await updates.get()
+                if update.error:
+                    raise update.error
+                if update.type == "loading":
+                    # In delta mode, nothing is sent until the status has changed
+                    if not encoder:
+                        await websocket.send_json(
+                            WSTaskStatusMessage(
+                                type="loading",
+                                task_id=task_id,
+                                message="Starting retrieval of status",
+                            ).model_dump()
+                        )
+                    continue
+                if not update.data:
                     await websocket.send_json(
                         WSTaskStatusMessage(
                             type="error",
@@ -238,14 +562,26 @@ async def ws_task_status(
                         code=1011, reason=f"Upscale task {task_id} not found"
                     )
                     break
+                if encoder:
+                    encoded = encoder.encode(update.data)
+                    if encoded:
+                        message_type, data, sequence = encoded
+                        await websocket.send_json(
+                            WSTaskStatusMessage(
+                                type=message_type,
+                                task_id=task_id,
+                                data=data,
+                                sequence=sequence,
+                            ).model_dump()
+                        )
+                    continue
                 await websocket.send_json(
                     WSTaskStatusMessage(
                         type="status",
                         task_id=task_id,
-                        data=json.loads(status.model_dump_json()),
+                        data=update.data,
                     ).model_dump()
                 )
-                await asyncio.sleep(interval)
 
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
@@ -269,5 +605,3 @@ async def ws_task_status(
             ).model_dump()
         )
         await websocket.close(code=1011, reason="INTERNAL_ERROR")
-    finally:
-        db.close()
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class ProcessTypeEnum(str, Enum):
@@ -21,3 +21,13 @@ class OutputFormatEnum(str, Enum):
     GEOTIFF = "gtiff"
     NETCDF = "netcdf"
     JSON = "json"
+
+
+class SubmissionPriorityEnum(IntEnum):
+    """
+    Priority classes of the queued job submissions. Submissions of a class with a lower value
+    are always submitted first.
+    """
+
+    INTERACTIVE = 0
+    BATCH = 1
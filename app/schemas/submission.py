@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+
+
+class SubmissionQueueMetrics(BaseModel):
+    priority: str = Field(
+        ...,
+        description="Priority class of the queued job submissions",
+        examples=["interactive"],
+    )
+    depth: int = Field(
+        ...,
+        description="Number of processing jobs that are waiting to be submitted to a platform",
+        examples=[42],
+    )
+    users: int = Field(
+        ..., description="Number of users with queued processing jobs", examples=[3]
+    )
+    max_wait: float = Field(
+        ...,
+        description="Time (in seconds) that the oldest queued processing job has been waiting",
+        examples=[12.5],
+    )
@@ -89,3 +89,9 @@ class BaseJobRequest(BaseModel):
     format: OutputFormatEnum = Field(
         ..., description="Expected format of the output results"
     )
+    reuse_results: bool = Field(
+        default=False,
+        description="Reuse the results of a finished job of the user with the same service, "
+        "parameters and format instead of launching a new job, provided that the job finished "
+        "within the configured freshness window",
+    )
@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import Any, List
+from typing import Any, List, Union
+from geojson_pydantic import Polygon
 from pydantic import BaseModel, Field
 from app.schemas.enum import ProcessTypeEnum, ProcessingStatusEnum
+from app.schemas.tiles import GridTypeEnum
 from app.schemas.unit_job import BaseJobRequest, ProcessingJobSummary, ServiceDetails
 
 
@@ -22,6 +24,12 @@ class UpscalingTaskSummary(BaseModel):
         description="Status of the processing of the upscaling task",
         examples=[ProcessingStatusEnum.RUNNING],
     )
+    progress: float = Field(
+        default=0.0,
+        description="Percentage of the processing jobs of the upscaling task that have "
+        "completed, either successfully or not",
+        examples=[42.5],
+    )
 
 
 class UpscalingTaskDetails(BaseModel):
@@ -108,10 +116,45 @@ class ParameterDimension(BaseModel):
     )
 
 
+class GridDimension(BaseModel):
+    name: str = Field(
+        ...,
+        description="Name of the parameter for which to loop the tiles of the grid",
+        examples=["spatial_extent"],
+    )
+    aoi: Polygon = Field(
+        ...,
+        description="Polygon representing the area of interest that should be split up in "
+        "tiles. A processing job is created for each tile.",
+    )
+    grid: GridTypeEnum = Field(
+        ...,
+        description="Identifier of the grid system that needs to be used to split up the area of "
+        "interest",
+    )
+
+
 class UpscalingTaskRequest(BaseJobRequest):
-    dimension: ParameterDimension = Field(
+    dimension: Union[ParameterDimension, GridDimension] = Field(
+        ...,
+        description="Parameter upon which the upscaling job should be executed. Either a list "
+        "of values or an area of interest that is split up in tiles by the server.",
+    )
+
+
+class StreamedDimension(BaseModel):
+    name: str = Field(
+        ...,
+        description="Name of the parameter for which the values are streamed after the request",
+        examples=["spatial_extent"],
+    )
+
+
+class UpscalingTaskStreamRequest(BaseJobRequest):
+    dimension: StreamedDimension = Field(
         ...,
-        description="Parameter upon which the upscaling job should be executed",
+        description="Parameter upon which the upscaling job should be executed. The values of "
+        "the parameter are provided on the subsequent lines of the request body.",
     )
 
 
@@ -3,9 +3,10 @@ from pydantic import BaseModel
 
 
 class WSStatusMessage(BaseModel):
-    type: Literal["init", "status", "loading", "error"]
+    type: Literal["init", "status", "delta", "loading", "error"]
     data: Optional[Any] = None
     message: Optional[str] = None
+    sequence: Optional[int] = None
 
 
 class WSTaskStatusMessage(WSStatusMessage):
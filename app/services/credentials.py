@@ -0,0 +1,112 @@
+import datetime
+import time
+from typing import NamedTuple, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+from fastapi import status
+from loguru import logger
+
+from app.auth import exchange_offline_token, refresh_access_token
+from app.config.settings import settings
+from app.error import AuthException
+from app.cache import TTLCache
+
+# Access tokens are renewed this many seconds before they expire, so that they do not expire
+# while a job is being submitted
+ACCESS_TOKEN_EXPIRY_MARGIN = 30
+
+
+class SubmissionCredential(NamedTuple):
+    """
+    Credential with which the queued jobs of a user are submitted on behalf of the user: an
+    encrypted offline token of the user and the time at which it expires, if it expires.
+    """
+
+    token: str
+    expires_at: Optional[datetime.datetime]
+
+
+# Access tokens retrieved through the offline tokens, keyed by the encrypted offline token, so
+# that the jobs of the same request are submitted with a single access token
+_access_tokens: TTLCache[str] = TTLCache(
+    max_size=settings.submission_batch_size
+)
+
+
+def validate_submission_credential_key():
+    """
+    Verify that SUBMISSION_CREDENTIAL_KEY holds a valid key, so that a missing key is reported
+    when the API or a job submission worker starts instead of when the first job is queued.
+    """
+    if not settings.submission_credential_key:
+        logger.error("SUBMISSION_CREDENTIAL_KEY environment variable is not set.")
+        raise RuntimeError("SUBMISSION_CREDENTIAL_KEY environment variable must be set")
+    try:
+        Fernet(settings.submission_credential_key)
+    except ValueError as e:
+        logger.error(f"SUBMISSION_CREDENTIAL_KEY is not a valid key: {e}")
+        raise RuntimeError("SUBMISSION_CREDENTIAL_KEY must be a valid Fernet key")
+
+
+def _get_fernet() -> Fernet:
+    if not settings.submission_credential_key:
+        raise AuthException(
+            http_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            message="Job submissions not configured on the server (missing credential key).",
+        )
+    return Fernet(settings.submission_credential_key)
+
+
+async def get_submission_credential(token: str) -> SubmissionCredential:
+    """
+    Exchange the access token of a user for the credential with which the queued jobs of the
+    user are submitted. Access tokens typically expire long before a large upscaling task is
+    submitted, so an offline token is stored instead, encrypted with SUBMISSION_CREDENTIAL_KEY.
+
+    :param token: The access token of the user.
+    :return: The credential to store with the job submissions of the user.
+    """
+    response = await exchange_offline_token(token)
+    lifetime = response.get("refresh_expires_in") or 0
+    return SubmissionCredential(
+        token=_get_fernet().encrypt(response["refresh_token"].encode()).decode(),
+        expires_at=(
+            datetime.datetime.utcnow() + datetime.timedelta(seconds=lifetime)
+            if lifetime
+            else None
+        ),
+    )
+
+
+async def get_submission_access_token(credential: str) -> str:
+    """
+    Retrieve an access token of a user through the stored credential of a job submission. The
+    access token is shared by the submissions with the same credential until it expires.
+
+    :param credential: The encrypted offline token of the job submission.
+    :return: The access token of the user.
+    """
+    access_token = _access_tokens.get(credential)
+    if access_token:
+        return access_token
+
+    async with _access_tokens.lock(credential):
+        access_token = _access_tokens.get(credential)
+        if access_token:
+            return access_token
+
+        try:
+            offline_token = _get_fernet().decrypt(credential.encode()).decode()
+        except InvalidToken:
+            raise AuthException(
+                http_status=status.HTTP_401_UNAUTHORIZED,
+                message="The credential of the job submission could not be decrypted.",
+            )
+        logger.debug("Retrieving an access token to submit queued jobs")
+        response = await refresh_access_token(offline_token)
+        _access_tokens.put(
+            credential,
+            response["access_token"],
+            time.time() + response.get("expires_in", 0) - ACCESS_TOKEN_EXPIRY_MARGIN,
+        )
+        return response["access_token"]
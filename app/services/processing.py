@@ -1,21 +1,44 @@
+import asyncio
+import datetime
+import hashlib
 import json
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, cast
 
 from fastapi import Response
 from loguru import logger
 from app.auth import get_current_user_id
+from app.config.settings import settings
+from app.database.models.job_submission import (
+    JobSubmissionRecord,
+    get_claimed_job_ids,
+    remove_pending_job_submissions,
+)
 from app.database.models.processing_job import (
     ProcessingJobRecord,
+    add_job_to_db,
+    cancel_queued_jobs,
     get_job_by_user_id,
     get_jobs_by_user_id,
+    get_reusable_jobs,
+    reload_jobs,
     remove_job_by_id,
     save_job_to_db,
-    update_job_status_by_id,
+    update_job_poll_schedules,
+    update_job_statuses,
 )
 from app.platforms.dispatcher import get_processing_platform
+from app.services.credentials import get_submission_credential
+from app.services.scheduler import queue_job_submissions
+from app.services.status_cache import StatusCache, StatusKey
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.schemas.enum import ProcessingStatusEnum
+from app.schemas.enum import (
+    ProcessingStatusEnum,
+    ProcessTypeEnum,
+    SubmissionPriorityEnum,
+)
 from app.schemas.parameters import ParamRequest, Parameter
 from app.schemas.unit_job import (
     BaseJobRequest,
@@ -32,6 +55,53 @@ INACTIVE_JOB_STATUSES = {
     ProcessingStatusEnum.FINISHED,
 }
 
+status_cache = StatusCache(ttl=settings.status_cache_ttl)
+
+
+def get_job_request_hash(request: BaseJobRequest) -> str:
+    """
+    Compute a canonical hash of the service, parameters and output format of a job request.
+    Requests that only differ in their title or in the order of their parameters share the same
+    hash.
+
+    :param request: The processing job request.
+    :return: The hexadecimal SHA-256 hash of the request.
+    """
+    content = json.dumps(
+        {
+            "label": request.label,
+            "service": request.service.model_dump(mode="json"),
+            "parameters": request.parameters,
+            "format": request.format,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def find_reusable_jobs(
+    database: Session, user: str, requests: List[BaseJobRequest]
+) -> Dict[str, ProcessingJobRecord]:
+    """
+    Find finished jobs of the user of which the results can be reused for the given requests.
+    Only requests that opted in to reusing results are considered, and only jobs that finished
+    within RESULT_REUSE_MAX_AGE seconds can be reused. Jobs of other users are never reused, as
+    their results are not accessible by the user on the platform.
+
+    :param database: The database session to use.
+    :param user: The ID of the user creating the jobs.
+    :param requests: The processing job requests.
+    :return: The reusable jobs, keyed by request hash.
+    """
+    request_hashes = [
+        get_job_request_hash(request) for request in requests if request.reuse_results
+    ]
+    finished_after = datetime.datetime.utcnow() - datetime.timedelta(
+        seconds=settings.result_reuse_max_age
+    )
+    return get_reusable_jobs(database, user, request_hashes, finished_after)
+
 
 async def create_processing_job(
     token: str,
@@ -39,52 +109,63 @@ async def create_processing_job(
     request: BaseJobRequest,
     upscaling_task_id: int | None = None,
 ) -> ProcessingJobSummary:
+    """
+    Create a processing job and queue it for submission to the platform. The job is queued in
+    the interactive priority class, so that it is submitted before the jobs of upscaling tasks.
+    Until it is submitted by a job submission worker, the job has the QUEUED status. When the
+    results of a finished job can be reused, the job is linked to these results instead.
+
+    :param token: The access token of the user creating the job.
+    :param database: The database session to use.
+    :param request: The processing job request.
+    :param upscaling_task_id: The ID of the upscaling task the job belongs to, if any.
+    :return: The summary of the created job.
+    """
     user = get_current_user_id(token)
     logger.info(f"Creating processing job for {user} with summary: {request}")
+    request_hash = get_job_request_hash(request)
 
-    try:
-        platform = get_processing_platform(request.label)
-
-        job_id = await platform.execute_job(
-            user_token=token,
-            title=request.title,
-            details=request.service,
-            parameters=request.parameters,
-            format=request.format,
-        )
+    reusable_job = find_reusable_jobs(database, user, [request]).get(request_hash)
+    record = ProcessingJobRecord(
+        title=request.title,
+        label=request.label,
+        status=(
+            ProcessingStatusEnum.FINISHED if reusable_job else ProcessingStatusEnum.QUEUED
+        ),
+        user_id=user,
+        platform_job_id=reusable_job.platform_job_id if reusable_job else None,
+        finished_at=reusable_job.finished_at if reusable_job else None,
+        parameters=json.dumps(request.parameters),
+        service=request.service.model_dump_json(),
+        endpoint=request.service.endpoint,
+        upscaling_task_id=upscaling_task_id,
+        request_hash=request_hash,
+    )
 
-        record = ProcessingJobRecord(
-            title=request.title,
-            label=request.label,
-            status=(
-                ProcessingStatusEnum.CREATED if job_id else ProcessingStatusEnum.FAILED
-            ),
-            user_id=user,
-            platform_job_id=job_id,
-            parameters=json.dumps(request.parameters),
-            service=request.service.model_dump_json(),
-            upscaling_task_id=upscaling_task_id,
+    if reusable_job:
+        logger.info(f"Reusing the results of processing job {reusable_job.id}")
+        record = save_job_to_db(database, record)
+    else:
+        # The credential is retrieved before anything is stored, as retrieving it can fail
+        credential = await get_submission_credential(token)
+        # The job and its submission are committed together
+        record = add_job_to_db(database, record)
+        queue_job_submissions(
+            database,
+            [
+                JobSubmissionRecord(
+                    upscaling_task_id=upscaling_task_id,
+                    processing_job_id=record.id,
+                    user_id=user,
+                    endpoint=request.service.endpoint,
+                    token=credential.token,
+                    credential_expires_at=credential.expires_at,
+                    request=request.model_dump_json(),
+                )
+            ],
+            SubmissionPriorityEnum.INTERACTIVE,
         )
 
-    except Exception as e:
-        logger.error(f"Error creating processing job: {e}")
-
-        if upscaling_task_id:
-            # Do create the record in case of upscaling task to mark it as failed
-            record = ProcessingJobRecord(
-                title=request.title,
-                label=request.label,
-                status=ProcessingStatusEnum.FAILED,
-                user_id=user,
-                platform_job_id=None,
-                parameters=json.dumps(request.parameters),
-                service=request.service.model_dump_json(),
-                upscaling_task_id=upscaling_task_id,
-            )
-        else:
-            raise e
-
-    record = save_job_to_db(database, record)
     return ProcessingJobSummary(
         id=record.id,
         title=record.title,
@@ -95,19 +176,44 @@ async def create_processing_job(
     )
 
 
+async def submit_processing_job(token: str, request: BaseJobRequest) -> str:
+    """
+    Submit a processing job to the platform of the request.
+
+    :param token: The access token of the user submitting the job.
+    :param request: The processing job request.
+    :return: The ID of the job on the platform.
+    """
+    platform = get_processing_platform(request.label)
+    return await platform.execute_job(
+        user_token=token,
+        title=request.title,
+        details=request.service,
+        parameters=request.parameters,
+        format=request.format,
+    )
+
+
 async def get_job_status(token: str, job: ProcessingJobRecord) -> ProcessingStatusEnum:
     logger.info(
         f"Retrieving job status for job: {job.platform_job_id} (current: {job.status})"
     )
+    job_id = job.platform_job_id
+    if not job_id:
+        return job.status
+
     platform = get_processing_platform(job.label)
     details = ServiceDetails.model_validate_json(job.service)
-    return (
-        await platform.get_job_status(
-            user_token=token, job_id=job.platform_job_id, details=details
-        )
-        if job.platform_job_id
-        else job.status
+    status = await status_cache.get_or_fetch(
+        (job.label, details.endpoint, job_id),
+        lambda: platform.get_job_status(
+            user_token=token, job_id=job_id, details=details
+        ),
     )
+    # An unknown status signals a failed retrieval, in which case the stored status is kept
+    if not status or status == ProcessingStatusEnum.UNKNOWN:
+        return job.status
+    return status
 
 
 async def get_processing_job_results(
@@ -137,11 +243,170 @@ async def _refresh_job_status(
     database: Session,
     record: ProcessingJobRecord,
 ) -> ProcessingJobRecord:
-    new_status = await get_job_status(token, record)
-    if new_status != record.status:
-        update_job_status_by_id(database, record.id, new_status)
-        record.status = new_status
-    return record
+    return (await refresh_job_statuses(token, database, [record]))[0]
+
+
+async def _get_job_statuses_or_fallback(
+    token: str, records: List[ProcessingJobRecord]
+) -> Dict[int, ProcessingStatusEnum]:
+    """
+    Retrieve the status of a group of records that share the same platform and endpoint in
+    a single batch request. Statuses that were recently retrieved or that are being retrieved by
+    a concurrent request are taken from the status cache. Records for which no status could be
+    retrieved are omitted, so that they keep their stored status.
+
+    :param token: The access token of the user owning the jobs.
+    :param records: The processing job records to retrieve the status for.
+    :return: The retrieved status of each record, keyed by record ID.
+    """
+    records_by_job_id: Dict[str, List[ProcessingJobRecord]] = defaultdict(list)
+    for record in records:
+        if record.platform_job_id:
+            records_by_job_id[record.platform_job_id].append(record)
+    if not records_by_job_id:
+        return {}
+
+    label = records[0].label
+    platform = get_processing_platform(label)
+    details = ServiceDetails.model_validate_json(records[0].service)
+    logger.info(
+        f"Retrieving job status for {len(records_by_job_id)} jobs on {details.endpoint}"
+    )
+
+    async def fetch(keys: List[StatusKey]) -> Dict[StatusKey, ProcessingStatusEnum]:
+        statuses = await platform.get_job_statuses(
+            user_token=token, job_ids=[key[2] for key in keys], details=details
+        )
+        return {
+            (label, details.endpoint, job_id): status
+            for job_id, status in statuses.items()
+        }
+
+    try:
+        statuses = await asyncio.wait_for(
+            status_cache.get_many_or_fetch(
+                [(label, details.endpoint, job_id) for job_id in records_by_job_id],
+                fetch,
+            ),
+            timeout=settings.status_refresh_timeout,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Timeout while refreshing status of jobs on {details.endpoint}, keeping stored "
+            "statuses"
+        )
+        return {}
+    except Exception as e:
+        logger.error(
+            f"Error while refreshing status of jobs on {details.endpoint}, keeping stored "
+            f"statuses: {e}"
+        )
+        return {}
+
+    # An unknown status signals a failed retrieval and is not stored
+    return {
+        record.id: status
+        for (_, _, job_id), status in statuses.items()
+        if status != ProcessingStatusEnum.UNKNOWN
+        for record in records_by_job_id.get(job_id, [])
+    }
+
+
+def _is_due_for_polling(record: ProcessingJobRecord, now: datetime.datetime) -> bool:
+    # Jobs that are still queued locally have no status on the platform to poll yet
+    return (
+        record.platform_job_id is not None
+        and record.status not in INACTIVE_JOB_STATUSES
+        and (record.next_poll_at is None or record.next_poll_at <= now)
+    )
+
+
+def _schedule_next_poll(
+    record: ProcessingJobRecord,
+    new_status: Optional[ProcessingStatusEnum],
+    now: datetime.datetime,
+) -> Tuple[datetime.datetime, float]:
+    """
+    Compute the next time the status of a job should be polled. Jobs that changed status are
+    polled again after the minimal interval, so that freshly created jobs stay responsive.
+    Jobs that keep the same status are polled with an exponentially increasing interval,
+    limited by the maximal interval. Jobs for which no status could be retrieved keep their
+    current interval, so that a failing platform does not delay their next successful poll.
+
+    :param record: The processing job record that was polled.
+    :param new_status: The status that was retrieved for the job, if any.
+    :param now: Timestamp of the poll.
+    :return: The time of the next poll and the poll interval.
+    """
+    if not record.poll_interval or (new_status and new_status != record.status):
+        interval = settings.status_poll_min_interval
+    elif new_status is None:
+        interval = record.poll_interval
+    else:
+        interval = min(
+            record.poll_interval * settings.status_poll_backoff_factor,
+            settings.status_poll_max_interval,
+        )
+    return now + datetime.timedelta(seconds=interval), interval
+
+
+async def refresh_job_statuses(
+    token: str,
+    database: Session,
+    records: List[ProcessingJobRecord],
+) -> List[ProcessingJobRecord]:
+    """
+    Refresh the status of all active records that are due for polling. The records are grouped
+    per platform and endpoint, and the statuses of each group are retrieved concurrently through
+    a single batch request. Jobs for which the refresh fails or times out keep their stored
+    status.
+
+    :param token: The access token of the user owning the jobs.
+    :param database: The database session to use for storing the status updates.
+    :param records: The processing job records to refresh.
+    :return: The list of records with their updated status.
+    """
+    now = datetime.datetime.utcnow()
+    due_records = [record for record in records if _is_due_for_polling(record, now)]
+    if not due_records:
+        return records
+
+    groups: Dict[Tuple[ProcessTypeEnum, str], List[ProcessingJobRecord]] = defaultdict(
+        list
+    )
+    for record in due_records:
+        endpoint = ServiceDetails.model_validate_json(record.service).endpoint
+        groups[(record.label, endpoint)].append(record)
+
+    statuses: Dict[int, ProcessingStatusEnum] = {}
+    for result in await asyncio.gather(
+        *[_get_job_statuses_or_fallback(token, group) for group in groups.values()]
+    ):
+        statuses.update(result)
+
+    # The records might have been expired by a refresh that was committed in the meantime
+    reload_jobs(database, due_records)
+    status_changes: Dict[int, ProcessingStatusEnum] = {}
+    schedules: Dict[int, Tuple[datetime.datetime, float]] = {}
+    for record in due_records:
+        new_status = statuses.get(record.id)
+        schedules[record.id] = _schedule_next_poll(record, new_status, now)
+        if new_status and new_status != record.status:
+            status_changes[record.id] = new_status
+
+    for record in due_records:
+        # The changes are stored in bulk, avoid flushing them again for each record
+        next_poll_at, poll_interval = schedules[record.id]
+        set_committed_value(record, "next_poll_at", next_poll_at)
+        set_committed_value(record, "poll_interval", poll_interval)
+        if record.id in status_changes:
+            set_committed_value(record, "status", status_changes[record.id])
+
+    # Persist the status changes and the polling schedule of the refreshed jobs at once, after
+    # which the records that were expired by the commit are reloaded at once
+    update_job_poll_schedules(database, schedules)
+    update_job_statuses(database, status_changes)
+    return reload_jobs(database, records)
 
 
 async def get_processing_jobs_by_user_id(
@@ -150,25 +415,23 @@ async def get_processing_jobs_by_user_id(
     user = get_current_user_id(token)
     logger.info(f"Retrieving processing jobs for user {user}")
 
-    jobs: List[ProcessingJobSummary] = []
     records = get_jobs_by_user_id(database, user, upscaling_task_id)
 
-    for record in records:
-        # Only check status for active jobs
-        if record.status not in INACTIVE_JOB_STATUSES:
-            record = await _refresh_job_status(token, database, record)
-
-        jobs.append(
-            ProcessingJobSummary(
-                id=record.id,
-                title=record.title,
-                label=record.label,
-                status=record.status,
-                parameters=json.loads(record.parameters),
-                service=ServiceDetails.model_validate_json(record.service or "{}"),
-            )
+    if not settings.status_reconciler_enabled:
+        # Otherwise the statuses are kept up to date by the background reconciler
+        records = await refresh_job_statuses(token, database, records)
+
+    return [
+        ProcessingJobSummary(
+            id=record.id,
+            title=record.title,
+            label=record.label,
+            status=record.status,
+            parameters=json.loads(record.parameters),
+            service=ServiceDetails.model_validate_json(record.service or "{}"),
         )
-    return jobs
+        for record in records
+    ]
 
 
 async def get_processing_job_by_user_id(
@@ -182,7 +445,8 @@ async def get_processing_job_by_user_id(
     if not record:
         return None
 
-    if record.status not in INACTIVE_JOB_STATUSES:
+    # Otherwise the statuses are kept up to date by the background reconciler
+    if not settings.status_reconciler_enabled and record.status not in INACTIVE_JOB_STATUSES:
         record = await _refresh_job_status(token, database, record)
 
     return ProcessingJob(
@@ -231,6 +495,83 @@ async def retrieve_service_parameters(
     )
 
 
+async def _cancel_platform_jobs(token: str, records: List[ProcessingJobRecord]) -> List[int]:
+    records_by_job_id: Dict[str, List[ProcessingJobRecord]] = defaultdict(list)
+    for record in records:
+        records_by_job_id[cast(str, record.platform_job_id)].append(record)
+
+    platform = get_processing_platform(records[0].label)
+    details = ServiceDetails.model_validate_json(records[0].service)
+    logger.info(f"Canceling {len(records_by_job_id)} jobs on {details.endpoint}")
+    try:
+        canceled = await platform.cancel_jobs(
+            user_token=token, job_ids=list(records_by_job_id), details=details
+        )
+    except Exception as e:
+        logger.error(f"Error while canceling jobs on {details.endpoint}: {e}")
+        return []
+
+    if len(canceled) != len(records_by_job_id):
+        logger.warning(
+            f"Could only cancel {len(canceled)} out of {len(records_by_job_id)} jobs on "
+            f"{details.endpoint}"
+        )
+    return [record.id for job_id in canceled for record in records_by_job_id[job_id]]
+
+
+async def cancel_processing_jobs(
+    token: str, database: Session, records: List[ProcessingJobRecord]
+) -> List[ProcessingJobRecord]:
+    """
+    Cancel the active processing jobs among the given records. Jobs that were not submitted to
+    the platform yet are canceled locally and their queued submission is removed. The other
+    jobs, including the jobs that were submitted in the meantime, are grouped per platform and
+    endpoint, and each group is canceled concurrently on its platform, limited by
+    CANCEL_CONCURRENCY. Jobs that could not be canceled keep their stored status. The status
+    changes are stored at once.
+
+    :param token: The access token of the user owning the jobs.
+    :param database: The database session to use.
+    :param records: The processing job records to cancel.
+    :return: The records that were canceled.
+    """
+    active = [record for record in records if record.status not in INACTIVE_JOB_STATUSES]
+    queued_ids = [record.id for record in active if not record.platform_job_id]
+    remove_pending_job_submissions(
+        database, settings.submission_lease, processing_job_ids=queued_ids
+    )
+    canceled_ids = cancel_queued_jobs(database, queued_ids)
+    # The jobs that were not canceled locally might have been submitted by the worker in the
+    # meantime
+    reload_jobs(database, active)
+    for record in active:
+        if record.id in canceled_ids:
+            set_committed_value(record, "status", ProcessingStatusEnum.CANCELED)
+
+    groups: Dict[Tuple[ProcessTypeEnum, str], List[ProcessingJobRecord]] = defaultdict(
+        list
+    )
+    for record in active:
+        if record.platform_job_id and record.status not in INACTIVE_JOB_STATUSES:
+            endpoint = ServiceDetails.model_validate_json(record.service).endpoint
+            groups[(record.label, endpoint)].append(record)
+
+    platform_canceled_ids = set()
+    for result in await asyncio.gather(
+        *[_cancel_platform_jobs(token, group) for group in groups.values()]
+    ):
+        platform_canceled_ids.update(result)
+
+    canceled_ids.update(platform_canceled_ids)
+    canceled = [record for record in active if record.id in canceled_ids]
+    for record in canceled:
+        set_committed_value(record, "status", ProcessingStatusEnum.CANCELED)
+    update_job_statuses(
+        database, {job_id: ProcessingStatusEnum.CANCELED for job_id in platform_canceled_ids}
+    )
+    return reload_jobs(database, canceled)
+
+
 async def delete_processing_job(
     token: str,
     database: Session,
@@ -243,8 +584,14 @@ async def delete_processing_job(
     if not record:
         return
 
-    # @TODO - Cancel job on the platform as well when supported by the platform
-    # platform = get_processing_platform(record.label)
-    # await platform.cancel_job(user_token=token, job_id=record.platform_job_id)
-
+    # Stop the job from using resources on the platform before it is removed
+    await cancel_processing_jobs(token, database, [record])
+    if get_claimed_job_ids(database, [record.id], settings.submission_lease):
+        # Removing the job would leave the job that the worker creates on the platform
+        # untracked, the canceled record is kept and the worker cancels that job instead
+        logger.warning(
+            f"Keeping canceled processing job {record.id} as it is being submitted to the "
+            "platform"
+        )
+        return
     remove_job_by_id(database, record.id, user)
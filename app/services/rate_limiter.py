@@ -0,0 +1,67 @@
+import asyncio
+import time
+from typing import Dict, Tuple
+
+
+class RateLimiter:
+    """
+    Limit the rate at which an action is performed by spreading the calls evenly in time.
+    Callers that exceed the rate are delayed until their slot is reached.
+
+    :param rate: Maximum number of calls per second. A rate of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next_slot = 0.0
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+
+        # Reserving a slot does not await, so no lock is needed within the event loop
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(key: str, rate: float) -> RateLimiter:
+    """
+    Retrieve the rate limiter shared by all callers using the same key, e.g. the URL of a
+    backend. The rate of an existing limiter is updated to the given rate.
+
+    :param key: Key identifying the rate limiter.
+    :param rate: Maximum number of calls per second. A rate of 0 disables the limit.
+    :return: The rate limiter for the key.
+    """
+    limiter = _rate_limiters.get(key)
+    if limiter is None:
+        limiter = _rate_limiters[key] = RateLimiter(rate)
+    limiter.rate = rate
+    return limiter
+
+
+_concurrency_limiters: Dict[str, Tuple[asyncio.Semaphore, int, asyncio.AbstractEventLoop]] = {}
+
+
+def get_concurrency_limiter(key: str, limit: int) -> asyncio.Semaphore:
+    """
+    Retrieve the semaphore shared by all callers using the same key, e.g. the URL of a backend,
+    so that the number of concurrent calls is limited across all callers instead of per caller.
+    A new semaphore is created when the limit changes.
+
+    :param key: Key identifying the limiter.
+    :param limit: Maximum number of concurrent calls.
+    :return: The semaphore for the key.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _concurrency_limiters.get(key)
+    # Semaphores are bound to the event loop in which they are used
+    if entry is None or entry[1] != limit or entry[2] is not loop:
+        entry = _concurrency_limiters[key] = (asyncio.Semaphore(limit), limit, loop)
+    return entry[0]
@@ -0,0 +1,83 @@
+import asyncio
+import datetime
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database.db import SessionLocal
+from app.database.models.processing_job import ProcessingJobRecord, get_due_jobs
+from app.database.models.user_credential import UserCredentialRecord, get_user_credentials
+from app.error import AuthException
+from app.services.credentials import get_submission_access_token
+from app.services.processing import refresh_job_statuses
+
+
+async def _get_user_token(user: str, credential: Optional[UserCredentialRecord]) -> Optional[str]:
+    if not credential:
+        logger.debug(f"No credential is stored for user {user}")
+        return None
+    if credential.expires_at and credential.expires_at <= datetime.datetime.utcnow():
+        logger.debug(f"Stored credential of user {user} has expired")
+        return None
+    try:
+        return await get_submission_access_token(credential.token)
+    except AuthException as e:
+        logger.warning(f"Stored credential of user {user} was rejected: {e.message}")
+        return None
+
+
+async def reconcile_job_statuses(database: Session) -> int:
+    """
+    Refresh the status of all active processing jobs that are due for polling and store the
+    result in the database.
+    Jobs are refreshed on behalf of their owner, through an access token retrieved with the
+    latest credential stored for the user when their jobs were queued. Jobs of users without a
+    valid credential are skipped until the user queues new jobs.
+
+    :param database: The database session to use.
+    :return: Number of jobs for which the status was refreshed.
+    """
+    records_by_user: Dict[str, List[ProcessingJobRecord]] = defaultdict(list)
+    for record in get_due_jobs(database, datetime.datetime.utcnow()):
+        records_by_user[record.user_id].append(record)
+
+    credentials = get_user_credentials(database, list(records_by_user))
+    tokens = await asyncio.gather(
+        *(_get_user_token(user, credentials.get(user)) for user in records_by_user)
+    )
+
+    refreshes = []
+    for (user, records), token in zip(records_by_user.items(), tokens):
+        if not token:
+            logger.debug(
+                f"Skipping status reconciliation of {len(records)} jobs for user {user} as no "
+                "valid credential is available"
+            )
+            continue
+        refreshes.append(refresh_job_statuses(token, database, records))
+
+    results = await asyncio.gather(*refreshes)
+    refreshed = sum(len(records) for records in results)
+    logger.info(f"Reconciled the status of {refreshed} processing jobs")
+    return refreshed
+
+
+async def run_status_reconciler():
+    """
+    Periodically reconcile the status of all active processing jobs with the platforms. The
+    interval between two runs is configured through STATUS_RECONCILER_INTERVAL.
+    """
+    logger.info(
+        "Starting status reconciler with an interval of "
+        f"{settings.status_reconciler_interval} seconds"
+    )
+    while True:
+        try:
+            with SessionLocal() as database:
+                await reconcile_job_statuses(database)
+        except Exception as e:
+            logger.exception(f"Error occurred while reconciling job statuses: {e}")
+        await asyncio.sleep(settings.status_reconciler_interval)
@@ -0,0 +1,182 @@
+import datetime
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database.models.job_submission import (
+    JobSubmissionRecord,
+    count_claimed_job_submissions,
+    get_job_submission_stats,
+    get_virtual_finish_times,
+    save_job_submissions_to_db,
+)
+from app.database.models.processing_job import count_inflight_jobs
+from app.database.models.user_credential import save_user_credentials
+from app.schemas.enum import SubmissionPriorityEnum
+from app.schemas.submission import SubmissionQueueMetrics
+
+
+def queue_job_submissions(
+    database: Session,
+    submissions: List[JobSubmissionRecord],
+    priority: SubmissionPriorityEnum,
+):
+    """
+    Queue job submissions for the job submission workers through weighted fair queuing. Each
+    submission gets a virtual finish time that continues from the latest queued submission of
+    its user, or from the current virtual time of the priority class when the user has nothing
+    queued, and increases by the inverse of the weight of the user. As the workers claim the
+    submissions in order of their virtual finish time, the submissions of all users with queued
+    jobs are interleaved, so that a user queueing a large upscaling task does not hold back the
+    jobs of other users. The latest credential of each user is stored along with the
+    submissions, so that the status reconciler can poll the jobs once they are submitted. The
+    submissions are committed in one transaction.
+
+    :param database: The database session to use.
+    :param submissions: The job submissions to queue.
+    :param priority: The priority class of the submissions.
+    """
+    submissions_by_user: Dict[str, List[JobSubmissionRecord]] = defaultdict(list)
+    for submission in submissions:
+        submissions_by_user[submission.user_id].append(submission)
+
+    if submissions_by_user:
+        virtual_time, user_finish_times = get_virtual_finish_times(
+            database, priority, list(submissions_by_user)
+        )
+        for user_id, user_submissions in submissions_by_user.items():
+            start = max(virtual_time, user_finish_times.get(user_id, 0.0))
+            weight = settings.get_submission_weight(user_id)
+            for idx, submission in enumerate(user_submissions):
+                submission.priority = priority
+                submission.virtual_finish = start + (idx + 1) / weight
+
+        save_user_credentials(
+            database,
+            {
+                user_id: (user_submissions[-1].token, user_submissions[-1].credential_expires_at)
+                for user_id, user_submissions in submissions_by_user.items()
+            },
+        )
+
+    save_job_submissions_to_db(database, submissions)
+
+
+def get_inflight_jobs(database: Session) -> Dict[Tuple[str, str], int]:
+    """
+    Count the in-flight jobs on the backends that limit their number of in-flight jobs. Jobs
+    that are being submitted by a job submission worker are counted as in-flight as well, while
+    jobs of which the status is no longer reconciled are not.
+
+    :param database: The database session to use.
+    :return: The number of in-flight jobs, keyed by backend URL and user ID.
+    """
+    endpoints = list(settings.get_inflight_limits())
+    inflight = Counter(
+        count_inflight_jobs(database, endpoints, settings.inflight_stale_after)
+    )
+    inflight.update(
+        count_claimed_job_submissions(database, endpoints, settings.submission_lease)
+    )
+    return dict(inflight)
+
+
+def get_saturated_backends(
+    inflight: Dict[Tuple[str, str], int],
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    Determine the backends, and the users on a backend, that reached their limit of in-flight
+    jobs.
+
+    :param inflight: The number of in-flight jobs, keyed by backend URL and user ID.
+    :return: The saturated backends and users, as pairs of backend URL and user ID. A user ID
+        of None indicates that the backend is saturated for all users.
+    """
+    saturated: List[Tuple[str, Optional[str]]] = []
+    for endpoint, (max_jobs, max_user_jobs) in settings.get_inflight_limits().items():
+        user_jobs = {
+            user_id: count for (job_endpoint, user_id), count in inflight.items()
+            if job_endpoint == endpoint
+        }
+        if max_jobs and sum(user_jobs.values()) >= max_jobs:
+            saturated.append((endpoint, None))
+        elif max_user_jobs:
+            saturated.extend(
+                (endpoint, user_id)
+                for user_id, count in user_jobs.items()
+                if count >= max_user_jobs
+            )
+    return saturated
+
+
+def admit_job_submissions(
+    submissions: List[JobSubmissionRecord], inflight: Dict[Tuple[str, str], int]
+) -> Tuple[List[JobSubmissionRecord], List[JobSubmissionRecord]]:
+    """
+    Admit claimed job submissions, in order, as long as their backend and their user on the
+    backend stay within the limits of in-flight jobs of the backend. The submissions that are
+    not admitted are held back, so that their jobs stay queued locally until earlier jobs on
+    the backend complete.
+
+    :param submissions: The claimed submissions, in the order in which they should be submitted.
+    :param inflight: The number of in-flight jobs, keyed by backend URL and user ID.
+    :return: The admitted submissions and the held submissions.
+    """
+    limits = settings.get_inflight_limits()
+    backend_jobs: Counter = Counter()
+    for (endpoint, _), count in inflight.items():
+        backend_jobs[endpoint] += count
+    user_jobs = Counter(inflight)
+
+    admitted: List[JobSubmissionRecord] = []
+    held: List[JobSubmissionRecord] = []
+    for submission in submissions:
+        endpoint = submission.endpoint or ""
+        max_jobs, max_user_jobs = limits.get(endpoint, (None, None))
+        key = (endpoint, submission.user_id)
+        if (max_jobs and backend_jobs[endpoint] >= max_jobs) or (
+            max_user_jobs and user_jobs[key] >= max_user_jobs
+        ):
+            held.append(submission)
+            continue
+        backend_jobs[endpoint] += 1
+        user_jobs[key] += 1
+        admitted.append(submission)
+
+    if held:
+        logger.info(
+            f"Holding back {len(held)} job submissions of backends that reached their limit "
+            "of in-flight jobs"
+        )
+    return admitted, held
+
+
+def get_submission_queue_metrics(database: Session) -> List[SubmissionQueueMetrics]:
+    """
+    Retrieve the depth of the job submission queue and the waiting time of its oldest
+    submission for each priority class.
+
+    :param database: The database session to use.
+    :return: The metrics of each priority class.
+    """
+    now = datetime.datetime.utcnow()
+    stats = {
+        priority: (depth, users, oldest)
+        for priority, depth, users, oldest in get_job_submission_stats(database)
+    }
+    metrics = []
+    for priority in SubmissionPriorityEnum:
+        depth, users, oldest = stats.get(priority, (0, 0, None))
+        metrics.append(
+            SubmissionQueueMetrics(
+                priority=priority.name.lower(),
+                depth=depth,
+                users=users,
+                max_wait=(now - oldest).total_seconds() if oldest else 0.0,
+            )
+        )
+    logger.debug(f"Job submission queue metrics: {metrics}")
+    return metrics
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.schemas.enum import ProcessingStatusEnum, ProcessTypeEnum
+
+# A job status is identified by the platform type, the endpoint and the job ID on the platform
+StatusKey = Tuple[ProcessTypeEnum, str, str]
+
+
+class StatusCache:
+    """
+    Short-lived cache for the job statuses retrieved from the processing platforms.
+    Next to caching retrieved statuses for a limited time, concurrent requests for the status of
+    the same job are coalesced, so that only a single request is sent to the platform.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[StatusKey, Tuple[float, ProcessingStatusEnum]] = {}
+        self._in_flight: Dict[StatusKey, asyncio.Future] = {}
+
+    def clear(self):
+        self._entries.clear()
+
+    def _get_fresh(self, key: StatusKey) -> Optional[ProcessingStatusEnum]:
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        expires_at, status = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return status
+
+    def _purge_expired(self, now: float):
+        # All entries share the same TTL and are stored in order of expiry, so the expired
+        # entries are at the front. Jobs that are no longer requested are removed as well.
+        while self._entries:
+            key = next(iter(self._entries))
+            if self._entries[key][0] > now:
+                break
+            del self._entries[key]
+
+    def _store(self, key: StatusKey, status: ProcessingStatusEnum):
+        # An unknown status signals a failed retrieval and should be retried on the next request
+        if self.ttl > 0 and status != ProcessingStatusEnum.UNKNOWN:
+            now = time.monotonic()
+            self._purge_expired(now)
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl, status)
+
+    async def get_many_or_fetch(
+        self,
+        keys: List[StatusKey],
+        fetch: Callable[
+            [List[StatusKey]], Awaitable[Dict[StatusKey, ProcessingStatusEnum]]
+        ],
+    ) -> Dict[StatusKey, ProcessingStatusEnum]:
+        """
+        Retrieve the status of multiple jobs. Statuses that are cached are returned directly,
+        statuses that are already being retrieved by another caller are awaited and the
+        remaining statuses are retrieved through a single call to the fetch function.
+
+        :param keys: The keys of the jobs to retrieve the status for.
+        :param fetch: Function that retrieves the status for a list of keys from the platform.
+        :return: The status of each job, keyed by job key. Jobs for which no status could be
+            retrieved are omitted.
+        """
+        statuses: Dict[StatusKey, ProcessingStatusEnum] = {}
+        waiting: Dict[StatusKey, asyncio.Future] = {}
+        missing: List[StatusKey] = []
+        for key in dict.fromkeys(keys):
+            cached = self._get_fresh(key)
+            if cached is not None:
+                statuses[key] = cached
+            elif key in self._in_flight:
+                waiting[key] = self._in_flight[key]
+            else:
+                missing.append(key)
+
+        logger.debug(
+            f"Status cache: {len(statuses)} hits, {len(waiting)} in flight, "
+            f"{len(missing)} misses"
+        )
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in missing}
+            self._in_flight.update(futures)
+            try:
+                fetched = await fetch(missing)
+                for key in missing:
+                    if key in fetched:
+                        statuses[key] = fetched[key]
+                        self._store(key, fetched[key])
+                        futures[key].set_result(fetched[key])
+            finally:
+                # Release the callers waiting on a failed or incomplete retrieval
+                for key, future in futures.items():
+                    if not future.done():
+                        future.set_result(None)
+                    if self._in_flight.get(key) is future:
+                        del self._in_flight[key]
+
+        for key, future in waiting.items():
+            status = await asyncio.shield(future)
+            if status is not None:
+                statuses[key] = status
+
+        return statuses
+
+    async def get_or_fetch(
+        self, key: StatusKey, fetch: Callable[[], Awaitable[ProcessingStatusEnum]]
+    ) -> Optional[ProcessingStatusEnum]:
+        """
+        Retrieve the status of a single job, either from the cache, from a concurrent
+        retrieval of the same job or through the fetch function.
+
+        :param key: The key of the job to retrieve the status for.
+        :param fetch: Function that retrieves the status of the job from the platform.
+        :return: The status of the job or None if the status could not be retrieved.
+        """
+
+        async def fetch_single(
+            keys: List[StatusKey],
+        ) -> Dict[StatusKey, ProcessingStatusEnum]:
+            return {key: await fetch()}
+
+        return (await self.get_many_or_fetch([key], fetch_single)).get(key)
@@ -0,0 +1,213 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from loguru import logger
+
+# Maximum number of updates that are buffered for a slow subscriber. When exceeded, the oldest
+# update is dropped as only the most recent status is relevant.
+MAX_PENDING_UPDATES = 16
+
+StatusProducer = Callable[[str], Awaitable[Any]]
+
+
+class StatusUpdate:
+    """
+    Update that is broadcasted to the subscribers of a status stream.
+
+    :param type: Either "loading" when a new status is being computed, "status" when a new
+        status is available or "error" when the status could not be computed.
+    :param data: The computed status.
+    :param error: The error that occurred while computing the status.
+    """
+
+    def __init__(
+        self, type: str, data: Any = None, error: Optional[Exception] = None
+    ):
+        self.type = type
+        self.data = data
+        self.error = error
+
+
+class _Topic:
+    def __init__(self, producer: StatusProducer, interval: float):
+        self.producer = producer
+        self.interval = interval
+        self.token: str = ""
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.latest: Optional[StatusUpdate] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class StatusHub:
+    """
+    In-process hub that computes a status stream once per topic, e.g. the jobs of a user or a
+    single upscaling task, and broadcasts every update to all subscribed websockets. The
+    status of a topic is only computed while at least one websocket is subscribed to it.
+    """
+
+    def __init__(self) -> None:
+        self._topics: Dict[Hashable, _Topic] = {}
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        key: Hashable,
+        token: str,
+        producer: StatusProducer,
+        interval: float,
+    ) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribe to the status stream of a topic. The stream of the topic is started by the
+        first subscriber and stopped when the last subscriber leaves.
+
+        :param key: Key identifying the topic. Subscribers with the same key share the stream.
+        :param token: Access token of the subscriber, used by the producer to compute the
+            status. The most recent token of all subscribers is used.
+        :param producer: Function that computes the status of the topic for a token.
+        :param interval: Interval (in seconds) between two status computations.
+        :return: Queue on which the status updates of the topic are received.
+        """
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = _Topic(producer, interval)
+            self._topics[key] = topic
+        topic.token = token
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_UPDATES)
+        if topic.latest:
+            queue.put_nowait(topic.latest)
+        topic.subscribers.add(queue)
+        if topic.task is None:
+            logger.debug(f"Starting status stream for {key}")
+            topic.task = asyncio.create_task(self._run(key, topic))
+
+        try:
+            yield queue
+        finally:
+            topic.subscribers.discard(queue)
+            if not topic.subscribers:
+                logger.debug(f"Stopping status stream for {key}")
+                if self._topics.get(key) is topic:
+                    del self._topics[key]
+                if topic.task:
+                    topic.task.cancel()
+
+    def subscriber_count(self, key: Hashable) -> int:
+        topic = self._topics.get(key)
+        return len(topic.subscribers) if topic else 0
+
+    def _broadcast(self, topic: _Topic, update: StatusUpdate):
+        for queue in topic.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(update)
+
+    async def _run(self, key: Hashable, topic: _Topic):
+        while True:
+            self._broadcast(topic, StatusUpdate("loading"))
+            try:
+                update = StatusUpdate("status", data=await topic.producer(topic.token))
+                topic.latest = update
+            except Exception as e:
+                logger.error(f"Error occurred while computing status for {key}: {e}")
+                update = StatusUpdate("error", error=e)
+                topic.latest = None
+            self._broadcast(topic, update)
+            await asyncio.sleep(topic.interval)
+
+
+def _is_record_list(value: Any) -> bool:
+    return isinstance(value, list) and all(
+        isinstance(item, dict) and "id" in item for item in value
+    )
+
+
+def compute_status_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute the difference between two status payloads. Lists of records, such as the
+    processing jobs of an upscaling task, are compared by record ID and only contain the records
+    that were added or changed, together with the IDs of the removed records. Other fields are
+    only included when their value changed.
+
+    :param previous: The previously sent status payload.
+    :param current: The new status payload.
+    :return: The changed fields of the payload. Empty when nothing changed.
+    """
+    delta: Dict[str, Any] = {}
+    for key, value in current.items():
+        old_value = previous.get(key)
+        if _is_record_list(value) and _is_record_list(old_value or []):
+            old_records = {record["id"]: record for record in old_value or []}
+            updated = [
+                record for record in value if old_records.get(record["id"]) != record
+            ]
+            current_ids = {record["id"] for record in value}
+            removed = [
+                record_id for record_id in old_records if record_id not in current_ids
+            ]
+            if updated or removed:
+                delta[key] = {"updated": updated, "removed": removed}
+        elif value != old_value:
+            delta[key] = value
+    return delta
+
+
+class StatusDeltaEncoder:
+    """
+    Encode the status updates sent over a single websocket connection. The first update and
+    every `snapshot_interval` updates a full snapshot is sent, which allows clients to resync.
+    In between, only the changes compared to the previously sent status are sent as a delta.
+    Each message that is sent carries an increasing sequence number, so that clients can detect
+    missed messages.
+
+    :param snapshot_interval: Number of updates after which a full snapshot is sent again.
+    """
+
+    def __init__(self, snapshot_interval: int):
+        self.snapshot_interval = snapshot_interval
+        self.sequence = 0
+        self._previous: Optional[Dict[str, Any]] = None
+        self._updates_since_snapshot = 0
+
+    def encode(
+        self, data: Dict[str, Any]
+    ) -> Optional[Tuple[Literal["status", "delta"], Any, int]]:
+        """
+        Encode a new status.
+
+        :param data: The new status payload.
+        :return: The message type ("status" or "delta"), the message data and the sequence
+            number or None if nothing changed since the previous message.
+        """
+        message_type: Literal["status", "delta"]
+        self._updates_since_snapshot += 1
+        if (
+            self._previous is None
+            or self._updates_since_snapshot >= self.snapshot_interval
+        ):
+            message_type, message_data = "status", data
+            self._updates_since_snapshot = 0
+        else:
+            delta = compute_status_delta(self._previous, data)
+            if not delta:
+                return None
+            message_type, message_data = "delta", delta
+
+        self._previous = data
+        self.sequence += 1
+        return message_type, message_data, self.sequence
+
+
+status_hub = StatusHub()
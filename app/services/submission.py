@@ -0,0 +1,277 @@
+import asyncio
+import datetime
+import json
+from typing import List, Optional, Set
+
+from fastapi import status
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database.db import SessionLocal
+from app.database.models.job_submission import (
+    JobSubmissionRecord,
+    claim_job_submissions,
+    lock_backends,
+    release_job_submissions,
+    remove_job_submissions,
+    renew_job_submission_claim,
+)
+from app.database.models.processing_job import (
+    ProcessingJobRecord,
+    fail_expired_job_submissions,
+    get_submitted_job_ids,
+    update_submitted_jobs,
+)
+from app.error import AuthException
+from app.platforms.dispatcher import get_processing_platform
+from app.schemas.enum import ProcessingStatusEnum
+from app.schemas.unit_job import BaseJobRequest
+from app.services.credentials import get_submission_access_token
+from app.services.processing import get_job_request_hash, submit_processing_job
+from app.services.rate_limiter import get_rate_limiter
+from app.services.scheduler import (
+    admit_job_submissions,
+    get_inflight_jobs,
+    get_saturated_backends,
+)
+
+
+async def _submit_job(
+    database: Session, submission: JobSubmissionRecord, semaphore: asyncio.Semaphore
+) -> Optional[str]:
+    request = BaseJobRequest.model_validate_json(submission.request)
+    endpoint = request.service.endpoint
+    rate_limiter = get_rate_limiter(endpoint, settings.get_submission_rate_limit(endpoint))
+
+    async with semaphore:
+        await rate_limiter.acquire()
+        # The lease might have expired while waiting, in which case another worker might be
+        # submitting the job as well
+        if not renew_job_submission_claim(database, submission, settings.submission_lease):
+            logger.warning(
+                f"Skipping job submission {submission.id} as its lease expired before it "
+                "could be submitted"
+            )
+            return None
+        access_token = await get_submission_access_token(submission.token)
+        logger.debug(f"Submitting processing job {submission.processing_job_id}")
+        return await submit_processing_job(access_token, request)
+
+
+async def _cancel_job(
+    submission: JobSubmissionRecord, platform_job_id: str, semaphore: asyncio.Semaphore
+):
+    request = BaseJobRequest.model_validate_json(submission.request)
+    platform = get_processing_platform(request.label)
+    async with semaphore:
+        try:
+            access_token = await get_submission_access_token(submission.token)
+            await platform.cancel_job(access_token, platform_job_id, request.service)
+        except Exception as e:
+            logger.error(
+                f"Could not cancel job {platform_job_id} of processing job "
+                f"{submission.processing_job_id} that was rejected after its submission: {e}"
+            )
+
+
+def _build_job_record(
+    submission: JobSubmissionRecord, platform_job_id: Optional[str]
+) -> ProcessingJobRecord:
+    # Submissions that were queued before the processing jobs were created upfront
+    request = BaseJobRequest.model_validate_json(submission.request)
+    return ProcessingJobRecord(
+        title=request.title,
+        label=request.label,
+        status=(
+            ProcessingStatusEnum.CREATED
+            if platform_job_id
+            else ProcessingStatusEnum.FAILED
+        ),
+        user_id=submission.user_id,
+        platform_job_id=platform_job_id,
+        parameters=json.dumps(request.parameters),
+        service=request.service.model_dump_json(),
+        endpoint=request.service.endpoint,
+        upscaling_task_id=submission.upscaling_task_id,
+        request_hash=get_job_request_hash(request),
+    )
+
+
+def _skip_submitted_jobs(
+    database: Session, submissions: List[JobSubmissionRecord]
+) -> List[JobSubmissionRecord]:
+    # A job might have been submitted by another worker after the lease of its submission
+    # expired, in which case it should not be submitted again
+    submitted = get_submitted_job_ids(
+        database,
+        [
+            submission.processing_job_id
+            for submission in submissions
+            if submission.processing_job_id
+        ],
+    )
+    if not submitted:
+        return submissions
+
+    logger.warning(
+        f"Removing {len(submitted)} job submissions of processing jobs that were already "
+        "submitted to the platform"
+    )
+    remove_job_submissions(
+        database,
+        [
+            submission.id
+            for submission in submissions
+            if submission.processing_job_id in submitted
+        ],
+    )
+    return [
+        submission
+        for submission in submissions
+        if submission.processing_job_id not in submitted
+    ]
+
+
+def _complete_job_submission(
+    database: Session, submission: JobSubmissionRecord, platform_job_id: Optional[str]
+) -> bool:
+    # Store the outcome and remove the submission in one transaction, the calls in between do
+    # not yield to the event loop so the transactions of concurrent submissions do not overlap
+    rejected: Set[int] = set()
+    if submission.processing_job_id:
+        rejected = update_submitted_jobs(
+            database, {submission.processing_job_id: platform_job_id}
+        )
+    else:
+        database.add(_build_job_record(submission, platform_job_id))
+    remove_job_submissions(database, [submission.id])
+    return submission.processing_job_id in rejected
+
+
+def _is_invalid_credential(error: Exception) -> bool:
+    return (
+        isinstance(error, AuthException)
+        and error.http_status == status.HTTP_401_UNAUTHORIZED
+    )
+
+
+async def _process_job_submission(
+    database: Session, submission: JobSubmissionRecord, semaphore: asyncio.Semaphore
+):
+    try:
+        platform_job_id = await _submit_job(database, submission, semaphore)
+        if platform_job_id is None:
+            return
+    except Exception as e:
+        if _is_invalid_credential(e):
+            # Retrying does not help when the credential of the user is no longer valid
+            logger.error(
+                f"Could not process job submission {submission.id} as the credential of user "
+                f"{submission.user_id} is no longer valid, marking the job as failed: {e}"
+            )
+        elif submission.attempts < settings.submission_max_attempts:
+            logger.warning(
+                f"Could not process job submission {submission.id} (attempt "
+                f"{submission.attempts}), retrying after {settings.submission_lease} "
+                f"seconds: {e}"
+            )
+            return
+        else:
+            logger.error(
+                f"Could not process job submission {submission.id} after "
+                f"{submission.attempts} attempts, marking the job as failed: {e}"
+            )
+        platform_job_id = None
+
+    try:
+        rejected = _complete_job_submission(database, submission, platform_job_id)
+    except Exception:
+        database.rollback()
+        logger.exception(
+            f"Could not store platform job {platform_job_id} of job submission "
+            f"{submission.id}, the submission is retried after {settings.submission_lease} "
+            "seconds"
+        )
+        return
+
+    if rejected and platform_job_id:
+        # The processing job was canceled, removed or already submitted in the meantime
+        logger.info(
+            f"Canceling job {platform_job_id} of processing job {submission.processing_job_id} "
+            "of which the platform job ID was rejected"
+        )
+        await _cancel_job(submission, platform_job_id, semaphore)
+
+
+async def process_job_submissions(database: Session) -> int:
+    """
+    Claim a batch of queued job submissions, in the order determined by the scheduler, and
+    submit the corresponding processing jobs to the platforms. Submissions towards backends, or
+    of users on a backend, that reached their limit of in-flight jobs are held back until
+    earlier jobs complete. The jobs are submitted concurrently, limited by
+    UPSCALING_SUBMISSION_CONCURRENCY and by the submission rate limit of each backend. The
+    platform job ID of each job is stored, and its submission removed from the queue, in a
+    single transaction as soon as the job is submitted, so that a crash of the worker does not
+    cause the jobs of the batch that were already submitted to be submitted again. Jobs of
+    which the platform job ID is rejected are canceled on the platform. Submissions of jobs
+    that already have a platform job ID are removed without submitting the job again.
+    Submissions that fail are retried once their lease expires, until SUBMISSION_MAX_ATTEMPTS
+    is reached, after which the processing job is marked as failed.
+
+    :param database: The database session to use.
+    :return: Number of submissions that were processed.
+    """
+    fail_expired_job_submissions(database, settings.submission_lease)
+    # The in-flight jobs of the limited backends are counted and their submissions claimed
+    # while holding the locks of the backends, which are released when the claim is committed.
+    # Backends that are locked by another worker are left to that worker.
+    limited = list(settings.get_inflight_limits())
+    locked = lock_backends(database, limited)
+    inflight = get_inflight_jobs(database)
+    submissions = claim_job_submissions(
+        database,
+        settings.submission_batch_size,
+        settings.submission_lease,
+        get_saturated_backends(inflight)
+        + [(endpoint, None) for endpoint in limited if endpoint not in locked],
+    )
+    submissions = _skip_submitted_jobs(database, submissions)
+    submissions, held = admit_job_submissions(submissions, inflight)
+    release_job_submissions(database, held)
+    if submissions:
+        now = datetime.datetime.utcnow()
+        waits = [(now - submission.created).total_seconds() for submission in submissions]
+        logger.info(
+            f"Submitting {len(submissions)} processing jobs that waited "
+            f"{sum(waits) / len(waits):.1f} seconds on average and {max(waits):.1f} seconds at "
+            "most in the queue"
+        )
+    semaphore = asyncio.Semaphore(settings.upscaling_submission_concurrency)
+    await asyncio.gather(
+        *[_process_job_submission(database, submission, semaphore) for submission in submissions]
+    )
+    return len(submissions)
+
+
+async def run_submission_worker():
+    """
+    Continuously process the queued job submissions. When the queue is empty, the worker waits
+    SUBMISSION_WORKER_INTERVAL seconds before checking the queue again.
+    """
+    logger.info(
+        "Starting job submission worker with a batch size of "
+        f"{settings.submission_batch_size}"
+    )
+    while True:
+        try:
+            # The claimed submissions are kept while the concurrent submissions each commit
+            # their outcome, they are not expired on commit so that they are not reloaded
+            # one by one
+            with SessionLocal(expire_on_commit=False) as database:
+                processed = await process_job_submissions(database)
+        except Exception as e:
+            logger.exception(f"Error occurred while processing job submissions: {e}")
+            processed = 0
+        if not processed:
+            await asyncio.sleep(settings.submission_worker_interval)
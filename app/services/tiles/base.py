@@ -1,16 +1,20 @@
 import importlib
 import pkgutil
-from typing import Callable, Dict
+from itertools import islice
+from typing import Callable, Dict, Iterator
 from geojson_pydantic import GeometryCollection, Polygon
+from geojson_pydantic.geometries import Geometry
 from loguru import logger
 import app.services.tiles.grids
+from app.config.settings import settings
+from app.error import TileLimitException
 from app.schemas.tiles import GridTypeEnum
 
-GRID_REGISTRY: Dict[GridTypeEnum, Callable[[Polygon], GeometryCollection]] = {}
+GRID_REGISTRY: Dict[GridTypeEnum, Callable[[Polygon], Iterator[Geometry]]] = {}
 
 
 def register_grid(grid_type: GridTypeEnum):
-    def decorator(func: Callable[[Polygon], GeometryCollection]):
+    def decorator(func: Callable[[Polygon], Iterator[Geometry]]):
         logger.debug(f"Registering grid {grid_type}")
         GRID_REGISTRY[grid_type] = func
         return func
@@ -24,13 +28,15 @@ def load_grids():
         importlib.import_module(f"app.services.tiles.grids.{module_name}")  # noqa: F821
 
 
-def split_polygon_by_grid(polygon: Polygon, grid: GridTypeEnum) -> GeometryCollection:
+def iter_polygon_by_grid(polygon: Polygon, grid: GridTypeEnum) -> Iterator[Geometry]:
     """
-    Split a GeoJSON Polygon into smaller polygons according to the specified grid type.
+    Lazily split a GeoJSON Polygon into smaller polygons according to the specified grid type.
+    Each tile is only computed when it is requested, so that large areas can be processed
+    without keeping all tiles in memory.
 
     :param polygon: The GeoJSON Polygon to split.
     :param grid: The grid type to use for splitting.
-    :return: A list of GeoJSON Polygons.
+    :return: An iterator over the GeoJSON Polygons.
     :raises ValueError: If the grid type is unknown.
     """
     if grid.lower() not in GRID_REGISTRY:
@@ -39,3 +45,44 @@ def split_polygon_by_grid(polygon: Polygon, grid: GridTypeEnum) -> GeometryColle
 
     split_func = GRID_REGISTRY[grid]
     return split_func(polygon)
+
+
+def _get_tile_limit_exception(grid: GridTypeEnum) -> TileLimitException:
+    return TileLimitException(
+        message=f"The area of interest is split in more than {settings.max_grid_tiles} tiles of "
+        f"the {grid} grid.",
+        details={"max_tiles": settings.max_grid_tiles},
+    )
+
+
+def validate_polygon_tiles(polygon: Polygon, grid: GridTypeEnum):
+    """
+    Verify that a GeoJSON Polygon is not split in more than MAX_GRID_TILES tiles according to the
+    specified grid type. At most one tile more than the limit is computed.
+
+    :param polygon: The GeoJSON Polygon to split.
+    :param grid: The grid type to use for splitting.
+    :raises ValueError: If the grid type is unknown.
+    :raises TileLimitException: If the polygon is split in too many tiles.
+    """
+    tiles = iter_polygon_by_grid(polygon, grid)
+    if sum(1 for _ in islice(tiles, settings.max_grid_tiles + 1)) > settings.max_grid_tiles:
+        raise _get_tile_limit_exception(grid)
+
+
+def split_polygon_by_grid(polygon: Polygon, grid: GridTypeEnum) -> GeometryCollection:
+    """
+    Split a GeoJSON Polygon into smaller polygons according to the specified grid type.
+
+    :param polygon: The GeoJSON Polygon to split.
+    :param grid: The grid type to use for splitting.
+    :return: A list of GeoJSON Polygons.
+    :raises ValueError: If the grid type is unknown.
+    :raises TileLimitException: If the polygon is split in more than MAX_GRID_TILES tiles.
+    """
+    geometries = list(
+        islice(iter_polygon_by_grid(polygon, grid), settings.max_grid_tiles + 1)
+    )
+    if len(geometries) > settings.max_grid_tiles:
+        raise _get_tile_limit_exception(grid)
+    return GeometryCollection(type="GeometryCollection", geometries=geometries)
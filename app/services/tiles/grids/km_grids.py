@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterator
 
 from geojson_pydantic import GeometryCollection, Polygon
 from geojson_pydantic.geometries import Geometry, parse_geometry_obj
@@ -13,6 +13,29 @@ from app.services.tiles.base import register_grid
 
 
 @register_grid(GridTypeEnum.KM_20)
+def iter_20x20_km_grid(polygon: Polygon) -> Iterator[Geometry]:
+    """
+    Lazily split polygon into 20x20 km tiles.
+
+    :param polygon: The GeoJSON Polygon to split.
+    :return: An iterator over the GeoJSON Polygons.
+    """
+    logger.debug("Splitting polygon in a 20x20km grid")
+    return _iter_km_grid(polygon, 20.0)
+
+
+@register_grid(GridTypeEnum.KM_250)
+def iter_250x250_km_grid(polygon: Polygon) -> Iterator[Geometry]:
+    """
+    Lazily split polygon into 250x250 km tiles.
+
+    :param polygon: The GeoJSON Polygon to split.
+    :return: An iterator over the GeoJSON Polygons.
+    """
+    logger.debug("Splitting polygon in a 250x250km grid")
+    return _iter_km_grid(polygon, 250.0)
+
+
 def split_by_20x20_km_grid(polygon: Polygon) -> GeometryCollection:
     """
     Split polygon into 20x20 km tiles.
@@ -20,14 +43,11 @@ def split_by_20x20_km_grid(polygon: Polygon) -> GeometryCollection:
     :param polygon: The GeoJSON Polygon to split.
     :return: A list of GeoJSON Polygons.
     """
-    logger.debug("Splitting polygon in a 20x20km grid")
-
     return GeometryCollection(
-        type="GeometryCollection", geometries=_split_by_km_grid(polygon, 20.0)
+        type="GeometryCollection", geometries=list(iter_20x20_km_grid(polygon))
     )
 
 
-@register_grid(GridTypeEnum.KM_250)
 def split_by_250x250_km_grid(polygon: Polygon) -> GeometryCollection:
     """
     Split polygon into 250x250 km tiles.
@@ -35,20 +55,18 @@ def split_by_250x250_km_grid(polygon: Polygon) -> GeometryCollection:
     :param polygon: The GeoJSON Polygon to split.
     :return: A list of GeoJSON Polygons.
     """
-    logger.debug("Splitting polygon in a 250x250km grid")
-
     return GeometryCollection(
-        type="GeometryCollection", geometries=_split_by_km_grid(polygon, 250.0)
+        type="GeometryCollection", geometries=list(iter_250x250_km_grid(polygon))
     )
 
 
-def _split_by_km_grid(aoi: Polygon, cell_size_km: float) -> List[Geometry]:
+def _iter_km_grid(aoi: Polygon, cell_size_km: float) -> Iterator[Geometry]:
     """
-    Splits a polygon into a list of smaller polygons based on a square grid of given size in km.
+    Lazily splits a polygon into smaller polygons based on a square grid of given size in km.
 
     :param aoi: Polygon in GeoJSON format.
-    :param cell_size_km: Size of the grid cell in kilometers (default 20km).
-    :return: List of polygons as GeoJSON dicts.
+    :param cell_size_km: Size of the grid cell in kilometers.
+    :return: Iterator over the polygons as GeoJSON dicts.
     """
     # Load the polygon
     polygon = shape(aoi)
@@ -67,8 +85,6 @@ def _split_by_km_grid(aoi: Polygon, cell_size_km: float) -> List[Geometry]:
     min_x, min_y, max_x, max_y = polygon_m.bounds
     cell_size_m = cell_size_km * 1000  # convert km to meters
 
-    result_polygons: List[Geometry] = []
-
     x = min_x
     while x < max_x:
         y = min_y
@@ -78,9 +94,6 @@ def _split_by_km_grid(aoi: Polygon, cell_size_km: float) -> List[Geometry]:
             if not intersection.is_empty:
                 # Transform back to WGS84
                 intersection_wgs84 = transform(project_to_wgs84, intersection)
-                result_polygons.append(
-                    parse_geometry_obj(intersection_wgs84.__geo_interface__)
-                )
+                yield parse_geometry_obj(intersection_wgs84.__geo_interface__)
             y += cell_size_m
         x += cell_size_m
-    return result_polygons
@@ -1,27 +1,63 @@
-from typing import List, Optional
+import hashlib
+import json
+from collections import Counter
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
 
+from fastapi.concurrency import run_in_threadpool
 from loguru import logger
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.auth import get_current_user_id
+from app.config.settings import settings
+from app.database.models.job_submission import (
+    JobSubmissionRecord,
+    remove_pending_job_submissions,
+)
+from app.database.models.processing_job import (
+    ProcessingJobRecord,
+    add_upscaling_jobs_to_db,
+    cancel_queued_upscaling_jobs,
+    count_unindexed_upscaling_jobs,
+    get_jobs_by_upscaling_task_ids,
+    get_submitted_upscaling_jobs,
+    get_unqueued_upscaling_jobs,
+    get_upscaling_job_indices,
+)
 from app.database.models.upscaling_task import (
     UpscalingTaskRecord,
     get_upscale_task_by_user_id,
     get_upscale_tasks_by_user_id,
+    reload_upscale_tasks,
     save_upscaling_task_to_db,
-    update_upscale_task_status_by_id,
+    update_upscale_task_request_hash,
+    update_upscale_task_statuses,
 )
-from app.schemas.enum import ProcessingStatusEnum
+from app.error import TaskConflictException
+from app.schemas.enum import ProcessingStatusEnum, SubmissionPriorityEnum
 from app.schemas.unit_job import BaseJobRequest, ProcessingJobSummary, ServiceDetails
 from app.schemas.upscale_task import (
+    GridDimension,
+    ParameterDimension,
     UpscalingTask,
     UpscalingTaskRequest,
+    UpscalingTaskStreamRequest,
     UpscalingTaskSummary,
 )
 from app.services.processing import (
-    create_processing_job,
+    cancel_processing_jobs,
+    find_reusable_jobs,
+    get_job_request_hash,
     get_processing_jobs_by_user_id,
+    refresh_job_statuses,
 )
+from app.services.credentials import SubmissionCredential
+from app.services.scheduler import queue_job_submissions
+from app.services.tiles.base import iter_polygon_by_grid, validate_polygon_tiles
+
+# Number of processing jobs of an upscaling task that are created at once
+JOB_BATCH_SIZE = 1000
 
 INACTIVE_TASK_STATUSES = {
     ProcessingStatusEnum.CANCELED,
@@ -30,41 +66,378 @@ INACTIVE_TASK_STATUSES = {
 }
 
 
-async def create_upscaling_processing_jobs(
-    token: str, database: Session, request: UpscalingTaskRequest, upscaling_task_id: int
-) -> List[ProcessingJobSummary]:
-    jobs: List[ProcessingJobSummary] = []
+def _get_dimension_values(
+    dimension: Union[ParameterDimension, GridDimension],
+) -> Iterator[Any]:
+    if isinstance(dimension, GridDimension):
+        # Tiles are computed one by one while the jobs are being created
+        return (
+            tile.model_dump(mode="json", exclude_none=True)
+            for tile in iter_polygon_by_grid(dimension.aoi, dimension.grid)
+        )
+    return iter(dimension.values)
+
+
+def _get_job_request(
+    request: Union[UpscalingTaskRequest, UpscalingTaskStreamRequest], idx: int, value: Any
+) -> BaseJobRequest:
+    return BaseJobRequest(
+        title=f"{request.title} - Processing Job {idx + 1}",
+        label=request.label,
+        service=request.service,
+        parameters={**request.parameters, request.dimension.name: value},
+        format=request.format,
+        reuse_results=request.reuse_results,
+    )
+
+
+def get_upscaling_job_requests(request: UpscalingTaskRequest) -> Iterator[BaseJobRequest]:
+    """
+    Lazily split up an upscaling task in a processing job request for each value of its
+    dimension. The title of each job reflects the position of its value in the dimension.
+
+    :param request: The upscaling task request.
+    :return: The processing job requests, in the order of the dimension values.
+    """
+    for idx, value in enumerate(_get_dimension_values(request.dimension)):
+        yield _get_job_request(request, idx, value)
+
+
+def _get_request_digest(
+    request: Union[UpscalingTaskRequest, UpscalingTaskStreamRequest],
+) -> "hashlib._Hash":
+    # The values of the dimension are added one by one, so that the hash of a streamed task is
+    # computed while its values are being received
+    content = json.dumps(
+        request.model_dump(mode="json", exclude={"dimension": {"values"}}),
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(content.encode())
+
 
+def _update_request_digest(digest: "hashlib._Hash", value: Any):
+    digest.update(b"\n" + json.dumps(value, sort_keys=True, separators=(",", ":")).encode())
+
+
+def get_upscaling_task_request_hash(request: UpscalingTaskRequest) -> str:
+    """
+    Compute a canonical hash of an upscaling task request, including the values of its
+    dimension. A request with listed values has the same hash as the streamed request with the
+    same values, while a grid dimension is hashed through its area of interest and grid.
+
+    :param request: The upscaling task request.
+    :return: The hexadecimal SHA-256 hash of the request.
+    """
+    digest = _get_request_digest(request)
+    if isinstance(request.dimension, ParameterDimension):
+        for value in request.dimension.values:
+            _update_request_digest(digest, value)
+    return digest.hexdigest()
+
+
+def _get_idempotency_key(upscaling_task_id: int, idx: int) -> str:
+    return f"{upscaling_task_id}:{idx}"
+
+
+def _queue_job_batch(
+    credential: SubmissionCredential,
+    user: str,
+    database: Session,
+    upscaling_task_id: int,
+    start: int,
+    job_requests: List[BaseJobRequest],
+) -> int:
+    # Jobs that already exist for a position in the dimension, for example because the task is
+    # being resumed, are not created again
+    existing = get_upscaling_job_indices(
+        database, upscaling_task_id, list(range(start, start + len(job_requests)))
+    )
+    indexed_requests = [
+        (idx, job_request)
+        for idx, job_request in enumerate(job_requests, start)
+        if idx not in existing
+    ]
+    if not indexed_requests:
+        return 0
+
+    job_requests = [job_request for _, job_request in indexed_requests]
+    request_hashes = [get_job_request_hash(job_request) for job_request in job_requests]
+    reusable_jobs = find_reusable_jobs(database, user, job_requests)
+    records = add_upscaling_jobs_to_db(
+        database,
+        upscaling_task_id,
+        [
+            ProcessingJobRecord(
+                title=job_request.title,
+                label=job_request.label,
+                status=(
+                    ProcessingStatusEnum.FINISHED
+                    if request_hash in reusable_jobs
+                    else ProcessingStatusEnum.QUEUED
+                ),
+                user_id=user,
+                platform_job_id=(
+                    reusable_jobs[request_hash].platform_job_id
+                    if request_hash in reusable_jobs
+                    else None
+                ),
+                finished_at=(
+                    reusable_jobs[request_hash].finished_at
+                    if request_hash in reusable_jobs
+                    else None
+                ),
+                parameters=json.dumps(job_request.parameters),
+                service=job_request.service.model_dump_json(),
+                endpoint=job_request.service.endpoint,
+                request_hash=request_hash,
+                dimension_index=idx,
+                idempotency_key=_get_idempotency_key(upscaling_task_id, idx),
+            )
+            for (idx, job_request), request_hash in zip(indexed_requests, request_hashes)
+        ],
+    )
+    if reusable_jobs:
+        logger.info(
+            "Reusing the results of finished jobs for "
+            f"{sum(record.platform_job_id is not None for record in records)} processing jobs"
+        )
+    # Jobs that reuse the results of a finished job do not need to be submitted
+    queue_job_submissions(
+        database,
+        [
+            JobSubmissionRecord(
+                upscaling_task_id=upscaling_task_id,
+                processing_job_id=record.id,
+                user_id=user,
+                endpoint=job_request.service.endpoint,
+                token=credential.token,
+                credential_expires_at=credential.expires_at,
+                request=job_request.model_dump_json(),
+            )
+            for record, job_request in zip(records, job_requests)
+            if not record.platform_job_id
+        ],
+        SubmissionPriorityEnum.BATCH,
+    )
+    return len(records)
+
+
+def queue_upscaling_processing_jobs(
+    token: str,
+    database: Session,
+    request: UpscalingTaskRequest,
+    upscaling_task_id: int,
+    credential: SubmissionCredential,
+) -> int:
+    """
+    Create the processing jobs of an upscaling task and queue them for submission. The jobs
+    are created in batches of JOB_BATCH_SIZE, each inserted in bulk together with their
+    submissions, so that the memory usage does not depend on the size of the dimension. The
+    jobs are submitted to the platform by the job submission workers. Positions in the
+    dimension that already have a processing job are skipped, so that the jobs of a task can
+    be queued again without creating duplicates.
+
+    :param token: The access token of the user creating the upscaling task.
+    :param database: The database session to use.
+    :param request: The upscaling task request.
+    :param upscaling_task_id: The ID of the upscaling task the jobs belong to.
+    :param credential: The credential with which the jobs are submitted on behalf of the user.
+    :return: Number of processing jobs that were queued.
+    """
+    user = get_current_user_id(token)
     logger.info(
         f"Splitting up upscaling task in processing jobs for parameter {request.dimension.name}"
     )
+    job_requests = get_upscaling_job_requests(request)
+    queued = 0
+    start = 0
+    while batch := list(islice(job_requests, JOB_BATCH_SIZE)):
+        queued += _queue_job_batch(
+            credential, user, database, upscaling_task_id, start, batch
+        )
+        start += len(batch)
+    return queued
+
+
+async def queue_streamed_upscaling_processing_jobs(
+    token: str,
+    database: Session,
+    request: UpscalingTaskStreamRequest,
+    values: AsyncIterator[Any],
+    upscaling_task_id: int,
+    credential: SubmissionCredential,
+) -> int:
+    """
+    Create the processing jobs of an upscaling task while the values of its dimension are
+    being received and queue them for submission. Each batch of JOB_BATCH_SIZE values is
+    queued as soon as it is complete, so that the job submission workers can start submitting
+    the jobs before all values were received.
 
-    # Create jobs
-    for idx, value in enumerate(request.dimension.values):
-        logger.debug(
-            f"Creating processing job with id {idx}: {request.dimension.name}={value}"
+    :param token: The access token of the user creating the upscaling task.
+    :param database: The database session to use.
+    :param request: The upscaling task request.
+    :param values: The values of the dimension of the upscaling task.
+    :param upscaling_task_id: The ID of the upscaling task the jobs belong to.
+    :param credential: The credential with which the jobs are submitted on behalf of the user.
+    :return: Number of processing jobs that were queued.
+    """
+    user = get_current_user_id(token)
+    logger.info(
+        f"Streaming processing jobs of upscaling task for parameter {request.dimension.name}"
+    )
+    queued = 0
+    start = 0
+    batch: List[BaseJobRequest] = []
+    digest = _get_request_digest(request)
+    try:
+        async for value in values:
+            _update_request_digest(digest, value)
+            batch.append(_get_job_request(request, start + len(batch), value))
+            if len(batch) == JOB_BATCH_SIZE:
+                queued += await run_in_threadpool(
+                    _queue_job_batch, credential, user, database, upscaling_task_id, start, batch
+                )
+                start += len(batch)
+                batch = []
+        if batch:
+            queued += await run_in_threadpool(
+                _queue_job_batch, credential, user, database, upscaling_task_id, start, batch
+            )
+        # The request is only known once all values were received
+        await run_in_threadpool(
+            update_upscale_task_request_hash, database, upscaling_task_id, digest.hexdigest()
         )
-        jobs.append(
-            await create_processing_job(
-                token=token,
-                database=database,
+    finally:
+        # The jobs of earlier batches might all have completed before the last batch was
+        # received, so the status of the task is derived again from all of its jobs
+        await run_in_threadpool(_refresh_task_status, database, upscaling_task_id, user)
+    return queued
+
+
+def _refresh_task_status(database: Session, upscaling_task_id: int, user: str):
+    record = get_upscale_task_by_user_id(database, upscaling_task_id, user)
+    if record:
+        _refresh_record_status(database, record)
+
+
+def _requeue_upscaling_jobs(
+    credential: SubmissionCredential,
+    database: Session,
+    request: UpscalingTaskRequest,
+    upscaling_task_id: int,
+    records: List[ProcessingJobRecord],
+) -> int:
+    queue_job_submissions(
+        database,
+        [
+            JobSubmissionRecord(
+                upscaling_task_id=upscaling_task_id,
+                processing_job_id=record.id,
+                user_id=record.user_id,
+                endpoint=record.endpoint,
+                token=credential.token,
+                credential_expires_at=credential.expires_at,
                 request=BaseJobRequest(
-                    title=f"{request.title} - Processing Job {idx + 1}",
-                    label=request.label,
-                    service=request.service,
-                    parameters={**request.parameters, request.dimension.name: value},
+                    title=record.title,
+                    label=record.label,
+                    service=ServiceDetails.model_validate_json(record.service),
+                    parameters=json.loads(record.parameters),
                     format=request.format,
-                ),
-                upscaling_task_id=upscaling_task_id,
+                ).model_dump_json(),
+            )
+            for record in records
+        ],
+        SubmissionPriorityEnum.BATCH,
+    )
+    return len(records)
+
+
+def resume_upscaling_task(
+    token: str,
+    database: Session,
+    upscaling_task_id: int,
+    request: UpscalingTaskRequest,
+    credential: SubmissionCredential,
+) -> Optional[UpscalingTaskSummary]:
+    """
+    Resume the creation of the processing jobs of an upscaling task, for example after it was
+    interrupted by a restart. Only the jobs that are missing are submitted: the positions in the
+    dimension that have no processing job yet are created and queued, and the queued jobs that
+    lost their submission are queued again. Jobs that were already submitted to the platform
+    are never submitted again. Canceled tasks and tasks without missing jobs cannot be resumed.
+
+    :param token: The access token of the user owning the upscaling task.
+    :param database: The database session to use.
+    :param upscaling_task_id: The ID of the upscaling task to resume.
+    :param request: The request with which the upscaling task was created.
+    :param credential: The credential with which the jobs are submitted on behalf of the user.
+    :return: The summary of the resumed upscaling task, or None if the task was not found.
+    """
+    user = get_current_user_id(token)
+    record = get_upscale_task_by_user_id(database, upscaling_task_id, user)
+    if not record:
+        return None
+
+    if record.status == ProcessingStatusEnum.CANCELED:
+        raise TaskConflictException(message="A canceled upscaling task cannot be resumed.")
+    if record.request_hash:
+        if get_upscaling_task_request_hash(request) != record.request_hash:
+            raise TaskConflictException(
+                message="The request does not match the request of the upscaling task."
             )
+    elif (
+        request.label != record.label
+        or request.service != ServiceDetails.model_validate_json(record.service)
+    ):
+        # Tasks created before their request was recorded are only verified on their service
+        raise TaskConflictException(
+            message="The request does not match the service of the upscaling task."
+        )
+    if count_unindexed_upscaling_jobs(database, upscaling_task_id):
+        raise TaskConflictException(
+            message="The upscaling task was created before tasks could be resumed."
+        )
+    # Every job of the task has a position, so the task has a job for each of its positions
+    # once it has as many jobs as its dimension has values
+    unqueued = get_unqueued_upscaling_jobs(database, upscaling_task_id)
+    if not unqueued and (record.jobs_total or 0) >= sum(
+        1 for _ in _get_dimension_values(request.dimension)
+    ):
+        raise TaskConflictException(
+            message="The upscaling task has no missing processing jobs to resume."
         )
-    return jobs
+
+    logger.info(f"Resuming upscaling task {upscaling_task_id} of user {user}")
+    created = queue_upscaling_processing_jobs(
+        token, database, request, upscaling_task_id, credential
+    )
+    requeued = _requeue_upscaling_jobs(
+        credential, database, request, upscaling_task_id, unqueued
+    )
+    logger.info(
+        f"Resumed upscaling task {upscaling_task_id} by creating {created} processing jobs and "
+        f"queueing {requeued} existing ones again"
+    )
+    record = _refresh_record_status(database, record)
+    return UpscalingTaskSummary(
+        id=record.id,
+        title=record.title,
+        label=record.label,
+        status=record.status,
+        progress=_get_progress(record),
+    )
 
 
 def create_upscaling_task(
-    token: str, database: Session, request: UpscalingTaskRequest
+    token: str,
+    database: Session,
+    request: Union[UpscalingTaskRequest, UpscalingTaskStreamRequest],
 ) -> UpscalingTaskSummary:
     user = get_current_user_id(token)
+    if isinstance(request.dimension, GridDimension):
+        # The tasks of areas that are split in too many tiles are rejected before they are stored
+        validate_polygon_tiles(request.dimension.aoi, request.dimension.grid)
     logger.info(f"Saving upscaling job for {user} to the database")
     record = UpscalingTaskRecord(
         title=request.title,
@@ -72,6 +445,12 @@ def create_upscaling_task(
         status=ProcessingStatusEnum.CREATED,
         user_id=user,
         service=request.service.model_dump_json(),
+        # The hash of a streamed task is stored once all of its values were received
+        request_hash=(
+            get_upscaling_task_request_hash(request)
+            if isinstance(request, UpscalingTaskRequest)
+            else None
+        ),
     )
     record = save_upscaling_task_to_db(database, record)
     return UpscalingTaskSummary(
@@ -79,11 +458,56 @@ def create_upscaling_task(
     )
 
 
-def _get_upscale_status(jobs: List[ProcessingJobSummary]) -> ProcessingStatusEnum:
-    if not jobs:
-        return ProcessingStatusEnum.CREATED  # edge case: no jobs
+async def cancel_upscaling_task(
+    token: str, database: Session, upscaling_task_id: int
+) -> Optional[UpscalingTaskSummary]:
+    """
+    Cancel an upscaling task and all of its active processing jobs. The queued submissions of
+    the task are removed and the jobs that were not submitted yet are canceled at once, after
+    which the jobs that are running on the platforms are canceled concurrently, limited by
+    CANCEL_CONCURRENCY.
 
-    statuses = {job.status for job in jobs}
+    :param token: The access token of the user owning the upscaling task.
+    :param database: The database session to use.
+    :param upscaling_task_id: The ID of the upscaling task to cancel.
+    :return: The summary of the canceled upscaling task, or None if the task was not found.
+    """
+    user = get_current_user_id(token)
+    record = get_upscale_task_by_user_id(database, upscaling_task_id, user)
+    if not record:
+        return None
+
+    if record.status not in INACTIVE_TASK_STATUSES:
+        logger.info(f"Canceling upscaling task {upscaling_task_id} of user {user}")
+        remove_pending_job_submissions(
+            database, settings.submission_lease, upscaling_task_id=upscaling_task_id
+        )
+        cancel_queued_upscaling_jobs(database, upscaling_task_id)
+        jobs = get_submitted_upscaling_jobs(database, upscaling_task_id)
+        canceled = await cancel_processing_jobs(token, database, jobs)
+        if len(canceled) != len(jobs):
+            logger.warning(
+                f"Could not cancel {len(jobs) - len(canceled)} processing jobs of upscaling "
+                f"task {upscaling_task_id}, their status is refreshed from the platform"
+            )
+        update_upscale_task_statuses(
+            database, {upscaling_task_id: ProcessingStatusEnum.CANCELED}
+        )
+        database.refresh(record)
+
+    return UpscalingTaskSummary(
+        id=record.id,
+        title=record.title,
+        label=record.label,
+        status=record.status,
+        progress=_get_progress(record),
+    )
+
+
+def _get_status_from_counts(counts: Dict[ProcessingStatusEnum, int]) -> ProcessingStatusEnum:
+    statuses = {status for status, count in counts.items() if count > 0}
+    if not statuses:
+        return ProcessingStatusEnum.CREATED  # edge case: no jobs
 
     if ProcessingStatusEnum.RUNNING in statuses:
         return ProcessingStatusEnum.RUNNING
@@ -96,16 +520,50 @@ def _get_upscale_status(jobs: List[ProcessingJobSummary]) -> ProcessingStatusEnu
     return ProcessingStatusEnum.CREATED
 
 
+def _get_upscale_status(jobs: List[ProcessingJobSummary]) -> ProcessingStatusEnum:
+    return _get_status_from_counts(Counter(job.status for job in jobs))
+
+
+def _get_progress(record: UpscalingTaskRecord) -> float:
+    counts = record.get_job_counts()
+    total = sum(counts.values())
+    if not total:
+        return 0.0
+    completed = sum(counts[status] for status in INACTIVE_TASK_STATUSES)
+    return round(100 * completed / total, 2)
+
+
+def _refresh_record_statuses(
+    database: Session, records: List[UpscalingTaskRecord]
+) -> List[UpscalingTaskRecord]:
+    """
+    Update the status of upscaling tasks based on the job counters of the tasks, which are kept
+    up to date whenever the status of one of their processing jobs changes.
+
+    :param database: The database session to use.
+    :param records: The upscaling task records to refresh.
+    :return: The refreshed records.
+    """
+    # The job counters might have been updated since the records were loaded
+    reload_upscale_tasks(database, records)
+    status_changes: Dict[int, ProcessingStatusEnum] = {}
+    for record in records:
+        new_status = _get_status_from_counts(record.get_job_counts())
+        if new_status != record.status:
+            status_changes[record.id] = new_status
+
+    for record in records:
+        if record.id in status_changes:
+            # The status is stored in bulk, avoid flushing it again for each record
+            set_committed_value(record, "status", status_changes[record.id])
+    update_upscale_task_statuses(database, status_changes)
+    return reload_upscale_tasks(database, records)
+
+
 def _refresh_record_status(
-    database: Session,
-    record: UpscalingTaskRecord,
-    jobs: List[ProcessingJobSummary],
+    database: Session, record: UpscalingTaskRecord
 ) -> UpscalingTaskRecord:
-    new_status = _get_upscale_status(jobs)
-    if new_status != record.status:
-        update_upscale_task_status_by_id(database, record.id, new_status)
-        record.status = new_status
-    return record
+    return _refresh_record_statuses(database, [record])[0]
 
 
 async def get_upscaling_task_by_user_id(
@@ -117,15 +575,17 @@ async def get_upscaling_task_by_user_id(
     if not record:
         return None
 
+    # Refreshing the status of the jobs also updates the job counters of the task
     jobs = await get_processing_jobs_by_user_id(token, database, record.id)
     if record.status not in INACTIVE_TASK_STATUSES:
-        record = _refresh_record_status(database, record, jobs)
+        record = _refresh_record_status(database, record)
 
     return UpscalingTask(
         id=record.id,
         title=record.title,
         label=record.label,
         status=record.status,
+        progress=_get_progress(record),
         service=ServiceDetails.model_validate_json(record.service or "{}"),
         created=record.created,
         updated=record.updated,
@@ -139,20 +599,29 @@ async def get_upscaling_tasks_by_user_id(
     user = get_current_user_id(token)
     logger.info(f"Retrieving upscaling tasks for user {user}")
 
-    tasks: List[UpscalingTaskSummary] = []
     records = get_upscale_tasks_by_user_id(database, user)
+    active_records = [
+        record for record in records if record.status not in INACTIVE_TASK_STATUSES
+    ]
 
-    for record in records:
-        if record.status not in INACTIVE_TASK_STATUSES:
-            jobs = await get_processing_jobs_by_user_id(token, database, record.id)
-            record = _refresh_record_status(database, record, jobs)
-        tasks.append(
-            UpscalingTaskSummary(
-                id=record.id,
-                title=record.title,
-                label=record.label,
-                status=record.status,
-            )
+    if active_records and not settings.status_reconciler_enabled:
+        # Refresh the jobs of all active tasks at once, which also updates the job counters of
+        # the tasks from which their status is derived
+        jobs = get_jobs_by_upscaling_task_ids(
+            database, user, [record.id for record in active_records]
         )
+        await refresh_job_statuses(token, database, jobs)
+    _refresh_record_statuses(database, active_records)
+    # The other records were expired as well when the changes were committed
+    reload_upscale_tasks(database, records)
 
-    return tasks
+    return [
+        UpscalingTaskSummary(
+            id=record.id,
+            title=record.title,
+            label=record.label,
+            status=record.status,
+            progress=_get_progress(record),
+        )
+        for record in records
+    ]
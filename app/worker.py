@@ -0,0 +1,32 @@
+"""
+Standalone worker that submits the queued processing jobs of upscaling tasks to the platforms.
+Multiple workers can be started next to the API to scale the submission throughput:
+
+    python -m app.worker
+"""
+
+import asyncio
+
+from app.config.logger import setup_logging
+from app.platforms.dispatcher import load_processing_platforms
+from app.platforms.implementations.openeo import udp_cache
+from app.services.credentials import validate_submission_credential_key
+from app.services.submission import run_submission_worker
+
+
+async def run_worker():
+    try:
+        await run_submission_worker()
+    finally:
+        await udp_cache.aclose()
+
+
+def main():
+    setup_logging()
+    validate_submission_credential_key()
+    load_processing_platforms()
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
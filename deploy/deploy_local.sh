@@ -52,6 +52,7 @@ KEYCLOAK_CLIENT_ID=$(_extract_env "KEYCLOAK_CLIENT_ID")
 KEYCLOAK_CLIENT_SECRET=$(_extract_env "KEYCLOAK_CLIENT_SECRET")
 DATABASE_URL=$(_extract_env "DATABASE_URL")
 OPENEO_BACKENDS=$(_extract_env "OPENEO_BACKENDS")
+SUBMISSION_CREDENTIAL_KEY=$(_extract_env "SUBMISSION_CREDENTIAL_KEY")
 
 # Create or update secret using kubectl apply via dry-run
 kubectl create secret generic "${SECRET_NAME}" \
@@ -60,6 +61,7 @@ kubectl create secret generic "${SECRET_NAME}" \
   --from-literal=KEYCLOAK_CLIENT_SECRET="${KEYCLOAK_CLIENT_SECRET}" \
   --from-literal=DATABASE_URL="${DATABASE_URL}" \
   --from-literal=OPENEO_BACKENDS="${OPENEO_BACKENDS}" \
+  --from-literal=SUBMISSION_CREDENTIAL_KEY="${SUBMISSION_CREDENTIAL_KEY}" \
   --dry-run=client -o yaml | kubectl apply -f -
 
 
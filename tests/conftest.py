@@ -1,14 +1,20 @@
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
+from cryptography.fernet import Fernet
 from fastapi import Response
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
 from stac_pydantic import Collection
 from stac_pydantic.collection import Extent, SpatialExtent, TimeInterval
 
 from app.auth import get_current_user_id, oauth2_scheme
+from app.config.settings import settings
+from app.database.db import Base
 from app.database.models.processing_job import ProcessingJobRecord
 from app.database.models.upscaling_task import UpscalingTaskRecord
 from app.main import app
@@ -20,6 +26,8 @@ from app.schemas.unit_job import (
     ProcessingJobSummary,
     ServiceDetails,
 )
+from app.services.credentials import SubmissionCredential
+from app.services.processing import status_cache
 from app.schemas.upscale_task import (
     ParameterDimension,
     UpscalingTask,
@@ -36,8 +44,39 @@ def fake_user_token():
     return "foobar_token"
 
 
+@pytest.fixture(autouse=True)
+def clear_status_cache():
+    status_cache.clear()
+    yield
+    status_cache.clear()
+
+
 @pytest.fixture
-def client():
+def fake_submission_credential():
+    return SubmissionCredential(token="encrypted-offline-token", expires_at=None)
+
+
+@pytest.fixture(autouse=True)
+def submission_credentials(monkeypatch, fake_submission_credential):
+    # No offline tokens are retrieved from Keycloak during the tests, the stored credential is
+    # used as access token of the user
+    get_credential = AsyncMock(return_value=fake_submission_credential)
+    monkeypatch.setattr(
+        "app.routers.upscale_tasks.get_submission_credential", get_credential
+    )
+    monkeypatch.setattr("app.services.processing.get_submission_credential", get_credential)
+    monkeypatch.setattr(
+        "app.services.submission.get_submission_access_token",
+        AsyncMock(side_effect=lambda credential: credential),
+    )
+    return get_credential
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Job submissions are not processed in the background during the tests
+    monkeypatch.setattr(settings, "submission_worker_enabled", False)
+    monkeypatch.setattr(settings, "submission_credential_key", Fernet.generate_key().decode())
     app.dependency_overrides[oauth2_scheme] = fake_user_token
     app.dependency_overrides[get_current_user_id] = fake_get_current_user_id
     with TestClient(app) as c:
@@ -45,6 +84,21 @@ def client():
     app.dependency_overrides.pop(get_current_user_id, None)
 
 
+@compiles(LONGTEXT, "sqlite")
+def compile_longtext_for_sqlite(type_, compiler, **kw):
+    # The database tests run against SQLite, which does not know the LONGTEXT type of MySQL
+    return "TEXT"
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
 @pytest.fixture
 def fake_db_session():
     # A simple mock DB session object
@@ -167,7 +221,7 @@ def fake_upscaling_task(fake_upscaling_task_summary, fake_upscaling_task_request
 @pytest.fixture
 def fake_upscaling_task_record(fake_upscaling_task_summary):
     return UpscalingTaskRecord(
-        **(fake_upscaling_task_summary.model_dump()),
+        **(fake_upscaling_task_summary.model_dump(exclude={"progress"})),
         service='{"endpoint":"foo","application":"bar"}',
         created=datetime.now(),
         updated=datetime.now()
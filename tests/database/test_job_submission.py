@@ -0,0 +1,110 @@
+import datetime
+
+from app.database.models.job_submission import (
+    BackendLockRecord,
+    JobSubmissionRecord,
+    claim_job_submissions,
+    count_claimed_job_submissions,
+    lock_backends,
+    save_job_submissions_to_db,
+)
+from app.schemas.enum import SubmissionPriorityEnum
+
+
+def make_submission(user_id="foobar", endpoint="https://openeo.eo", **kwargs):
+    return JobSubmissionRecord(
+        **{
+            "user_id": user_id,
+            "endpoint": endpoint,
+            "token": "credential",
+            "request": "{}",
+            "priority": SubmissionPriorityEnum.BATCH,
+            **kwargs,
+        }
+    )
+
+
+def test_claim_job_submissions_in_schedule_order(db_session):
+    save_job_submissions_to_db(
+        db_session,
+        [
+            make_submission(virtual_finish=2.0),
+            make_submission(virtual_finish=1.0),
+            make_submission(virtual_finish=3.0, priority=SubmissionPriorityEnum.INTERACTIVE),
+            make_submission(virtual_finish=0.5),
+        ],
+    )
+
+    claimed = claim_job_submissions(db_session, 3, lease=600)
+
+    assert [(submission.priority, submission.virtual_finish) for submission in claimed] == [
+        (SubmissionPriorityEnum.INTERACTIVE, 3.0),
+        (SubmissionPriorityEnum.BATCH, 0.5),
+        (SubmissionPriorityEnum.BATCH, 1.0),
+    ]
+    assert all(submission.attempts == 1 for submission in claimed)
+    # The claimed submissions are not claimed again until their lease expires
+    assert [
+        submission.virtual_finish
+        for submission in claim_job_submissions(db_session, 3, lease=600)
+    ] == [2.0]
+    assert claim_job_submissions(db_session, 3, lease=600) == []
+
+
+def test_claim_job_submissions_reclaims_expired_leases(db_session):
+    claimed_at = datetime.datetime.utcnow() - datetime.timedelta(minutes=5)
+    save_job_submissions_to_db(
+        db_session,
+        [
+            make_submission(virtual_finish=1.0, claimed_at=claimed_at, attempts=1),
+            make_submission(virtual_finish=2.0, claimed_at=datetime.datetime.utcnow()),
+        ],
+    )
+
+    claimed = claim_job_submissions(db_session, 10, lease=60)
+
+    assert [(submission.virtual_finish, submission.attempts) for submission in claimed] == [
+        (1.0, 2)
+    ]
+
+
+def test_claim_job_submissions_skips_excluded_backends(db_session):
+    save_job_submissions_to_db(
+        db_session,
+        [
+            make_submission(user_id="alice", endpoint="https://full.eo", virtual_finish=1.0),
+            make_submission(user_id="alice", endpoint="https://busy.eo", virtual_finish=2.0),
+            make_submission(user_id="bob", endpoint="https://busy.eo", virtual_finish=3.0),
+            make_submission(user_id="alice", endpoint=None, virtual_finish=4.0),
+        ],
+    )
+
+    claimed = claim_job_submissions(
+        db_session,
+        10,
+        lease=600,
+        excluded=[("https://full.eo", None), ("https://busy.eo", "alice")],
+    )
+
+    assert [(submission.user_id, submission.endpoint) for submission in claimed] == [
+        ("bob", "https://busy.eo"),
+        ("alice", None),
+    ]
+    assert count_claimed_job_submissions(
+        db_session, ["https://full.eo", "https://busy.eo"], lease=600
+    ) == {("https://busy.eo", "bob"): 1}
+
+
+def test_lock_backends_creates_missing_locks(db_session):
+    db_session.add(BackendLockRecord(endpoint="https://a.eo"))
+    db_session.commit()
+
+    assert lock_backends(db_session, ["https://a.eo", "https://b.eo"]) == {
+        "https://a.eo",
+        "https://b.eo",
+    }
+    db_session.commit()
+    # Locking the same backends again does not create them again
+    assert lock_backends(db_session, ["https://b.eo"]) == {"https://b.eo"}
+    assert db_session.query(BackendLockRecord).count() == 2
+    assert lock_backends(db_session, []) == set()
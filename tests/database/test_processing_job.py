@@ -0,0 +1,268 @@
+import datetime
+
+from app.database.models.processing_job import (
+    ProcessingJobRecord,
+    add_job_to_db,
+    add_upscaling_jobs_to_db,
+    cancel_queued_jobs,
+    count_inflight_jobs,
+    get_reusable_jobs,
+    remove_job_by_id,
+    update_job_statuses,
+    update_submitted_jobs,
+)
+from app.database.models.upscaling_task import UpscalingTaskRecord
+from app.database.models.user_credential import save_user_credentials
+from app.schemas.enum import ProcessingStatusEnum, ProcessTypeEnum
+
+
+def add_task(database, user_id="foobar"):
+    task = UpscalingTaskRecord(
+        title="Task",
+        label=ProcessTypeEnum.OPENEO,
+        status=ProcessingStatusEnum.CREATED,
+        user_id=user_id,
+        service='{"endpoint":"https://openeo.eo","application":"app"}',
+    )
+    database.add(task)
+    database.commit()
+    return task
+
+
+def make_job(idx, status=ProcessingStatusEnum.QUEUED, **kwargs):
+    return ProcessingJobRecord(
+        **{
+            "title": f"Job {idx}",
+            "label": ProcessTypeEnum.OPENEO,
+            "status": status,
+            "user_id": "foobar",
+            "parameters": "{}",
+            "service": '{"endpoint":"https://openeo.eo","application":"app"}',
+            "endpoint": "https://openeo.eo",
+            **kwargs,
+        }
+    )
+
+
+def make_upscaling_jobs(task, indices, **kwargs):
+    return [
+        make_job(idx, dimension_index=idx, idempotency_key=f"{task.id}:{idx}", **kwargs)
+        for idx in indices
+    ]
+
+
+def test_add_upscaling_jobs_to_db_returns_jobs_in_order(db_session):
+    task = add_task(db_session)
+
+    records = add_upscaling_jobs_to_db(
+        db_session, task.id, make_upscaling_jobs(task, [2, 0, 1])
+    )
+    db_session.commit()
+
+    assert [record.dimension_index for record in records] == [2, 0, 1]
+    assert all(record.id for record in records)
+    assert all(record.upscaling_task_id == task.id for record in records)
+    assert task.jobs_total == 3
+    assert task.jobs_queued == 3
+
+
+def test_add_upscaling_jobs_to_db_reads_back_jobs_without_returning(
+    db_session, monkeypatch
+):
+    task = add_task(db_session)
+    monkeypatch.setattr(
+        db_session.get_bind().dialect,
+        "insert_executemany_returning_sort_by_parameter_order",
+        False,
+    )
+    # Jobs that are inserted concurrently are not returned
+    other = add_task(db_session)
+    add_upscaling_jobs_to_db(db_session, other.id, make_upscaling_jobs(other, [0]))
+
+    records = add_upscaling_jobs_to_db(
+        db_session, task.id, make_upscaling_jobs(task, [1, 0])
+    )
+
+    assert [record.idempotency_key for record in records] == [
+        f"{task.id}:1",
+        f"{task.id}:0",
+    ]
+    assert records[0].id < records[1].id
+
+
+def test_update_job_statuses_updates_task_counters(db_session):
+    task = add_task(db_session)
+    jobs = add_upscaling_jobs_to_db(db_session, task.id, make_upscaling_jobs(task, [0, 1, 2]))
+    db_session.commit()
+
+    update_job_statuses(
+        db_session,
+        {jobs[0].id: ProcessingStatusEnum.RUNNING, jobs[1].id: ProcessingStatusEnum.FINISHED},
+    )
+    # Storing the same status again does not change the counters
+    update_job_statuses(db_session, {jobs[1].id: ProcessingStatusEnum.FINISHED})
+
+    assert task.get_job_counts() == {
+        ProcessingStatusEnum.CREATED: 0,
+        ProcessingStatusEnum.QUEUED: 1,
+        ProcessingStatusEnum.RUNNING: 1,
+        ProcessingStatusEnum.FINISHED: 1,
+        ProcessingStatusEnum.FAILED: 0,
+        ProcessingStatusEnum.CANCELED: 0,
+        ProcessingStatusEnum.UNKNOWN: 0,
+    }
+
+
+def test_update_job_statuses_increments_task_counters(db_session):
+    task = add_task(db_session)
+    jobs = add_upscaling_jobs_to_db(db_session, task.id, make_upscaling_jobs(task, [0, 1]))
+    # Jobs that were counted by another transaction in the meantime are not recounted
+    task.jobs_total = 12
+    task.jobs_running = 10
+    db_session.commit()
+
+    update_job_statuses(db_session, {jobs[0].id: ProcessingStatusEnum.RUNNING})
+
+    assert task.jobs_total == 12
+    assert task.jobs_queued == 1
+    assert task.jobs_running == 11
+
+
+def test_cancel_queued_jobs_updates_task_counters(db_session):
+    task = add_task(db_session)
+    jobs = add_upscaling_jobs_to_db(db_session, task.id, make_upscaling_jobs(task, [0, 1]))
+    jobs[1].platform_job_id = "job1"
+    db_session.commit()
+
+    canceled = cancel_queued_jobs(db_session, [job.id for job in jobs])
+
+    assert canceled == {jobs[0].id}
+    assert jobs[0].status == ProcessingStatusEnum.CANCELED
+    assert jobs[1].status == ProcessingStatusEnum.QUEUED
+    assert task.jobs_queued == 1
+    assert task.jobs_canceled == 1
+
+
+def test_update_submitted_jobs_updates_task_counters(db_session):
+    task = add_task(db_session)
+    jobs = add_upscaling_jobs_to_db(db_session, task.id, make_upscaling_jobs(task, [0, 1, 2]))
+    db_session.commit()
+    cancel_queued_jobs(db_session, [jobs[2].id])
+
+    rejected = update_submitted_jobs(
+        db_session, {jobs[0].id: "job0", jobs[1].id: None, jobs[2].id: "job2"}
+    )
+    db_session.commit()
+
+    assert rejected == {jobs[2].id}
+    assert [(job.status, job.platform_job_id) for job in jobs] == [
+        (ProcessingStatusEnum.CREATED, "job0"),
+        (ProcessingStatusEnum.FAILED, None),
+        (ProcessingStatusEnum.CANCELED, None),
+    ]
+    assert task.jobs_queued == 0
+    assert task.jobs_created == 1
+    assert task.jobs_failed == 1
+    assert task.jobs_canceled == 1
+
+
+def test_remove_job_by_id_updates_task_counters(db_session):
+    task = add_task(db_session)
+    jobs = add_upscaling_jobs_to_db(db_session, task.id, make_upscaling_jobs(task, [0, 1]))
+    db_session.commit()
+
+    assert remove_job_by_id(db_session, jobs[0].id, "foobar")
+
+    assert task.jobs_total == 1
+    assert task.jobs_queued == 1
+
+
+def test_get_reusable_jobs_filters_on_finish_time(db_session):
+    now = datetime.datetime.utcnow()
+    job = add_job_to_db(db_session, make_job(0, platform_job_id="job0", request_hash="hash"))
+    db_session.commit()
+    update_job_statuses(db_session, {job.id: ProcessingStatusEnum.FINISHED})
+
+    assert job.finished_at >= now
+    assert get_reusable_jobs(db_session, "foobar", ["hash"], now) == {"hash": job}
+    assert get_reusable_jobs(db_session, "other", ["hash"], now) == {}
+    assert (
+        get_reusable_jobs(
+            db_session, "foobar", ["hash"], now + datetime.timedelta(minutes=1)
+        )
+        == {}
+    )
+
+
+def test_get_reusable_jobs_does_not_extend_reused_results(db_session):
+    now = datetime.datetime.utcnow()
+    finished_at = now - datetime.timedelta(hours=2)
+    add_job_to_db(
+        db_session,
+        make_job(
+            0,
+            status=ProcessingStatusEnum.FINISHED,
+            platform_job_id="job0",
+            request_hash="hash",
+            finished_at=finished_at,
+        ),
+    )
+    # A job that recently reused these results keeps the time at which they were produced
+    add_job_to_db(
+        db_session,
+        make_job(
+            1,
+            status=ProcessingStatusEnum.FINISHED,
+            platform_job_id="job0",
+            request_hash="hash",
+            finished_at=finished_at,
+        ),
+    )
+    db_session.commit()
+
+    assert get_reusable_jobs(
+        db_session, "foobar", ["hash"], now - datetime.timedelta(hours=1)
+    ) == {}
+
+
+def test_count_inflight_jobs_counts_reconciled_jobs(db_session):
+    now = datetime.datetime.utcnow()
+    save_user_credentials(
+        db_session,
+        {
+            "foobar": ("foobar-credential", None),
+            "expired": ("expired-credential", now - datetime.timedelta(minutes=1)),
+        },
+    )
+    for idx, kwargs in enumerate(
+        [
+            {"next_poll_at": now + datetime.timedelta(minutes=5)},
+            # Submitted jobs that were not polled yet are due right away
+            {"next_poll_at": None},
+            {"next_poll_at": now - datetime.timedelta(minutes=1), "endpoint": "https://other.eo"},
+            # Jobs of which the status is no longer reconciled
+            {"next_poll_at": now - datetime.timedelta(hours=1)},
+            {"next_poll_at": None, "user_id": "expired"},
+            {"next_poll_at": None, "user_id": "unknown"},
+            {"next_poll_at": None, "status": ProcessingStatusEnum.FINISHED},
+            {"next_poll_at": None, "platform_job_id": None},
+        ]
+    ):
+        add_job_to_db(
+            db_session,
+            make_job(
+                idx,
+                **{
+                    "status": ProcessingStatusEnum.RUNNING,
+                    "platform_job_id": f"job{idx}",
+                    **kwargs,
+                },
+            ),
+        )
+    db_session.commit()
+
+    assert count_inflight_jobs(db_session, ["https://openeo.eo", "https://other.eo"], 600) == {
+        ("https://openeo.eo", "foobar"): 2,
+        ("https://other.eo", "foobar"): 1,
+    }
+    assert count_inflight_jobs(db_session, [], 600) == {}
@@ -0,0 +1,22 @@
+import datetime
+
+from app.database.models.user_credential import get_user_credentials, save_user_credentials
+
+
+def test_save_user_credentials_replaces_stored_credential(db_session):
+    expiry = datetime.datetime(2026, 1, 1)
+    save_user_credentials(db_session, {"alice": ("alice-1", None), "bob": ("bob-1", expiry)})
+    db_session.commit()
+
+    save_user_credentials(db_session, {"alice": ("alice-2", expiry)})
+    db_session.commit()
+
+    credentials = get_user_credentials(db_session, ["alice", "bob", "carol"])
+    assert {
+        user_id: (credential.token, credential.expires_at)
+        for user_id, credential in credentials.items()
+    } == {"alice": ("alice-2", expiry), "bob": ("bob-1", expiry)}
+
+
+def test_get_user_credentials_without_users(db_session):
+    assert get_user_credentials(db_session, []) == {}
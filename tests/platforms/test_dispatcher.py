@@ -31,6 +31,9 @@ class DummyPlatform(BaseProcessingPlatform):
     def get_job_results(self, job_id, details):
         return self.fake_result
 
+    def cancel_job(self, user_token, job_id, details):
+        pass
+
     def get_service_parameters(self, user_token, details):
         return fake_parameter_result()
 
@@ -0,0 +1,126 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from ogc_api_processes_client.models.status_code import StatusCode
+
+from app.config.settings import settings
+from app.platforms.implementations.ogc_api_process import OGCAPIProcessPlatform
+from app.schemas.enum import ProcessingStatusEnum
+from app.schemas.unit_job import ServiceDetails
+
+
+@pytest.fixture
+def platform():
+    return OGCAPIProcessPlatform()
+
+
+@pytest.fixture
+def service_details():
+    return ServiceDetails(endpoint="https://ogc.example", application="app")
+
+
+@pytest.fixture(autouse=True)
+def mock_exchange_token():
+    with patch(
+        "app.platforms.implementations.ogc_api_process.exchange_token",
+        new_callable=AsyncMock,
+        return_value="exchanged-token",
+    ) as mock_exchange:
+        yield mock_exchange
+
+
+def make_api_client(*jobs):
+    api_client = MagicMock()
+    api_client.get_jobs.return_value = SimpleNamespace(
+        jobs=[SimpleNamespace(job_id=job_id, status=status) for job_id, status in jobs]
+    )
+    return api_client
+
+
+@pytest.mark.asyncio
+@patch.object(OGCAPIProcessPlatform, "get_job_status", new_callable=AsyncMock)
+@patch.object(OGCAPIProcessPlatform, "_create_api_client_instance", new_callable=AsyncMock)
+async def test_get_job_statuses_lists_jobs_per_namespace(
+    mock_client, mock_get_job_status, platform, service_details, monkeypatch
+):
+    monkeypatch.setattr(settings, "status_listing_threshold", 2)
+    clients = {
+        "ns1": make_api_client(("job1", StatusCode.RUNNING), ("other", StatusCode.FAILED)),
+        "ns2": make_api_client(("job2", StatusCode.SUCCESSFUL)),
+    }
+    mock_client.side_effect = lambda endpoint, namespace, token: clients[namespace]
+
+    result = await platform.get_job_statuses(
+        "foobar", ["ns1:job1", "ns2:job2"], service_details
+    )
+
+    assert result == {
+        "ns1:job1": ProcessingStatusEnum.RUNNING,
+        "ns2:job2": ProcessingStatusEnum.FINISHED,
+    }
+    assert [call.args[1] for call in mock_client.call_args_list] == ["ns1", "ns2"]
+    assert all(call.args[2] == "exchanged-token" for call in mock_client.call_args_list)
+    mock_get_job_status.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch.object(OGCAPIProcessPlatform, "get_job_status", new_callable=AsyncMock)
+@patch.object(OGCAPIProcessPlatform, "_create_api_client_instance", new_callable=AsyncMock)
+async def test_get_job_statuses_falls_back_for_missing_jobs(
+    mock_client, mock_get_job_status, platform, service_details, monkeypatch
+):
+    monkeypatch.setattr(settings, "status_listing_threshold", 2)
+    mock_client.return_value = make_api_client(("job1", StatusCode.ACCEPTED))
+    mock_get_job_status.return_value = ProcessingStatusEnum.RUNNING
+
+    result = await platform.get_job_statuses(
+        "foobar", ["ns:job1", "ns:job2"], service_details
+    )
+
+    assert result == {
+        "ns:job1": ProcessingStatusEnum.CREATED,
+        "ns:job2": ProcessingStatusEnum.RUNNING,
+    }
+    mock_get_job_status.assert_called_once_with("foobar", "ns:job2", service_details)
+
+
+@pytest.mark.asyncio
+@patch.object(OGCAPIProcessPlatform, "get_job_status", new_callable=AsyncMock)
+@patch.object(OGCAPIProcessPlatform, "_create_api_client_instance", new_callable=AsyncMock)
+async def test_get_job_statuses_does_not_fall_back_when_listing_fails(
+    mock_client, mock_get_job_status, platform, service_details, monkeypatch
+):
+    monkeypatch.setattr(settings, "status_listing_threshold", 2)
+    clients = {
+        "ns1": make_api_client(("job1", StatusCode.DISMISSED)),
+        "ns2": MagicMock(get_jobs=MagicMock(side_effect=RuntimeError("Listing failed"))),
+    }
+    mock_client.side_effect = lambda endpoint, namespace, token: clients[namespace]
+
+    result = await platform.get_job_statuses(
+        "foobar", ["ns1:job1", "ns2:job2", "ns2:job3"], service_details
+    )
+
+    assert result == {"ns1:job1": ProcessingStatusEnum.CANCELED}
+    mock_get_job_status.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch.object(OGCAPIProcessPlatform, "get_job_status", new_callable=AsyncMock)
+@patch.object(OGCAPIProcessPlatform, "_create_api_client_instance", new_callable=AsyncMock)
+async def test_get_job_statuses_requests_few_jobs_separately(
+    mock_client, mock_get_job_status, platform, service_details, mock_exchange_token
+):
+    mock_get_job_status.side_effect = [
+        ProcessingStatusEnum.FAILED,
+        ProcessingStatusEnum.UNKNOWN,
+    ]
+
+    result = await platform.get_job_statuses(
+        "foobar", ["ns:job1", "ns:job2"], service_details
+    )
+
+    assert result == {"ns:job1": ProcessingStatusEnum.FAILED}
+    mock_client.assert_not_called()
+    mock_exchange_token.assert_not_called()
@@ -0,0 +1,146 @@
+import inspect
+import json
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+import openeo
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from app.platforms.openeo_metadata import CachedMetadataConnection, metadata_cache
+
+BACKEND_URL = "https://openeo.example"
+
+
+class FakeBackendAdapter(BaseAdapter):
+    """Serve the metadata documents of an openEO backend and count the requests per path."""
+
+    def __init__(self):
+        super().__init__()
+        self.requests: Counter = Counter()
+
+    def send(self, request, **kwargs):
+        path = request.path_url
+        self.requests[path] += 1
+        documents = {
+            "/.well-known/openeo": {
+                "versions": [{"api_version": "1.2.0", "url": f"{BACKEND_URL}/openeo/1.2"}]
+            },
+            "/openeo/1.2/": {
+                "api_version": "1.2.0",
+                "endpoints": [
+                    {"path": "/credentials/oidc", "methods": ["GET"]},
+                    {"path": "/validation", "methods": ["POST"]},
+                ],
+            },
+        }
+        response = requests.Response()
+        response.status_code = 200 if path in documents else 404
+        response._content = json.dumps(documents.get(path, {})).encode()
+        response.headers["Content-Type"] = "application/json"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def backend():
+    metadata_cache.clear()
+    adapter = FakeBackendAdapter()
+    session = requests.Session()
+    session.mount(BACKEND_URL, adapter)
+    yield adapter, session
+    metadata_cache.clear()
+
+
+def test_connections_share_backend_metadata(backend):
+    adapter, session = backend
+
+    first = CachedMetadataConnection(BACKEND_URL, session=session)
+    second = CachedMetadataConnection(BACKEND_URL, session=session)
+
+    assert first.root_url == second.root_url == f"{BACKEND_URL}/openeo/1.2"
+    assert second.capabilities().api_version() == "1.2.0"
+    assert adapter.requests == {"/.well-known/openeo": 1, "/openeo/1.2/": 1}
+
+
+def test_authenticated_capabilities_are_not_shared(backend):
+    adapter, session = backend
+
+    first = CachedMetadataConnection(BACKEND_URL, session=session)
+    first.authenticate_bearer_token("oidc/provider/token")
+    first.capabilities()
+    first.capabilities()
+    second = CachedMetadataConnection(BACKEND_URL, session=session)
+    second.capabilities()
+
+    # The authenticated connection retrieves its own capabilities once, the anonymous ones are
+    # only retrieved by the first connection
+    assert adapter.requests["/openeo/1.2/"] == 2
+
+
+def test_failed_version_discovery_is_not_cached(backend):
+    adapter, session = backend
+    url = f"{BACKEND_URL}/missing"
+
+    with patch.object(CachedMetadataConnection, "capabilities"):
+        CachedMetadataConnection(url, session=session)
+        CachedMetadataConnection(url, session=session)
+
+    assert adapter.requests["/missing/.well-known/openeo"] == 2
+
+
+@patch.object(openeo.Connection, "_authenticate_oidc")
+@patch.object(openeo.Connection, "_get_oidc_provider")
+def test_client_credentials_share_oidc_provider(mock_provider, mock_authenticate, backend):
+    _, session = backend
+    provider_info = MagicMock()
+    mock_provider.return_value = ("provider", provider_info)
+
+    for client_id in ["client1", "client2"]:
+        connection = CachedMetadataConnection(BACKEND_URL, session=session)
+        connection.authenticate_oidc_client_credentials(
+            client_id=client_id, client_secret="secret", provider_id="provider"
+        )
+
+    mock_provider.assert_called_once_with("provider", True)
+    assert mock_authenticate.call_count == 2
+    authenticator = mock_authenticate.call_args.args[0]
+    assert authenticator.client_id == "client2"
+    assert authenticator.provider_info is provider_info
+
+
+def test_overridden_client_internals_keep_their_signature():
+    # The connection overrides a private method of the openEO client, which is not covered by
+    # its compatibility guarantees
+    signature = inspect.signature(openeo.Connection._get_oidc_provider)
+
+    assert list(signature.parameters) == ["self", "provider_id", "parse_info"]
+    assert signature.parameters["parse_info"].default is True
+    assert list(inspect.signature(CachedMetadataConnection._get_oidc_provider).parameters) == [
+        "self",
+        "provider_id",
+        "parse_info",
+    ]
+
+
+def test_job_creation_does_not_validate_process_graph(backend):
+    adapter, session = backend
+    connection = CachedMetadataConnection(BACKEND_URL, session=session)
+    connection.authenticate_bearer_token("oidc/provider/token")
+
+    with patch.object(connection, "post") as mock_post:
+        mock_post.return_value.headers = {"openeo-identifier": "job-1"}
+        job = connection.create_job(
+            {"add": {"process_id": "add", "arguments": {}, "result": True}}
+        )
+
+    # Only the job itself is created, without requesting the authenticated capabilities
+    assert job.job_id == "job-1"
+    mock_post.assert_called_once()
+    assert mock_post.call_args.args[0] == "/jobs"
+    assert adapter.requests["/openeo/1.2/"] == 1
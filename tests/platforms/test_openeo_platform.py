@@ -1,11 +1,14 @@
+import asyncio
 import datetime
 import json
+import threading
+import time
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import jwt
 import pytest
-import requests
 
 from app.config.schemas import AuthMethod, BackendAuthConfig
 from app.config.settings import settings
@@ -13,12 +16,14 @@ from app.error import AuthException
 from app.platforms.implementations.openeo import (
     OpenEOPlatform,
 )
+from app.platforms.udp_cache import UDPEntry
 from app.schemas.enum import OutputFormatEnum, ProcessingStatusEnum
 from app.schemas.parameters import ParamTypeEnum, Parameter
 from app.schemas.unit_job import ServiceDetails
 from stac_pydantic import Collection
 
 from openeo.rest import OpenEoApiError
+from openeo.rest.models.general import JobListingResponse
 
 
 class DummyOpenEOClient:
@@ -37,9 +42,15 @@ class DummyOpenEOClient:
 
 @pytest.fixture
 def platform():
+    OpenEOPlatform._resolved_services.clear()
+    OpenEOPlatform._connection_cache.clear()
     return OpenEOPlatform()
 
 
+def make_udp_entry(document: dict, revision: str = "v1") -> UDPEntry:
+    return UDPEntry(expires_at=0.0, etag=None, revision=revision, document=document)
+
+
 @pytest.fixture(autouse=True)
 def mock_env(monkeypatch):
     settings.backend_auth_config["https://openeo.dataspace.copernicus.eu"] = (
@@ -69,29 +80,37 @@ def test_get_client_credentials_success(platform):
     assert creds == ("cdse-provider123", "cdse-client123", "cdse-secret123")
 
 
-@patch("app.platforms.implementations.openeo.requests.get")
-def test_get_process_id_success(mock_get, platform):
-    mock_get.return_value.json.return_value = {"id": "process123"}
-    mock_get.return_value.raise_for_status.return_value = None
+@pytest.mark.asyncio
+@patch(
+    "app.platforms.implementations.openeo.udp_cache.get_entry", new_callable=AsyncMock
+)
+async def test_get_process_id_success(mock_get, platform):
+    mock_get.return_value = make_udp_entry({"id": "process123"})
 
-    process_id = platform._get_process_id("https://example.com/process.json")
+    process_id = await platform._get_process_id("https://example.com/process.json")
     assert process_id == "process123"
+    mock_get.assert_awaited_once_with("https://example.com/process.json")
 
 
-@patch("app.platforms.implementations.openeo.requests.get")
-def test_get_process_id_no_id(mock_get, platform):
-    mock_get.return_value.json.return_value = {}
-    mock_get.return_value.raise_for_status.return_value = None
+@pytest.mark.asyncio
+@patch(
+    "app.platforms.implementations.openeo.udp_cache.get_entry", new_callable=AsyncMock
+)
+async def test_get_process_id_no_id(mock_get, platform):
+    mock_get.return_value = make_udp_entry({})
 
     with pytest.raises(ValueError, match="No 'id' field"):
-        platform._get_process_id("https://example.com/process.json")
+        await platform._get_process_id("https://example.com/process.json")
 
 
-@patch("app.platforms.implementations.openeo.requests.get")
-def test_get_process_id_http_error(mock_get, platform):
-    mock_get.side_effect = requests.RequestException("Network error")
+@pytest.mark.asyncio
+@patch(
+    "app.platforms.implementations.openeo.udp_cache.get_entry", new_callable=AsyncMock
+)
+async def test_get_process_id_http_error(mock_get, platform):
+    mock_get.side_effect = httpx.ConnectError("Network error")
     with pytest.raises(ValueError, match="Failed to fetch process ID"):
-        platform._get_process_id("https://example.com/process.json")
+        await platform._get_process_id("https://example.com/process.json")
 
 
 @pytest.mark.asyncio
@@ -213,6 +232,37 @@ async def test_get_job_status_success(mock_connection, platform):
     assert result == ProcessingStatusEnum.RUNNING
 
 
+@pytest.mark.asyncio
+@patch.object(OpenEOPlatform, "_setup_connection", new_callable=AsyncMock)
+async def test_get_job_status_does_not_block_event_loop(mock_connection, platform):
+    threads = []
+
+    def status():
+        threads.append(threading.current_thread().name)
+        time.sleep(0.05)
+        return "running"
+
+    connection = MagicMock()
+    connection.job.return_value.status.side_effect = status
+    mock_connection.return_value = connection
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker = asyncio.create_task(tick())
+    details = ServiceDetails(endpoint="foo", application="bar")
+    result = await platform.get_job_status("foobar", "job123", details)
+    ticker.cancel()
+
+    assert result == ProcessingStatusEnum.RUNNING
+    assert threads[0].startswith("openeo")
+    assert ticks > 1
+
+
 @pytest.mark.asyncio
 @patch.object(OpenEOPlatform, "_setup_connection")
 async def test_get_job_status_error(mock_connection, platform):
@@ -297,6 +347,166 @@ async def test_get_job_status_non_auth_openeo_error_returns_unknown(
     assert result == ProcessingStatusEnum.UNKNOWN
 
 
+@pytest.mark.asyncio
+@patch.object(OpenEOPlatform, "_setup_connection", new_callable=AsyncMock)
+async def test_get_job_statuses_uses_single_job_listing(
+    mock_setup_connection, platform, monkeypatch
+):
+    monkeypatch.setattr(settings, "status_listing_threshold", 2)
+    connection = MagicMock()
+    connection.list_jobs.return_value = JobListingResponse(
+        {
+            "jobs": [
+                {"id": "job1", "status": "running"},
+                {"id": "job2", "status": "finished"},
+                {"id": "other", "status": "error"},
+            ],
+            "links": [{"rel": "next", "href": "https://foo/jobs?page=2"}],
+        }
+    )
+    mock_setup_connection.return_value = connection
+
+    details = ServiceDetails(endpoint="foo", application="bar")
+    result = await platform.get_job_statuses("foobar", ["job1", "job2"], details)
+
+    assert result == {
+        "job1": ProcessingStatusEnum.RUNNING,
+        "job2": ProcessingStatusEnum.FINISHED,
+    }
+    connection.list_jobs.assert_called_once_with(limit=settings.status_listing_limit)
+    # All jobs were found on the first page
+    connection.get.assert_not_called()
+    connection.job.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch.object(OpenEOPlatform, "_setup_connection", new_callable=AsyncMock)
+async def test_get_job_statuses_follows_job_listing_pages(
+    mock_setup_connection, platform, monkeypatch
+):
+    monkeypatch.setattr(settings, "status_listing_threshold", 2)
+    connection = MagicMock()
+    connection.list_jobs.return_value = JobListingResponse(
+        {
+            "jobs": [{"id": "job1", "status": "running"}],
+            "links": [{"rel": "next", "href": "https://foo/jobs?page=2"}],
+        }
+    )
+    connection.get.return_value.json.return_value = {
+        "jobs": [{"id": "job2", "status": "finished"}],
+        "links": [{"rel": "next", "href": "https://foo/jobs?page=3"}],
+    }
+    mock_setup_connection.return_value = connection
+
+    details = ServiceDetails(endpoint="foo", application="bar")
+    result = await platform.get_job_statuses("foobar", ["job1", "job2"], details)
+
+    assert result == {
+        "job1": ProcessingStatusEnum.RUNNING,
+        "job2": ProcessingStatusEnum.FINISHED,
+    }
+    connection.get.assert_called_once_with("https://foo/jobs?page=2", expected_status=200)
+    connection.job.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch.object(OpenEOPlatform, "_setup_connection", new_callable=AsyncMock)
+async def test_get_job_statuses_falls_back_for_missing_jobs(
+    mock_setup_connection, platform, monkeypatch
+):
+    monkeypatch.setattr(settings, "status_listing_threshold", 2)
+    job = MagicMock()
+    job.status.return_value = "queued"
+    connection = MagicMock()
+    connection.list_jobs.return_value = JobListingResponse(
+        {
+            "jobs": [{"id": "job1", "status": "running"}],
+            "links": [{"rel": "next", "href": "https://foo/jobs?page=2"}],
+        }
+    )
+    # The last page links back to itself, which does not lead to more requests
+    connection.get.return_value.json.return_value = {
+        "jobs": [],
+        "links": [{"rel": "next", "href": "https://foo/jobs?page=2"}],
+    }
+    connection.job.return_value = job
+    mock_setup_connection.return_value = connection
+
+    details = ServiceDetails(endpoint="foo", application="bar")
+    result = await platform.get_job_statuses("foobar", ["job1", "job2"], details)
+
+    assert result == {
+        "job1": ProcessingStatusEnum.RUNNING,
+        "job2": ProcessingStatusEnum.QUEUED,
+    }
+    connection.get.assert_called_once()
+    connection.job.assert_called_once_with("job2")
+
+
+@pytest.mark.asyncio
+@patch.object(OpenEOPlatform, "get_job_status", new_callable=AsyncMock)
+@patch.object(OpenEOPlatform, "_setup_connection", new_callable=AsyncMock)
+async def test_get_job_statuses_requests_few_jobs_separately(
+    mock_setup_connection, mock_get_job_status, platform
+):
+    mock_get_job_status.side_effect = [
+        ProcessingStatusEnum.RUNNING,
+        RuntimeError("Connection error"),
+    ]
+
+    details = ServiceDetails(endpoint="foo", application="bar")
+    result = await platform.get_job_statuses("foobar", ["job1", "job2"], details)
+
+    assert result == {"job1": ProcessingStatusEnum.RUNNING}
+    mock_setup_connection.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_job_statuses_shares_status_concurrency_between_users(
+    platform, monkeypatch
+):
+    monkeypatch.setattr(settings, "status_refresh_concurrency", 2)
+    running = 0
+    max_running = 0
+
+    async def get_job_status(user_token, job_id, details):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return ProcessingStatusEnum.RUNNING
+
+    monkeypatch.setattr(platform, "get_job_status", get_job_status)
+    details = ServiceDetails(endpoint="https://shared.example", application="bar")
+
+    results = await asyncio.gather(
+        *[
+            platform.get_job_statuses(user, ["job1", "job2"], details)
+            for user in ["user1", "user2", "user3"]
+        ]
+    )
+
+    assert all(len(result) == 2 for result in results)
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+@patch.object(OpenEOPlatform, "get_job_status", new_callable=AsyncMock)
+@patch.object(OpenEOPlatform, "_setup_connection", new_callable=AsyncMock)
+async def test_get_job_statuses_does_not_fall_back_when_listing_fails(
+    mock_setup_connection, mock_get_job_status, platform, monkeypatch
+):
+    monkeypatch.setattr(settings, "status_listing_threshold", 2)
+    mock_setup_connection.side_effect = RuntimeError("Connection error")
+
+    details = ServiceDetails(endpoint="foo", application="bar")
+    result = await platform.get_job_statuses("foobar", ["job1", "job2"], details)
+
+    assert result == {}
+    mock_get_job_status.assert_not_called()
+
+
 @pytest.mark.asyncio
 @patch.object(OpenEOPlatform, "_setup_connection")
 async def test_get_job_results_success(mock_connection, platform, fake_result):
@@ -344,19 +554,78 @@ async def test_get_job_results_openeo_error(mock_connection, platform, service_d
         await platform.get_job_results("foobar", "job123", details)
 
 
+@pytest.mark.asyncio
+@patch.object(OpenEOPlatform, "_setup_connection", new_callable=AsyncMock)
+async def test_cancel_job_stops_job(mock_setup_connection, platform, service_details):
+    connection = MagicMock()
+    mock_setup_connection.return_value = connection
+
+    await platform.cancel_job("foobar", "job123", service_details)
+
+    connection.job.assert_called_once_with("job123")
+    connection.job.return_value.stop_job.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+@patch.object(OpenEOPlatform, "_refresh_connection", new_callable=AsyncMock)
+@patch.object(OpenEOPlatform, "_setup_connection", new_callable=AsyncMock)
+async def test_cancel_job_retries_after_auth_error(
+    mock_setup_connection, mock_refresh_connection, platform, service_details
+):
+    connection = MagicMock()
+    connection.job.return_value.stop_job.side_effect = [
+        OpenEoApiError(message="Woops", code="Test", http_status_code=401),
+        None,
+    ]
+    mock_setup_connection.return_value = connection
+
+    await platform.cancel_job("foobar", "job123", service_details)
+
+    assert connection.job.return_value.stop_job.call_count == 2
+    mock_refresh_connection.assert_awaited_once_with("foobar", service_details.endpoint)
+
+
+@pytest.mark.asyncio
+@patch.object(OpenEOPlatform, "cancel_job", new_callable=AsyncMock)
+async def test_cancel_jobs_limits_concurrency(
+    mock_cancel_job, platform, service_details, monkeypatch
+):
+    monkeypatch.setattr(settings, "cancel_concurrency", 2)
+    running = 0
+    max_running = 0
+
+    async def cancel_job(user_token, job_id, details):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if job_id == "job3":
+            raise RuntimeError("Connection error")
+
+    mock_cancel_job.side_effect = cancel_job
+
+    result = await platform.cancel_jobs(
+        "foobar", ["job1", "job2", "job3", "job4"], service_details
+    )
+
+    assert result == ["job1", "job2", "job4"]
+    assert max_running == 2
+
+
 def _make_conn_with_token(token: str):
     # openeo.Connection-like object with auth.bearer that the implementation splits on '/'
     return SimpleNamespace(auth=SimpleNamespace(bearer=f"prefix/{token}"))
 
 
-def test_connection_expired_no_exp(platform):
+def test_connection_expiry_no_exp(platform):
     # token with no 'exp' claim
     token = jwt.encode({"sub": "user"}, "secret", algorithm="HS256")
     conn = _make_conn_with_token(token)
-    assert platform._connection_expired(conn) is True
+    assert platform._get_connection_expiry(conn) is None
 
 
-def test_connection_expired_future_exp(platform):
+def test_connection_expiry_before_token_expiry(platform):
     exp = int(
         (
             datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
@@ -364,27 +633,16 @@ def test_connection_expired_future_exp(platform):
     )
     token = jwt.encode({"sub": "user", "exp": exp}, "secret", algorithm="HS256")
     conn = _make_conn_with_token(token)
-    assert platform._connection_expired(conn) is False
-
-
-def test_connection_expired_past_exp(platform):
-    exp = int(
-        (
-            datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=1)
-        ).timestamp()
-    )
-    token = jwt.encode({"sub": "user", "exp": exp}, "secret", algorithm="HS256")
-    conn = _make_conn_with_token(token)
-    assert platform._connection_expired(conn) is True
+    assert platform._get_connection_expiry(conn) == exp - platform._token_expiry_buffer_seconds
 
 
-def test_connection_expired_no_bearer(platform):
+def test_connection_expiry_no_bearer(platform):
     conn = SimpleNamespace(auth=SimpleNamespace(bearer=""))
-    assert platform._connection_expired(conn) is True
+    assert platform._get_connection_expiry(conn) is None
 
 
 @patch("app.platforms.implementations.openeo.jwt.decode")
-def test_connection_expired_exception(mock_decode, platform):
+def test_connection_expiry_exception(mock_decode, platform):
     mock_decode.side_effect = jwt.DecodeError("Invalid token")
     exp = int(
         (
@@ -393,7 +651,7 @@ def test_connection_expired_exception(mock_decode, platform):
     )
     token = jwt.encode({"sub": "user", "exp": exp}, "secret", algorithm="HS256")
     conn = _make_conn_with_token(token)
-    assert platform._connection_expired(conn) is True
+    assert platform._get_connection_expiry(conn) is None
 
 
 @pytest.mark.asyncio
@@ -552,10 +810,13 @@ async def test_authenticate_user_config_format_issue_credentials(
 
 
 @pytest.mark.asyncio
-@patch("app.platforms.implementations.openeo.openeo.connect")
+@patch.object(OpenEOPlatform, "_get_connection_expiry")
+@patch("app.platforms.implementations.openeo.CachedMetadataConnection")
 @patch.object(OpenEOPlatform, "_authenticate_user", new_callable=AsyncMock)
-async def test_setup_connection_creates_and_caches(mock_auth, mock_connect, platform):
-    platform._connection_cache = {}
+async def test_setup_connection_creates_and_caches(
+    mock_auth, mock_connect, mock_expiry, platform
+):
+    mock_expiry.return_value = time.time() + 3600
     mock_conn = MagicMock()
     mock_connect.return_value = mock_conn
     mock_auth.return_value = mock_conn
@@ -567,44 +828,42 @@ async def test_setup_connection_creates_and_caches(mock_auth, mock_connect, plat
     mock_auth.assert_awaited_once_with("user-token", url, mock_conn)
     assert conn is mock_conn
     cache_key = platform._build_connection_cache_key("user-token", url)
-    assert platform._connection_cache[cache_key] is mock_conn
+    assert platform._connection_cache.get(cache_key) is mock_conn
 
 
 @pytest.mark.asyncio
-@patch.object(OpenEOPlatform, "_connection_expired", return_value=False)
-@patch("app.platforms.implementations.openeo.openeo.connect")
+@patch("app.platforms.implementations.openeo.CachedMetadataConnection")
 @patch.object(OpenEOPlatform, "_authenticate_user", new_callable=AsyncMock)
 async def test_setup_connection_uses_cache_if_not_expired(
-    mock_auth, mock_connect, mock_expired, platform
+    mock_auth, mock_connect, platform
 ):
-    platform._connection_cache = {}
     url = "https://example.backend"
     cached_conn = MagicMock()
     cache_key = platform._build_connection_cache_key("user-token", url)
-    platform._connection_cache[cache_key] = cached_conn
+    platform._connection_cache.put(cache_key, cached_conn, time.time() + 3600)
 
     conn = await platform._setup_connection("user-token", url)
 
     # cache used, no new connect or authenticate calls
     assert conn is cached_conn
-    mock_expired.assert_called_once_with(cached_conn)
+    assert platform._connection_cache.hits == 1
     mock_connect.assert_not_called()
     mock_auth.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-@patch.object(OpenEOPlatform, "_connection_expired", return_value=True)
-@patch("app.platforms.implementations.openeo.openeo.connect")
+@patch.object(OpenEOPlatform, "_get_connection_expiry")
+@patch("app.platforms.implementations.openeo.CachedMetadataConnection")
 @patch.object(OpenEOPlatform, "_authenticate_user", new_callable=AsyncMock)
 async def test_setup_connection_recreates_if_expired(
-    mock_auth, mock_connect, mock_expired, platform
+    mock_auth, mock_connect, mock_expiry, platform
 ):
-    platform._connection_cache = {}
+    mock_expiry.return_value = time.time() + 3600
     url = "https://example.backend"
     old_conn = MagicMock()
     new_conn = MagicMock()
     cache_key = platform._build_connection_cache_key("user-token", url)
-    platform._connection_cache[cache_key] = old_conn
+    platform._connection_cache.put(cache_key, old_conn, time.time() - 1)
 
     mock_connect.return_value = new_conn
     mock_auth.return_value = new_conn
@@ -614,21 +873,22 @@ async def test_setup_connection_recreates_if_expired(
     mock_connect.assert_called_once_with(url)
     mock_auth.assert_awaited_once_with("user-token", url, new_conn)
     assert conn is new_conn
-    assert platform._connection_cache[cache_key] is new_conn
+    assert platform._connection_cache.get(cache_key) is new_conn
 
 
 @pytest.mark.asyncio
-@patch("app.platforms.implementations.openeo.openeo.connect")
+@patch.object(OpenEOPlatform, "_get_connection_expiry")
+@patch("app.platforms.implementations.openeo.CachedMetadataConnection")
 @patch.object(OpenEOPlatform, "_authenticate_user", new_callable=AsyncMock)
 async def test_setup_connection_force_refresh_bypasses_cache(
-    mock_auth, mock_connect, platform
+    mock_auth, mock_connect, mock_expiry, platform
 ):
-    platform._connection_cache = {}
+    mock_expiry.return_value = time.time() + 3600
     url = "https://example.backend"
     old_conn = MagicMock()
     new_conn = MagicMock()
     cache_key = platform._build_connection_cache_key("user-token", url)
-    platform._connection_cache[cache_key] = old_conn
+    platform._connection_cache.put(cache_key, old_conn, time.time() + 3600)
 
     mock_connect.return_value = new_conn
     mock_auth.return_value = new_conn
@@ -638,16 +898,15 @@ async def test_setup_connection_force_refresh_bypasses_cache(
     mock_connect.assert_called_once_with(url)
     mock_auth.assert_awaited_once_with("user-token", url, new_conn)
     assert conn is new_conn
-    assert platform._connection_cache[cache_key] is new_conn
+    assert platform._connection_cache.get(cache_key) is new_conn
 
 
 @pytest.mark.asyncio
-@patch("app.platforms.implementations.openeo.openeo.connect")
+@patch("app.platforms.implementations.openeo.CachedMetadataConnection")
 @patch.object(OpenEOPlatform, "_authenticate_user", new_callable=AsyncMock)
 async def test_setup_connection_propagates_auth_error(
     mock_auth, mock_connect, platform
 ):
-    platform._connection_cache = {}
     url = "https://example.backend"
     mock_conn = MagicMock()
     mock_connect.return_value = mock_conn
@@ -661,6 +920,48 @@ async def test_setup_connection_propagates_auth_error(
     assert cache_key not in platform._connection_cache
 
 
+@pytest.mark.asyncio
+@patch("app.platforms.implementations.openeo.CachedMetadataConnection")
+@patch.object(OpenEOPlatform, "_authenticate_user", new_callable=AsyncMock)
+async def test_setup_connection_authenticates_once_for_concurrent_requests(
+    mock_auth, mock_connect, platform
+):
+    exp = int(time.time()) + 3600
+    token = jwt.encode({"sub": "user", "exp": exp}, "secret", algorithm="HS256")
+    mock_conn = _make_conn_with_token(token)
+    mock_connect.return_value = mock_conn
+
+    async def authenticate(user_token, url, connection):
+        await asyncio.sleep(0.01)
+        return connection
+
+    mock_auth.side_effect = authenticate
+
+    connections = await asyncio.gather(
+        *[platform._setup_connection("user-token", "https://example.backend") for _ in range(5)]
+    )
+
+    assert all(conn is mock_conn for conn in connections)
+    mock_connect.assert_called_once()
+    mock_auth.assert_awaited_once()
+    assert platform._connection_cache.stats()["hits"] == 4
+
+
+@pytest.mark.asyncio
+@patch("app.platforms.implementations.openeo.CachedMetadataConnection")
+@patch.object(OpenEOPlatform, "_authenticate_user", new_callable=AsyncMock)
+async def test_setup_connection_does_not_cache_connection_without_expiry(
+    mock_auth, mock_connect, platform
+):
+    mock_conn = _make_conn_with_token("")
+    mock_connect.return_value = mock_conn
+    mock_auth.return_value = mock_conn
+
+    await platform._setup_connection("user-token", "https://example.backend")
+
+    assert len(platform._connection_cache) == 0
+
+
 @pytest.mark.asyncio
 @patch.object(OpenEOPlatform, "_setup_connection")
 @patch.object(OpenEOPlatform, "_get_process_id", return_value="process123")
@@ -821,7 +1122,9 @@ async def test_execute_sync_job_error(
 
 
 @pytest.mark.asyncio
-@patch("app.platforms.implementations.openeo.requests.get")
+@patch(
+    "app.platforms.implementations.openeo.udp_cache.get_entry", new_callable=AsyncMock
+)
 async def test_get_parameters_success(mock_udp_request, platform):
 
     udp_params = [
@@ -873,11 +1176,9 @@ async def test_get_parameters_success(mock_udp_request, platform):
             "schema": {"type": "string", "enum": ["option1", "option2"]},
         },
     ]
-    mock_udp_request.return_value.json.return_value = {
-        "id": "process123",
-        "parameters": udp_params,
-    }
-    mock_udp_request.return_value.raise_for_status.return_value = None
+    mock_udp_request.return_value = make_udp_entry(
+        {"id": "process123", "parameters": udp_params}
+    )
     result = await platform.get_service_parameters(
         user_token="fake_token",
         details=ServiceDetails(
@@ -955,20 +1256,23 @@ async def test_get_parameters_success(mock_udp_request, platform):
 
 
 @pytest.mark.asyncio
-@patch("app.platforms.implementations.openeo.requests.get")
+@patch(
+    "app.platforms.implementations.openeo.udp_cache.get_entry", new_callable=AsyncMock
+)
 async def test_get_parameters_unsupported_type(mock_udp_request, platform):
 
-    mock_udp_request.return_value.json.return_value = {
-        "id": "process123",
-        "parameters": [
-            {
-                "name": "foobar_test",
-                "description": "Test for a foobar parameter",
-                "schema": {"type": "foobar"},
-            }
-        ],
-    }
-    mock_udp_request.return_value.raise_for_status.return_value = None
+    mock_udp_request.return_value = make_udp_entry(
+        {
+            "id": "process123",
+            "parameters": [
+                {
+                    "name": "foobar_test",
+                    "description": "Test for a foobar parameter",
+                    "schema": {"type": "foobar"},
+                }
+            ],
+        }
+    )
 
     with pytest.raises(ValueError, match="Unsupported parameter schemas"):
         await platform.get_service_parameters(
@@ -980,6 +1284,61 @@ async def test_get_parameters_unsupported_type(mock_udp_request, platform):
         )
 
 
+@pytest.mark.asyncio
+@patch(
+    "app.platforms.implementations.openeo.udp_cache.get_entry", new_callable=AsyncMock
+)
+async def test_get_process_id_does_not_parse_parameters(mock_get_entry, platform):
+    mock_get_entry.return_value = make_udp_entry(
+        {
+            "id": "process123",
+            "parameters": [{"name": "foobar", "schema": {"type": "foobar"}}],
+        }
+    )
+
+    process_id = await platform._get_process_id("https://example.com/process.json")
+
+    assert process_id == "process123"
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.platforms.implementations.openeo.udp_cache.get_entry", new_callable=AsyncMock
+)
+async def test_resolve_service_once_per_revision(mock_get_entry, platform, service_details):
+    udp = {
+        "id": "process123",
+        "parameters": [
+            {"name": "flag", "description": "Flag", "schema": {"type": "boolean"}}
+        ],
+    }
+    mock_get_entry.return_value = make_udp_entry(udp)
+
+    with patch.object(
+        OpenEOPlatform,
+        "_parse_service_parameters",
+        wraps=platform._parse_service_parameters,
+    ) as mock_parse:
+        parameters = await platform.get_service_parameters("fake_token", service_details)
+        process_id = await platform._get_process_id(service_details.application)
+        assert await platform.get_service_parameters("fake_token", service_details) is (
+            parameters
+        )
+        assert mock_parse.call_count == 1
+
+        mock_get_entry.return_value = make_udp_entry(
+            {**udp, "id": "process456"}, revision="v2"
+        )
+        new_process_id = await platform._get_process_id(service_details.application)
+        new_parameters = await platform.get_service_parameters("fake_token", service_details)
+        assert mock_parse.call_count == 2
+        assert new_parameters is not parameters
+
+    assert [parameter.name for parameter in parameters] == ["flag"]
+    assert process_id == "process123"
+    assert new_process_id == "process456"
+
+
 @pytest.mark.asyncio
 @patch.object(OpenEOPlatform, "get_service_parameters", new_callable=AsyncMock)
 async def test_transform_parameters_bbox_polygon_to_bbox(
@@ -0,0 +1,147 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.platforms.udp_cache import UDPCache
+
+UDP_URL = "https://example.com/process.json"
+
+
+def make_cache(handler, max_size=10, ttl=60.0) -> UDPCache:
+    cache = UDPCache(max_size=max_size, ttl=ttl)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def get_client():
+        return client
+
+    cache._get_client = get_client
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_get_downloads_document_once():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"id": "process123"})
+
+    cache = make_cache(handler)
+
+    assert await cache.get(UDP_URL) == {"id": "process123"}
+    assert await cache.get(UDP_URL) == {"id": "process123"}
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_coalesces_concurrent_downloads():
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"id": "process123"})
+
+    cache = make_cache(handler)
+
+    documents = await asyncio.gather(*[cache.get(UDP_URL) for _ in range(5)])
+
+    assert documents == [{"id": "process123"}] * 5
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_revalidates_expired_document_with_etag():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"id": "process123"}, headers={"ETag": '"v1"'})
+
+    cache = make_cache(handler, ttl=0.0)
+
+    first = await cache.get(UDP_URL)
+    second = await cache.get(UDP_URL)
+
+    assert second is first
+    assert len(requests) == 2
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_get_evicts_least_recently_used_document():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"id": request.url.path})
+
+    cache = make_cache(handler, max_size=2)
+
+    await cache.get("https://example.com/a.json")
+    await cache.get("https://example.com/b.json")
+    await cache.get("https://example.com/a.json")
+    await cache.get("https://example.com/c.json")
+
+    assert list(cache._entries) == [
+        "https://example.com/a.json",
+        "https://example.com/c.json",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_does_not_cache_failed_download():
+    responses = [httpx.Response(503), httpx.Response(200, json={"id": "process123"})]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return responses.pop(0)
+
+    cache = make_cache(handler)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get(UDP_URL)
+    assert await cache.get(UDP_URL) == {"id": "process123"}
+
+
+@pytest.mark.asyncio
+async def test_get_rejects_non_object_document():
+    cache = make_cache(lambda request: httpx.Response(200, json=["process123"]))
+
+    with pytest.raises(ValueError, match="not a JSON object"):
+        await cache.get(UDP_URL)
+
+
+@pytest.mark.asyncio
+async def test_get_entry_revision():
+    etags = ['"v1"', None]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        etag = etags.pop(0)
+        headers = {"ETag": etag} if etag else {}
+        return httpx.Response(200, json={"id": "process123"}, headers=headers)
+
+    cache = make_cache(handler, ttl=0.0)
+
+    assert (await cache.get_entry(UDP_URL)).revision == '"v1"'
+    assert len((await cache.get_entry(UDP_URL)).revision) == 64
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_client():
+    cache = UDPCache(max_size=10, ttl=60.0)
+    client = await cache._get_client()
+
+    await cache.aclose()
+
+    assert client.is_closed
+    assert await cache._get_client() is not client
+
+
+def test_get_client_closes_client_of_previous_event_loop():
+    cache = UDPCache(max_size=10, ttl=60.0)
+    first = asyncio.run(cache._get_client())
+    second = asyncio.run(cache._get_client())
+
+    assert first.is_closed
+    assert second is not first
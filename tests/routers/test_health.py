@@ -1,5 +1,7 @@
 from unittest.mock import patch
 
+from app.schemas.submission import SubmissionQueueMetrics
+
 
 @patch("app.routers.health.check_db_status")
 def test_health_ok(mock_db_status, client):
@@ -19,3 +21,14 @@ def test_health_db_error(mock_db_status, client):
     r = client.get("/health")
     assert r.status_code == 503
     assert r.json() == {"status": "error", "database": db_status}
+
+
+@patch("app.routers.health.get_submission_queue_metrics")
+def test_health_submissions(mock_metrics, client):
+    mock_metrics.return_value = [
+        SubmissionQueueMetrics(priority="interactive", depth=1, users=1, max_wait=2.5),
+        SubmissionQueueMetrics(priority="batch", depth=0, users=0, max_wait=0.0),
+    ]
+    r = client.get("/health/submissions")
+    assert r.status_code == 200
+    assert r.json() == [metrics.model_dump() for metrics in mock_metrics.return_value]
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, patch
 from fastapi import WebSocketDisconnect
 import pytest
 
+from app.schemas.enum import ProcessingStatusEnum
 from app.schemas.jobs_status import JobsStatusResponse
 
 
@@ -71,13 +72,16 @@ def test_unit_jobs_get_only_upscaling_200(
 
 
 @pytest.mark.asyncio
+@patch("app.routers.jobs_status.get_current_user_id")
 @patch("app.routers.jobs_status.get_jobs_status", new_callable=AsyncMock)
 async def test_ws_jobs_status(
     mock_get_jobs_status,
+    mock_get_user_id,
     client,
     fake_processing_job_summary,
     fake_upscaling_task_summary,
 ):
+    mock_get_user_id.return_value = "foobar"
     mock_get_jobs_status.return_value = JobsStatusResponse(
         upscaling_tasks=[fake_upscaling_task_summary],
         processing_jobs=[fake_processing_job_summary],
@@ -94,8 +98,12 @@ async def test_ws_jobs_status(
 
 
 @pytest.mark.asyncio
+@patch("app.routers.jobs_status.get_current_user_id")
 @patch("app.routers.jobs_status.get_jobs_status", new_callable=AsyncMock)
-async def test_ws_jobs_status_closes_on_error(mock_get_jobs_status, client):
+async def test_ws_jobs_status_closes_on_error(
+    mock_get_jobs_status, mock_get_user_id, client
+):
+    mock_get_user_id.return_value = "foobar"
     mock_get_jobs_status.side_effect = RuntimeError("Database connection lost")
 
     with client.websocket_connect("/ws/jobs_status?token=123") as websocket:
@@ -106,3 +114,42 @@ async def test_ws_jobs_status_closes_on_error(mock_get_jobs_status, client):
             websocket.receive_json()
 
         assert exc_info.value.code == 1011
+
+
+@pytest.mark.asyncio
+@patch("app.routers.jobs_status.get_current_user_id")
+@patch("app.routers.jobs_status.get_jobs_status", new_callable=AsyncMock)
+async def test_ws_jobs_status_sends_deltas(
+    mock_get_jobs_status,
+    mock_get_user_id,
+    client,
+    fake_processing_job_summary,
+):
+    mock_get_user_id.return_value = "foobar"
+    finished_job = fake_processing_job_summary.model_copy(
+        update={"status": ProcessingStatusEnum.FINISHED}
+    )
+    mock_get_jobs_status.side_effect = [
+        JobsStatusResponse(
+            upscaling_tasks=[], processing_jobs=[fake_processing_job_summary]
+        ),
+        JobsStatusResponse(upscaling_tasks=[], processing_jobs=[finished_job]),
+    ]
+
+    with client.websocket_connect(
+        "/ws/jobs_status?interval=0&delta=true&token=123"
+    ) as websocket:
+        assert websocket.receive_json()["type"] == "init"
+        snapshot = websocket.receive_json()
+        delta = websocket.receive_json()
+
+    assert snapshot["type"] == "status"
+    assert snapshot["sequence"] == 1
+    assert delta["type"] == "delta"
+    assert delta["sequence"] == 2
+    assert delta["data"] == {
+        "processing_jobs": {
+            "updated": [json.loads(finished_job.model_dump_json())],
+            "removed": [],
+        }
+    }
@@ -1,5 +1,6 @@
 from unittest.mock import patch
 import pytest
+from app.config.settings import settings
 from app.schemas.tiles import GridTypeEnum
 from fastapi import status
 
@@ -25,6 +26,14 @@ def test_split_in_tiles_success(client, dummy_payload):
     assert data["type"] == "GeometryCollection"
 
 
+def test_split_in_tiles_too_many_tiles_400(client, dummy_payload, monkeypatch):
+    monkeypatch.setattr(settings, "max_grid_tiles", 10)
+    response = client.post("/tiles", json=dummy_payload)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["error_code"] == "TILE_LIMIT_EXCEEDED"
+    assert response.json()["details"] == {"max_tiles": 10}
+
+
 @patch("app.routers.tiles.split_polygon_by_grid")
 def test_split_in_tiles_unknown_grid(mock_split, client, dummy_payload):
     mock_split.side_effect = ValueError("Unknown grid: INVALID_GRID")
@@ -1,17 +1,18 @@
+import asyncio
 import json
 from unittest.mock import AsyncMock, patch
 
 from fastapi import WebSocketDisconnect, status
 import pytest
 
-from app.error import InternalException
+from app.error import InternalException, TaskConflictException
 
 
-@patch("app.routers.upscale_tasks.create_upscaling_processing_jobs")
+@patch("app.routers.upscale_tasks.queue_upscaling_processing_jobs")
 @patch("app.routers.upscale_tasks.create_upscaling_task")
 def test_upscaling_task_create_201(
     mock_create_upscaling_task,
-    mock_create_processing_jobs,
+    mock_queue_processing_jobs,
     client,
     fake_upscaling_task_request,
     fake_upscaling_task_summary,
@@ -22,7 +23,182 @@ def test_upscaling_task_create_201(
     r = client.post("/upscale_tasks", json=fake_upscaling_task_request.model_dump())
     assert r.status_code == status.HTTP_201_CREATED
     assert r.json() == fake_upscaling_task_summary.model_dump()
-    mock_create_processing_jobs.assert_called_once()
+    mock_queue_processing_jobs.assert_called_once()
+
+
+@patch("app.routers.upscale_tasks.queue_upscaling_processing_jobs")
+@patch("app.routers.upscale_tasks.create_upscaling_task")
+def test_upscaling_task_create_queues_jobs_outside_event_loop(
+    mock_create_upscaling_task,
+    mock_queue_processing_jobs,
+    client,
+    fake_upscaling_task_request,
+    fake_upscaling_task_summary,
+):
+    def queue(*args):
+        # Raises when called from the thread of the event loop
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        return 2
+
+    mock_create_upscaling_task.return_value = fake_upscaling_task_summary
+    mock_queue_processing_jobs.side_effect = queue
+
+    r = client.post("/upscale_tasks", json=fake_upscaling_task_request.model_dump())
+    assert r.status_code == status.HTTP_201_CREATED
+    mock_queue_processing_jobs.assert_called_once()
+
+
+@patch("app.routers.upscale_tasks.cancel_upscaling_task", new_callable=AsyncMock)
+@patch("app.routers.upscale_tasks.queue_upscaling_processing_jobs")
+@patch("app.routers.upscale_tasks.create_upscaling_task")
+def test_upscaling_task_create_cancels_incomplete_task(
+    mock_create_upscaling_task,
+    mock_queue_processing_jobs,
+    mock_cancel_upscaling_task,
+    client,
+    fake_upscaling_task_request,
+    fake_upscaling_task_summary,
+):
+    mock_create_upscaling_task.return_value = fake_upscaling_task_summary
+    mock_queue_processing_jobs.side_effect = SystemError("Database connection lost")
+
+    r = client.post("/upscale_tasks", json=fake_upscaling_task_request.model_dump())
+    assert r.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert r.json()["details"]["task_id"] == fake_upscaling_task_summary.id
+    assert mock_cancel_upscaling_task.call_args.args[2] == fake_upscaling_task_summary.id
+
+
+def _ndjson(*lines) -> str:
+    return "".join(f"{json.dumps(line)}\n" for line in lines)
+
+
+@patch("app.routers.upscale_tasks.queue_streamed_upscaling_processing_jobs")
+@patch("app.routers.upscale_tasks.create_upscaling_task")
+def test_streamed_upscaling_task_create_201(
+    mock_create_upscaling_task,
+    mock_queue_processing_jobs,
+    client,
+    fake_upscaling_task_request,
+    fake_upscaling_task_summary,
+):
+    received = []
+
+    async def consume(token, db, payload, values, task_id, credential):
+        received.extend([value async for value in values])
+        return len(received)
+
+    mock_create_upscaling_task.return_value = fake_upscaling_task_summary
+    mock_queue_processing_jobs.side_effect = consume
+    header = fake_upscaling_task_request.model_dump(mode="json")
+    header["dimension"] = {"name": "spatial_extent"}
+    values = [{"type": "Point", "coordinates": [idx, idx]} for idx in range(3)]
+
+    r = client.post(
+        "/upscale_tasks/stream",
+        content=_ndjson(header, *values) + "\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert r.status_code == status.HTTP_201_CREATED
+    assert r.json() == fake_upscaling_task_summary.model_dump()
+    payload = mock_create_upscaling_task.call_args.args[2]
+    assert payload.dimension.name == "spatial_extent"
+    assert received == values
+
+
+@patch("app.routers.upscale_tasks.create_upscaling_task")
+def test_streamed_upscaling_task_invalid_header_422(
+    mock_create_upscaling_task,
+    client,
+):
+    r = client.post(
+        "/upscale_tasks/stream",
+        content=_ndjson({"title": "Missing fields"}, [1]),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert r.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert r.json()["error_code"] == "VALIDATION_ERROR"
+    mock_create_upscaling_task.assert_not_called()
+
+
+@patch("app.routers.upscale_tasks.create_upscaling_task")
+def test_streamed_upscaling_task_unsupported_media_type_415(
+    mock_create_upscaling_task,
+    client,
+    fake_upscaling_task_request,
+):
+    header = fake_upscaling_task_request.model_dump(mode="json")
+    header["dimension"] = {"name": "spatial_extent"}
+
+    r = client.post(
+        "/upscale_tasks/stream",
+        content=_ndjson(header, 1),
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert r.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    assert r.json()["error_code"] == "UNSUPPORTED_MEDIA_TYPE"
+    mock_create_upscaling_task.assert_not_called()
+
+
+@patch("app.routers.upscale_tasks.cancel_upscaling_task", new_callable=AsyncMock)
+@patch("app.routers.upscale_tasks.queue_streamed_upscaling_processing_jobs")
+@patch("app.routers.upscale_tasks.create_upscaling_task")
+def test_streamed_upscaling_task_invalid_value_422(
+    mock_create_upscaling_task,
+    mock_queue_processing_jobs,
+    mock_cancel_upscaling_task,
+    client,
+    fake_upscaling_task_request,
+    fake_upscaling_task_summary,
+):
+    async def consume(token, db, payload, values, task_id, credential):
+        return len([value async for value in values])
+
+    mock_create_upscaling_task.return_value = fake_upscaling_task_summary
+    mock_queue_processing_jobs.side_effect = consume
+    header = fake_upscaling_task_request.model_dump(mode="json")
+    header["dimension"] = {"name": "spatial_extent"}
+
+    r = client.post(
+        "/upscale_tasks/stream",
+        content=_ndjson(header, 1) + "{not json\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert r.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert r.json()["details"]["errors"][0]["loc"] == ["body", 3]
+    # The jobs that were queued before the invalid line do not run as a partial task
+    assert mock_cancel_upscaling_task.call_args.args[2] == fake_upscaling_task_summary.id
+
+
+@patch("app.routers.upscale_tasks.cancel_upscaling_task", new_callable=AsyncMock)
+@patch("app.routers.upscale_tasks.queue_streamed_upscaling_processing_jobs")
+@patch("app.routers.upscale_tasks.create_upscaling_task")
+def test_streamed_upscaling_task_interrupted_500(
+    mock_create_upscaling_task,
+    mock_queue_processing_jobs,
+    mock_cancel_upscaling_task,
+    client,
+    fake_upscaling_task_request,
+    fake_upscaling_task_summary,
+):
+    mock_create_upscaling_task.return_value = fake_upscaling_task_summary
+    mock_queue_processing_jobs.side_effect = RuntimeError("Client disconnected")
+    header = fake_upscaling_task_request.model_dump(mode="json")
+    header["dimension"] = {"name": "spatial_extent"}
+
+    r = client.post(
+        "/upscale_tasks/stream",
+        content=_ndjson(header, 1),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert r.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert r.json()["details"]["task_id"] == fake_upscaling_task_summary.id
+    assert mock_cancel_upscaling_task.call_args.args[2] == fake_upscaling_task_summary.id
 
 
 @patch("app.routers.upscale_tasks.create_upscaling_task")
@@ -104,8 +280,79 @@ def test_upscaling_task_get_task_internal_error(mock_get_upscale_task, client):
     assert error.message in r.json().get("message", "")
 
 
+@patch("app.routers.upscale_tasks.resume_upscaling_task")
+def test_upscaling_task_resume_200(
+    mock_resume_upscaling_task,
+    client,
+    fake_upscaling_task_request,
+    fake_upscaling_task_summary,
+    fake_submission_credential,
+):
+
+    mock_resume_upscaling_task.return_value = fake_upscaling_task_summary
+
+    r = client.post(
+        "/upscale_tasks/1/resume", json=fake_upscaling_task_request.model_dump()
+    )
+    assert r.status_code == status.HTTP_200_OK
+    assert r.json() == fake_upscaling_task_summary.model_dump()
+    assert mock_resume_upscaling_task.call_args.args[2:] == (
+        1,
+        fake_upscaling_task_request,
+        fake_submission_credential,
+    )
+
+
+@patch("app.routers.upscale_tasks.resume_upscaling_task")
+def test_upscaling_task_resume_404(
+    mock_resume_upscaling_task, client, fake_upscaling_task_request
+):
+
+    mock_resume_upscaling_task.return_value = None
+
+    r = client.post(
+        "/upscale_tasks/1/resume", json=fake_upscaling_task_request.model_dump()
+    )
+    assert r.status_code == status.HTTP_404_NOT_FOUND
+
+
+@patch("app.routers.upscale_tasks.resume_upscaling_task")
+def test_upscaling_task_resume_409(
+    mock_resume_upscaling_task, client, fake_upscaling_task_request
+):
+
+    mock_resume_upscaling_task.side_effect = TaskConflictException()
+
+    r = client.post(
+        "/upscale_tasks/1/resume", json=fake_upscaling_task_request.model_dump()
+    )
+    assert r.status_code == status.HTTP_409_CONFLICT
+    assert r.json().get("error_code") == "TASK_CONFLICT"
+
+
+@patch("app.routers.upscale_tasks.cancel_upscaling_task", new_callable=AsyncMock)
+def test_upscaling_task_cancel_200(
+    mock_cancel_upscaling_task, client, fake_upscaling_task_summary
+):
+
+    mock_cancel_upscaling_task.return_value = fake_upscaling_task_summary
+
+    r = client.post("/upscale_tasks/1/cancel")
+    assert r.status_code == status.HTTP_200_OK
+    assert r.json() == fake_upscaling_task_summary.model_dump()
+
+
+@patch("app.routers.upscale_tasks.cancel_upscaling_task", new_callable=AsyncMock)
+def test_upscaling_task_cancel_404(mock_cancel_upscaling_task, client):
+
+    mock_cancel_upscaling_task.return_value = None
+
+    r = client.post("/upscale_tasks/1/cancel")
+    assert r.status_code == status.HTTP_404_NOT_FOUND
+
+
 @pytest.mark.asyncio
-@patch("app.auth.get_current_user_id", new_callable=AsyncMock)
+@patch("app.routers.upscale_tasks.get_current_user_id")
 @patch("app.routers.upscale_tasks.get_upscale_task", new_callable=AsyncMock)
 async def test_ws_jobs_status(
     mock_get_task_status, mock_get_user_id, client, fake_upscaling_task
@@ -123,7 +370,25 @@ async def test_ws_jobs_status(
 
 
 @pytest.mark.asyncio
-@patch("app.auth.get_current_user_id", new_callable=AsyncMock)
+@patch("app.routers.upscale_tasks.get_current_user_id")
+@patch("app.routers.upscale_tasks.get_upscale_task", new_callable=AsyncMock)
+async def test_ws_jobs_status_delta_skips_loading_messages(
+    mock_get_task_status, mock_get_user_id, client, fake_upscaling_task
+):
+    mock_get_user_id.return_value = "foobar"
+    mock_get_task_status.return_value = fake_upscaling_task
+
+    with client.websocket_connect(
+        "/ws/upscale_tasks/1?interval=1&delta=true&token=123"
+    ) as websocket:
+        assert websocket.receive_json()["type"] == "init"
+        data = websocket.receive_json()
+        assert data["type"] == "status"
+        assert data["data"] == json.loads(fake_upscaling_task.model_dump_json())
+
+
+@pytest.mark.asyncio
+@patch("app.routers.upscale_tasks.get_current_user_id")
 @patch("app.routers.upscale_tasks.get_upscale_task", new_callable=AsyncMock)
 async def test_ws_jobs_status_closes_on_error(
     mock_get_task_status, mock_get_user_id, client
@@ -142,7 +407,7 @@ async def test_ws_jobs_status_closes_on_error(
 
 
 @pytest.mark.asyncio
-@patch("app.auth.get_current_user_id", new_callable=AsyncMock)
+@patch("app.routers.upscale_tasks.get_current_user_id")
 @patch("app.routers.upscale_tasks.get_upscale_task", new_callable=AsyncMock)
 async def test_ws_jobs_status_not_found(
     mock_get_task_status, mock_get_user_id, client, fake_upscaling_task
@@ -0,0 +1,106 @@
+import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from cryptography.fernet import Fernet
+from fastapi import status
+
+from app.config.settings import settings
+from app.error import AuthException
+from app.services import credentials
+from app.services.credentials import (
+    get_submission_access_token,
+    get_submission_credential,
+    validate_submission_credential_key,
+)
+
+
+@pytest.fixture
+def credential_key(monkeypatch):
+    key = Fernet.generate_key().decode()
+    monkeypatch.setattr(settings, "submission_credential_key", key)
+    credentials._access_tokens.clear()
+    yield key
+    credentials._access_tokens.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_submission_credential_encrypts_offline_token(credential_key, monkeypatch):
+    mock_exchange = AsyncMock(
+        return_value={"refresh_token": "offline-token", "refresh_expires_in": 3600}
+    )
+    monkeypatch.setattr(credentials, "exchange_offline_token", mock_exchange)
+
+    credential = await get_submission_credential("access-token")
+
+    mock_exchange.assert_called_once_with("access-token")
+    assert "offline-token" not in credential.token
+    assert Fernet(credential_key).decrypt(credential.token.encode()) == b"offline-token"
+    assert credential.expires_at > datetime.datetime.utcnow()
+
+
+@pytest.mark.asyncio
+async def test_get_submission_credential_without_expiry(credential_key, monkeypatch):
+    monkeypatch.setattr(
+        credentials,
+        "exchange_offline_token",
+        AsyncMock(return_value={"refresh_token": "offline-token", "refresh_expires_in": 0}),
+    )
+
+    credential = await get_submission_credential("access-token")
+
+    assert credential.expires_at is None
+
+
+@pytest.mark.asyncio
+async def test_get_submission_credential_requires_key(monkeypatch):
+    monkeypatch.setattr(settings, "submission_credential_key", None)
+    monkeypatch.setattr(
+        credentials,
+        "exchange_offline_token",
+        AsyncMock(return_value={"refresh_token": "offline-token"}),
+    )
+
+    with pytest.raises(AuthException) as exc_info:
+        await get_submission_credential("access-token")
+
+    assert exc_info.value.http_status == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+@pytest.mark.asyncio
+async def test_get_submission_access_token_is_shared(credential_key, monkeypatch):
+    mock_refresh = AsyncMock(return_value={"access_token": "access-token", "expires_in": 300})
+    monkeypatch.setattr(credentials, "refresh_access_token", mock_refresh)
+    credential = Fernet(credential_key).encrypt(b"offline-token").decode()
+
+    assert await get_submission_access_token(credential) == "access-token"
+    assert await get_submission_access_token(credential) == "access-token"
+
+    mock_refresh.assert_called_once_with("offline-token")
+
+
+@pytest.mark.asyncio
+async def test_get_submission_access_token_rejects_invalid_credential(
+    credential_key, monkeypatch
+):
+    mock_refresh = AsyncMock()
+    monkeypatch.setattr(credentials, "refresh_access_token", mock_refresh)
+    credential = Fernet(Fernet.generate_key()).encrypt(b"offline-token").decode()
+
+    with pytest.raises(AuthException) as exc_info:
+        await get_submission_access_token(credential)
+
+    assert exc_info.value.http_status == status.HTTP_401_UNAUTHORIZED
+    mock_refresh.assert_not_called()
+
+
+def test_validate_submission_credential_key(credential_key):
+    validate_submission_credential_key()
+
+
+@pytest.mark.parametrize("key", [None, "", "not-a-fernet-key"])
+def test_validate_submission_credential_key_fails_without_valid_key(key, monkeypatch):
+    monkeypatch.setattr(settings, "submission_credential_key", key)
+
+    with pytest.raises(RuntimeError, match="SUBMISSION_CREDENTIAL_KEY"):
+        validate_submission_credential_key()
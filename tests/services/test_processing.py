@@ -1,25 +1,39 @@
+import asyncio
+import datetime
 import json
 from unittest.mock import ANY, AsyncMock, patch, MagicMock
 
 import pytest
 
 from app.database.models.processing_job import ProcessingJobRecord
-from app.schemas.enum import OutputFormatEnum, ProcessTypeEnum, ProcessingStatusEnum
+from app.schemas.enum import (
+    OutputFormatEnum,
+    ProcessTypeEnum,
+    ProcessingStatusEnum,
+    SubmissionPriorityEnum,
+)
 from app.schemas.unit_job import (
     BaseJobRequest,
     ProcessingJob,
     ProcessingJobSummary,
     ServiceDetails,
 )
+from app.config.schemas import BackendAuthConfig
+from app.config.settings import settings
 from app.services.processing import (
+    _schedule_next_poll,
+    cancel_processing_jobs,
     create_processing_job,
     create_synchronous_job,
     delete_processing_job,
+    find_reusable_jobs,
+    get_job_request_hash,
     get_processing_job_results,
     get_job_status,
     get_processing_job_by_user_id,
     get_processing_jobs_by_user_id,
     retrieve_service_parameters,
+    submit_processing_job,
 )
 
 
@@ -52,43 +66,61 @@ def make_job_record(status, service_details) -> ProcessingJobRecord:
 
 
 @pytest.mark.asyncio
-@patch("app.services.processing.save_job_to_db")
+@patch("app.services.processing.queue_job_submissions")
+@patch("app.services.processing.add_job_to_db")
 @patch("app.services.processing.get_processing_platform")
 @patch("app.services.processing.get_current_user_id")
-async def test_create_processing_job_calls_platform_execute(
-    mock_current_user, mock_get_platform, mock_save_job_to_db, fake_db_session
+async def test_create_processing_job_queues_submission(
+    mock_current_user,
+    mock_get_platform,
+    mock_add_job_to_db,
+    mock_queue_submissions,
+    fake_db_session,
 ):
-
-    # Arrange
     fake_job = make_job_request()
-    fake_result = 1
-    fake_summary = ProcessingJobSummary(
-        id=fake_result,
+    mock_current_user.return_value = "foobar"
+
+    def add_job(database, record):
+        record.id = 1
+        return record
+
+    mock_add_job_to_db.side_effect = add_job
+
+    result = await create_processing_job("foobar-token", fake_db_session, fake_job)
+
+    # The job is submitted to the platform by the job submission workers
+    mock_get_platform.assert_not_called()
+    saved_record = mock_add_job_to_db.call_args.args[1]
+    assert saved_record.status == ProcessingStatusEnum.QUEUED
+    assert saved_record.platform_job_id is None
+    submissions, priority = mock_queue_submissions.call_args.args[1:]
+    assert priority == SubmissionPriorityEnum.INTERACTIVE
+    assert len(submissions) == 1
+    assert submissions[0].processing_job_id == 1
+    assert submissions[0].upscaling_task_id is None
+    assert submissions[0].token == "encrypted-offline-token"
+    assert BaseJobRequest.model_validate_json(submissions[0].request) == fake_job
+    assert result == ProcessingJobSummary(
+        id=1,
         title=fake_job.title,
         label=ProcessTypeEnum.OPENEO,
-        status=ProcessingStatusEnum.CREATED,
+        status=ProcessingStatusEnum.QUEUED,
         parameters=fake_job.parameters,
         service=fake_job.service,
     )
-    fake_record = ProcessingJobRecord(
-        id=fake_result,
-        title=fake_summary.title,
-        label=ProcessTypeEnum.OPENEO,
-        status=ProcessingStatusEnum.CREATED,
-    )
-    fake_platform = MagicMock()
-
-    fake_platform.execute_job = AsyncMock(return_value=fake_result)
-    mock_get_platform.return_value = fake_platform
 
-    mock_save_job_to_db.return_value = fake_record
 
-    mock_current_user.return_value = "foobar"
+@pytest.mark.asyncio
+@patch("app.services.processing.get_processing_platform")
+async def test_submit_processing_job_calls_platform_execute(mock_get_platform):
+    fake_job = make_job_request()
+    fake_platform = MagicMock()
+    fake_platform.execute_job = AsyncMock(return_value="platform-job-1")
+    mock_get_platform.return_value = fake_platform
 
-    result = await create_processing_job(
-        "foobar-token", fake_db_session, fake_job, None
-    )
+    result = await submit_processing_job("foobar-token", fake_job)
 
+    assert result == "platform-job-1"
     mock_get_platform.assert_called_once_with(fake_job.label)
     fake_platform.execute_job.assert_called_once_with(
         user_token="foobar-token",
@@ -97,142 +129,104 @@ async def test_create_processing_job_calls_platform_execute(
         parameters=fake_job.parameters,
         format=fake_job.format,
     )
-    mock_save_job_to_db.assert_called_once()
-    args, _ = mock_save_job_to_db.call_args
-    saved_record = args[1]
-    assert saved_record.status == ProcessingStatusEnum.CREATED
-    assert result == fake_summary
 
 
-@pytest.mark.asyncio
-@patch("app.services.processing.save_job_to_db")
-@patch("app.services.processing.get_processing_platform")
-@patch("app.services.processing.get_current_user_id")
-async def test_create_processing_job_calls_platform_execute_failure(
-    mock_current_user, mock_get_platform, mock_save_job_to_db, fake_db_session
-):
-
-    # Arrange
-    fake_job = make_job_request()
-    fake_result = 1
-    fake_summary = ProcessingJobSummary(
-        id=fake_result,
-        title=fake_job.title,
-        label=ProcessTypeEnum.OPENEO,
-        status=ProcessingStatusEnum.CREATED,
-        parameters=fake_job.parameters,
-        service=fake_job.service,
+def test_job_request_hash_ignores_title_and_parameter_order():
+    request = make_job_request()
+    request.parameters = {"param": 1, "other": [1, 2]}
+    same = request.model_copy(
+        update={"title": "Other title", "parameters": {"other": [1, 2], "param": 1}}
     )
-    fake_record = ProcessingJobRecord(
-        id=fake_result,
-        title=fake_summary.title,
-        label=ProcessTypeEnum.OPENEO,
-        status=ProcessingStatusEnum.CREATED,
-    )
-    fake_platform = MagicMock()
+    other_format = request.model_copy(update={"format": OutputFormatEnum.NETCDF})
 
-    fake_platform.execute_job.side_effect = SystemError(
-        "Could not authenticate with platform"
-    )
-    mock_get_platform.return_value = fake_platform
+    assert get_job_request_hash(request) == get_job_request_hash(same)
+    assert get_job_request_hash(request) != get_job_request_hash(other_format)
+    assert len(get_job_request_hash(request)) == 64
 
-    mock_save_job_to_db.return_value = fake_record
 
-    mock_current_user.return_value = "foobar"
+@patch("app.services.processing.get_reusable_jobs")
+def test_find_reusable_jobs_only_for_opted_in_requests(
+    mock_get_reusable_jobs, fake_db_session
+):
+    opted_in = make_job_request().model_copy(update={"reuse_results": True})
+    opted_out = make_job_request().model_copy(update={"parameters": {"param": 2}})
+    mock_get_reusable_jobs.return_value = {}
 
-    with pytest.raises(SystemError):
-        await create_processing_job("foobar-token", fake_db_session, fake_job, None)
+    find_reusable_jobs(fake_db_session, "user-123", [opted_in, opted_out])
 
-    mock_get_platform.assert_called_once_with(fake_job.label)
-    fake_platform.execute_job.assert_called_once_with(
-        user_token="foobar-token",
-        title=fake_job.title,
-        details=fake_job.service,
-        parameters=fake_job.parameters,
-        format=fake_job.format,
+    database, user, hashes, finished_after = mock_get_reusable_jobs.call_args.args
+    assert user == "user-123"
+    assert hashes == [get_job_request_hash(opted_in)]
+    expected = datetime.datetime.utcnow() - datetime.timedelta(
+        seconds=settings.result_reuse_max_age
     )
-    mock_save_job_to_db.assert_not_called()
+    assert abs((finished_after - expected).total_seconds()) < 5
 
 
 @pytest.mark.asyncio
 @patch("app.services.processing.save_job_to_db")
+@patch("app.services.processing.get_reusable_jobs")
 @patch("app.services.processing.get_processing_platform")
 @patch("app.services.processing.get_current_user_id")
-async def test_create_processing_job_calls_platform_execute_failure_save_when_upscaling(
-    mock_current_user, mock_get_platform, mock_save_job_to_db, fake_db_session
+async def test_create_processing_job_reuses_finished_job(
+    mock_current_user,
+    mock_get_platform,
+    mock_get_reusable_jobs,
+    mock_save_job_to_db,
+    fake_db_session,
+    submission_credentials,
 ):
-
-    # Arrange
-    fake_job = make_job_request()
-    fake_result = 1
-    fake_summary = ProcessingJobSummary(
-        id=fake_result,
-        title=fake_job.title,
-        label=ProcessTypeEnum.OPENEO,
-        status=ProcessingStatusEnum.CREATED,
-        parameters=fake_job.parameters,
-        service=fake_job.service,
-    )
-    fake_record = ProcessingJobRecord(
-        id=fake_result,
-        title=fake_summary.title,
-        label=ProcessTypeEnum.OPENEO,
-        status=ProcessingStatusEnum.CREATED,
+    fake_job = make_job_request().model_copy(update={"reuse_results": True})
+    finished = make_job_record(
+        ProcessingStatusEnum.FINISHED, fake_job.service.model_dump()
     )
-    fake_platform = MagicMock()
+    finished.finished_at = datetime.datetime(2025, 8, 11, 10, 0)
+    mock_current_user.return_value = "user-123"
+    mock_get_reusable_jobs.return_value = {get_job_request_hash(fake_job): finished}
 
-    fake_platform.execute_job.side_effect = SystemError(
-        "Could not authenticate with platform"
-    )
-    mock_get_platform.return_value = fake_platform
+    def save_job(database, record):
+        record.id = 2
+        return record
 
-    mock_save_job_to_db.return_value = fake_record
+    mock_save_job_to_db.side_effect = save_job
 
-    mock_current_user.return_value = "foobar"
+    result = await create_processing_job("foobar-token", fake_db_session, fake_job)
 
-    result = await create_processing_job("foobar-token", fake_db_session, fake_job, 1)
-
-    mock_get_platform.assert_called_once_with(fake_job.label)
-    fake_platform.execute_job.assert_called_once_with(
-        user_token="foobar-token",
-        title=fake_job.title,
-        details=fake_job.service,
-        parameters=fake_job.parameters,
-        format=fake_job.format,
-    )
-
-    mock_save_job_to_db.assert_called_once()
-    args, _ = mock_save_job_to_db.call_args
-    saved_record = args[1]
-    assert saved_record.status == ProcessingStatusEnum.FAILED
-    assert result == fake_summary
+    mock_get_platform.assert_not_called()
+    saved_record = mock_save_job_to_db.call_args.args[1]
+    assert saved_record.platform_job_id == finished.platform_job_id
+    assert saved_record.request_hash == get_job_request_hash(fake_job)
+    assert saved_record.finished_at == finished.finished_at
+    assert result.status == ProcessingStatusEnum.FINISHED
+    # No offline token is needed as nothing is submitted on behalf of the user
+    submission_credentials.assert_not_called()
 
 
 @pytest.mark.asyncio
-@patch("app.services.processing.get_processing_platform")
+@patch("app.services.processing.queue_job_submissions")
+@patch("app.services.processing.add_job_to_db")
 @patch("app.services.processing.get_current_user_id")
-async def test_create_processing_job_platform_raises(
-    mock_current_user, mock_get_platform, fake_db_session
+async def test_create_processing_job_raises_when_queueing_fails(
+    mock_current_user, mock_add_job_to_db, mock_queue_submissions, fake_db_session
 ):
-    fake_summary = make_job_request()
-    mock_get_platform.side_effect = ValueError("Unsupported platform")
-
     mock_current_user.return_value = "foobar"
+    mock_add_job_to_db.side_effect = lambda database, record: record
+    mock_queue_submissions.side_effect = SystemError("Database connection lost")
 
-    with pytest.raises(ValueError, match="Unsupported platform"):
-        await create_processing_job("foobar-token", fake_db_session, fake_summary, None)
+    with pytest.raises(SystemError, match="Database connection lost"):
+        await create_processing_job("foobar-token", fake_db_session, make_job_request())
 
 
 @pytest.mark.asyncio
-@patch("app.services.processing.update_job_status_by_id")
-@patch("app.services.processing.get_job_status")
+@patch("app.services.processing.update_job_statuses")
+@patch("app.services.processing.get_processing_platform")
 @patch("app.services.processing.get_jobs_by_user_id")
 @patch("app.services.processing.get_current_user_id")
 async def test_get_processing_jobs_with_active_and_inactive_statuses(
     mock_current_user,
     mock_get_jobs,
-    mock_get_job_status,
-    mock_update_job_status,
+    mock_get_platform,
+    mock_update_job_statuses,
     fake_db_session,
     fake_processing_job_record,
 ):
@@ -246,7 +240,11 @@ async def test_get_processing_jobs_with_active_and_inactive_statuses(
         service=json.dumps({"application": "foo", "endpoint": "bar"}),
     )
     mock_get_jobs.return_value = [fake_processing_job_record, inactive_job]
-    mock_get_job_status.return_value = ProcessingStatusEnum.RUNNING
+    fake_platform = MagicMock()
+    fake_platform.get_job_statuses = AsyncMock(
+        return_value={"platform-job-1": ProcessingStatusEnum.RUNNING}
+    )
+    mock_get_platform.return_value = fake_platform
 
     mock_current_user.return_value = "foobar"
 
@@ -258,29 +256,35 @@ async def test_get_processing_jobs_with_active_and_inactive_statuses(
     assert results[1].status == ProcessingStatusEnum.FAILED
 
     # Active job should be refreshed
-    mock_get_job_status.assert_called_once_with(
-        "foobar-token", fake_processing_job_record
+    fake_platform.get_job_statuses.assert_called_once_with(
+        user_token="foobar-token",
+        job_ids=["platform-job-1"],
+        details=ServiceDetails(endpoint="foo", application="bar"),
     )
-    mock_update_job_status.assert_called_once_with(
-        ANY, fake_processing_job_record.id, ProcessingStatusEnum.RUNNING
+    mock_update_job_statuses.assert_called_once_with(
+        ANY, {fake_processing_job_record.id: ProcessingStatusEnum.RUNNING}
     )
 
 
 @pytest.mark.asyncio
-@patch("app.services.processing.update_job_status_by_id")
-@patch("app.services.processing.get_job_status")
+@patch("app.services.processing.update_job_statuses")
+@patch("app.services.processing.get_processing_platform")
 @patch("app.services.processing.get_jobs_by_user_id")
 @patch("app.services.processing.get_current_user_id")
 async def test_get_processing_jobs_no_updates(
     mock_current_user,
     mock_get_jobs,
-    mock_get_job_status,
-    mock_update_job_status,
+    mock_get_platform,
+    mock_update_job_statuses,
     fake_db_session,
     fake_processing_job_record,
 ):
     mock_get_jobs.return_value = [fake_processing_job_record]
-    mock_get_job_status.return_value = fake_processing_job_record.status
+    fake_platform = MagicMock()
+    fake_platform.get_job_statuses = AsyncMock(
+        return_value={"platform-job-1": fake_processing_job_record.status}
+    )
+    mock_get_platform.return_value = fake_platform
 
     mock_current_user.return_value = "foobar"
 
@@ -290,10 +294,189 @@ async def test_get_processing_jobs_no_updates(
     assert results[0].status == fake_processing_job_record.status
 
     # Active job should be refreshed
-    mock_get_job_status.assert_called_once_with(
-        "foobar-token", fake_processing_job_record
+    fake_platform.get_job_statuses.assert_called_once()
+    mock_update_job_statuses.assert_called_once_with(ANY, {})
+
+
+def make_platform_with_statuses(get_job_statuses) -> MagicMock:
+    fake_platform = MagicMock()
+    fake_platform.get_job_statuses = AsyncMock(side_effect=get_job_statuses)
+    return fake_platform
+
+
+@pytest.mark.asyncio
+@patch("app.services.processing.update_job_statuses")
+@patch("app.services.processing.get_processing_platform")
+@patch("app.services.processing.get_jobs_by_user_id")
+@patch("app.services.processing.get_current_user_id")
+async def test_get_processing_jobs_refreshes_endpoints_concurrently(
+    mock_current_user,
+    mock_get_jobs,
+    mock_get_platform,
+    mock_update_job_statuses,
+    fake_db_session,
+):
+    records = []
+    for idx in range(6):
+        record = make_job_record(
+            ProcessingStatusEnum.CREATED,
+            {"endpoint": f"endpoint-{idx % 3}", "application": "bar"},
+        )
+        record.id = idx + 1
+        record.platform_job_id = f"platform-job-{idx + 1}"
+        records.append(record)
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_statuses(user_token, job_ids, details):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {job_id: ProcessingStatusEnum.RUNNING for job_id in job_ids}
+
+    fake_platform = make_platform_with_statuses(slow_statuses)
+    mock_get_jobs.return_value = records
+    mock_get_platform.return_value = fake_platform
+    mock_current_user.return_value = "foobar"
+
+    results = await get_processing_jobs_by_user_id("foobar-token", fake_db_session)
+
+    assert [job.status for job in results] == [ProcessingStatusEnum.RUNNING] * 6
+    # One batch request per endpoint, executed in parallel
+    assert fake_platform.get_job_statuses.await_count == 3
+    assert max_in_flight == 3
+    # All status changes are stored at once
+    mock_update_job_statuses.assert_called_once_with(
+        ANY, {record.id: ProcessingStatusEnum.RUNNING for record in records}
     )
-    mock_update_job_status.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.services.processing.update_job_statuses")
+@patch("app.services.processing.get_processing_platform")
+@patch("app.services.processing.get_jobs_by_user_id")
+@patch("app.services.processing.get_current_user_id")
+async def test_get_processing_jobs_keeps_stored_status_on_failure(
+    mock_current_user,
+    mock_get_jobs,
+    mock_get_platform,
+    mock_update_job_statuses,
+    fake_db_session,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "status_refresh_timeout", 0.01)
+    slow_job = make_job_record(
+        ProcessingStatusEnum.RUNNING, {"endpoint": "slow", "application": "bar"}
+    )
+    slow_job.id = 1
+    failing_job = make_job_record(
+        ProcessingStatusEnum.QUEUED, {"endpoint": "failing", "application": "bar"}
+    )
+    failing_job.id = 2
+    healthy_job = make_job_record(
+        ProcessingStatusEnum.CREATED, {"endpoint": "healthy", "application": "bar"}
+    )
+    healthy_job.id = 3
+
+    async def get_statuses(user_token, job_ids, details):
+        if details.endpoint == "slow":
+            await asyncio.sleep(1)
+        if details.endpoint == "failing":
+            raise RuntimeError("Platform unavailable")
+        return {job_id: ProcessingStatusEnum.FINISHED for job_id in job_ids}
+
+    mock_get_jobs.return_value = [slow_job, failing_job, healthy_job]
+    mock_get_platform.return_value = make_platform_with_statuses(get_statuses)
+    mock_current_user.return_value = "foobar"
+
+    results = await get_processing_jobs_by_user_id("foobar-token", fake_db_session)
+
+    assert [job.status for job in results] == [
+        ProcessingStatusEnum.RUNNING,
+        ProcessingStatusEnum.QUEUED,
+        ProcessingStatusEnum.FINISHED,
+    ]
+    mock_update_job_statuses.assert_called_once_with(
+        ANY, {3: ProcessingStatusEnum.FINISHED}
+    )
+
+
+@pytest.mark.asyncio
+@patch("app.services.processing.update_job_statuses")
+@patch("app.services.processing.get_processing_platform")
+@patch("app.services.processing.get_jobs_by_user_id")
+@patch("app.services.processing.get_current_user_id")
+async def test_get_processing_jobs_shares_status_requests(
+    mock_current_user,
+    mock_get_jobs,
+    mock_get_platform,
+    mock_update_job_statuses,
+    fake_db_session,
+):
+    async def slow_statuses(user_token, job_ids, details):
+        await asyncio.sleep(0.01)
+        return {job_id: ProcessingStatusEnum.RUNNING for job_id in job_ids}
+
+    def make_records():
+        record = make_job_record(
+            ProcessingStatusEnum.QUEUED, {"endpoint": "foo", "application": "bar"}
+        )
+        record.id = 1
+        record.platform_job_id = "platform-job-1"
+        return [record]
+
+    fake_platform = make_platform_with_statuses(slow_statuses)
+    mock_get_jobs.side_effect = lambda *args: make_records()
+    mock_get_platform.return_value = fake_platform
+    mock_current_user.return_value = "foobar"
+
+    # Simulate a user having the dashboard open in multiple tabs
+    results = await asyncio.gather(
+        *[
+            get_processing_jobs_by_user_id("foobar-token", fake_db_session)
+            for _ in range(3)
+        ]
+    )
+
+    assert [jobs[0].status for jobs in results] == [ProcessingStatusEnum.RUNNING] * 3
+    fake_platform.get_job_statuses.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("app.services.processing.get_job_status")
+@patch("app.services.processing.get_jobs_by_user_id")
+@patch("app.services.processing.get_current_user_id")
+async def test_get_processing_jobs_serves_from_db_when_reconciler_enabled(
+    mock_current_user,
+    mock_get_jobs,
+    mock_get_job_status,
+    fake_db_session,
+    fake_processing_job_record,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "status_reconciler_enabled", True)
+    mock_get_jobs.return_value = [fake_processing_job_record]
+    mock_current_user.return_value = "foobar"
+
+    results = await get_processing_jobs_by_user_id("foobar-token", fake_db_session)
+
+    assert results[0].status == fake_processing_job_record.status
+    mock_get_job_status.assert_not_called()
+
+
+def test_get_status_concurrency_uses_backend_config(monkeypatch):
+    monkeypatch.setitem(
+        settings.backend_auth_config,
+        "https://backend.limited",
+        BackendAuthConfig(token_provider="provider", status_concurrency=3),
+    )
+    monkeypatch.setattr(settings, "status_refresh_concurrency", 7)
+
+    assert settings.get_status_concurrency("https://backend.limited") == 3
+    assert settings.get_status_concurrency("https://backend.unknown") == 7
 
 
 @pytest.mark.asyncio
@@ -351,6 +534,64 @@ async def test_get_job_status_from_platform(
     assert status == ProcessingStatusEnum.QUEUED
 
 
+@pytest.mark.asyncio
+@patch("app.services.processing.get_processing_platform")
+async def test_get_job_status_keeps_stored_status_when_unknown(
+    mock_get_platform, fake_processing_job_record
+):
+
+    fake_platform = MagicMock()
+    fake_platform.get_job_status = AsyncMock(return_value=ProcessingStatusEnum.UNKNOWN)
+    mock_get_platform.return_value = fake_platform
+
+    status = await get_job_status("foobar-token", fake_processing_job_record)
+
+    assert status == fake_processing_job_record.status
+
+
+@pytest.mark.asyncio
+@patch("app.services.processing.update_job_statuses")
+@patch("app.services.processing.get_processing_platform")
+@patch("app.services.processing.get_jobs_by_user_id")
+@patch("app.services.processing.get_current_user_id")
+async def test_get_processing_jobs_does_not_store_unknown_status(
+    mock_current_user,
+    mock_get_jobs,
+    mock_get_platform,
+    mock_update_job_statuses,
+    fake_db_session,
+):
+    unknown_job = make_job_record(
+        ProcessingStatusEnum.RUNNING, {"endpoint": "foo", "application": "bar"}
+    )
+    finished_job = make_job_record(
+        ProcessingStatusEnum.RUNNING, {"endpoint": "foo", "application": "bar"}
+    )
+    finished_job.id = 2
+    finished_job.platform_job_id = "platform-job-789"
+
+    fake_platform = MagicMock()
+    fake_platform.get_job_statuses = AsyncMock(
+        return_value={
+            unknown_job.platform_job_id: ProcessingStatusEnum.UNKNOWN,
+            finished_job.platform_job_id: ProcessingStatusEnum.FINISHED,
+        }
+    )
+    mock_get_jobs.return_value = [unknown_job, finished_job]
+    mock_get_platform.return_value = fake_platform
+    mock_current_user.return_value = "foobar"
+
+    results = await get_processing_jobs_by_user_id("foobar-token", fake_db_session)
+
+    assert [job.status for job in results] == [
+        ProcessingStatusEnum.RUNNING,
+        ProcessingStatusEnum.FINISHED,
+    ]
+    mock_update_job_statuses.assert_called_once_with(
+        ANY, {2: ProcessingStatusEnum.FINISHED}
+    )
+
+
 @pytest.mark.asyncio
 @patch("app.services.processing.get_job_by_user_id")
 @patch("app.services.processing.get_processing_platform")
@@ -559,6 +800,9 @@ async def test_retrieve_service_parameters_success(
 
 
 @pytest.mark.asyncio
+@patch("app.services.processing.get_claimed_job_ids")
+@patch("app.services.processing.update_job_statuses")
+@patch("app.services.processing.get_processing_platform")
 @patch("app.services.processing.remove_job_by_id")
 @patch("app.services.processing.get_job_by_user_id")
 @patch("app.services.processing.get_current_user_id")
@@ -566,20 +810,152 @@ async def test_delete_processing_job_deletes_record_when_found(
     mock_current_user,
     mock_get_job,
     mock_remove_job,
+    mock_get_platform,
+    mock_update_job_statuses,
+    mock_get_claimed,
     fake_db_session,
     fake_processing_job_record,
 ):
     mock_current_user.return_value = "foobar"
     mock_get_job.return_value = fake_processing_job_record
+    mock_get_claimed.return_value = set()
+    mock_get_platform.return_value.cancel_jobs = AsyncMock(return_value=["platform-job-1"])
 
     await delete_processing_job("foobar-token", fake_db_session, 1)
 
     mock_get_job.assert_called_once_with(fake_db_session, 1, "foobar")
+    # The active job is canceled on the platform before it is removed
+    assert mock_get_platform.return_value.cancel_jobs.call_args.kwargs["job_ids"] == [
+        "platform-job-1"
+    ]
+    mock_update_job_statuses.assert_called_once_with(
+        fake_db_session, {fake_processing_job_record.id: ProcessingStatusEnum.CANCELED}
+    )
     mock_remove_job.assert_called_once_with(
         fake_db_session, fake_processing_job_record.id, "foobar"
     )
 
 
+@pytest.mark.asyncio
+@patch("app.services.processing.get_claimed_job_ids")
+@patch("app.services.processing.cancel_queued_jobs")
+@patch("app.services.processing.remove_pending_job_submissions")
+@patch("app.services.processing.remove_job_by_id")
+@patch("app.services.processing.get_job_by_user_id")
+@patch("app.services.processing.get_current_user_id")
+async def test_delete_processing_job_keeps_record_being_submitted(
+    mock_current_user,
+    mock_get_job,
+    mock_remove_job,
+    mock_remove_submissions,
+    mock_cancel_queued,
+    mock_get_claimed,
+    fake_db_session,
+    fake_processing_job_record,
+):
+    mock_current_user.return_value = "foobar"
+    fake_processing_job_record.status = ProcessingStatusEnum.QUEUED
+    fake_processing_job_record.platform_job_id = None
+    mock_get_job.return_value = fake_processing_job_record
+    mock_cancel_queued.return_value = {fake_processing_job_record.id}
+    mock_get_claimed.return_value = {fake_processing_job_record.id}
+
+    await delete_processing_job("foobar-token", fake_db_session, 1)
+
+    mock_cancel_queued.assert_called_once_with(
+        fake_db_session, [fake_processing_job_record.id]
+    )
+    assert fake_processing_job_record.status == ProcessingStatusEnum.CANCELED
+    mock_remove_job.assert_not_called()
+
+
+def make_cancel_record(idx, status, platform_job_id):
+    return ProcessingJobRecord(
+        id=idx,
+        label=ProcessTypeEnum.OPENEO,
+        status=status,
+        platform_job_id=platform_job_id,
+        service='{"endpoint":"foo","application":"bar"}',
+    )
+
+
+@pytest.mark.asyncio
+@patch("app.services.processing.update_job_statuses")
+@patch("app.services.processing.cancel_queued_jobs")
+@patch("app.services.processing.remove_pending_job_submissions")
+@patch("app.services.processing.get_processing_platform")
+async def test_cancel_processing_jobs(
+    mock_get_platform,
+    mock_remove_submissions,
+    mock_cancel_queued,
+    mock_update_job_statuses,
+    fake_db_session,
+):
+    make_record = make_cancel_record
+    records = [
+        make_record(1, ProcessingStatusEnum.QUEUED, None),
+        make_record(2, ProcessingStatusEnum.RUNNING, "job2"),
+        make_record(3, ProcessingStatusEnum.RUNNING, "job3"),
+        make_record(4, ProcessingStatusEnum.FINISHED, "job4"),
+    ]
+    mock_cancel_queued.return_value = {1}
+    # The job that could not be canceled on the platform is omitted
+    mock_get_platform.return_value.cancel_jobs = AsyncMock(return_value=["job2"])
+
+    canceled = await cancel_processing_jobs("foobar-token", fake_db_session, records)
+
+    assert [record.id for record in canceled] == [1, 2]
+    assert mock_get_platform.return_value.cancel_jobs.call_args.kwargs["job_ids"] == [
+        "job2",
+        "job3",
+    ]
+    mock_remove_submissions.assert_called_once_with(
+        fake_db_session, settings.submission_lease, processing_job_ids=[1]
+    )
+    mock_cancel_queued.assert_called_once_with(fake_db_session, [1])
+    mock_update_job_statuses.assert_called_once_with(
+        fake_db_session, {2: ProcessingStatusEnum.CANCELED}
+    )
+    assert records[0].status == ProcessingStatusEnum.CANCELED
+    assert records[2].status == ProcessingStatusEnum.RUNNING
+
+
+@pytest.mark.asyncio
+@patch("app.services.processing.reload_jobs")
+@patch("app.services.processing.update_job_statuses")
+@patch("app.services.processing.cancel_queued_jobs")
+@patch("app.services.processing.remove_pending_job_submissions")
+@patch("app.services.processing.get_processing_platform")
+async def test_cancel_processing_jobs_cancels_jobs_submitted_in_the_meantime(
+    mock_get_platform,
+    mock_remove_submissions,
+    mock_cancel_queued,
+    mock_update_job_statuses,
+    mock_reload_jobs,
+    fake_db_session,
+):
+    record = make_cancel_record(1, ProcessingStatusEnum.QUEUED, None)
+
+    def reload(database, records):
+        # The job was submitted by the worker in the meantime
+        record.status = ProcessingStatusEnum.CREATED
+        record.platform_job_id = "job1"
+        return records
+
+    mock_reload_jobs.side_effect = reload
+    mock_cancel_queued.return_value = set()
+    mock_get_platform.return_value.cancel_jobs = AsyncMock(return_value=["job1"])
+
+    canceled = await cancel_processing_jobs("foobar-token", fake_db_session, [record])
+
+    assert canceled == [record]
+    mock_reload_jobs.assert_any_call(fake_db_session, [record])
+    assert mock_get_platform.return_value.cancel_jobs.call_args.kwargs["job_ids"] == ["job1"]
+    mock_update_job_statuses.assert_called_once_with(
+        fake_db_session, {1: ProcessingStatusEnum.CANCELED}
+    )
+
+
 @pytest.mark.asyncio
 @patch("app.services.processing.remove_job_by_id")
 @patch("app.services.processing.get_job_by_user_id")
@@ -597,3 +973,111 @@ async def test_delete_processing_job_noop_when_not_found(
 
     mock_get_job.assert_called_once_with(fake_db_session, 1, "foobar")
     mock_remove_job.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.services.processing.update_job_poll_schedules")
+@patch("app.services.processing.update_job_statuses")
+@patch("app.services.processing.get_processing_platform")
+@patch("app.services.processing.get_jobs_by_user_id")
+@patch("app.services.processing.get_current_user_id")
+async def test_get_processing_jobs_only_polls_due_jobs(
+    mock_current_user,
+    mock_get_jobs,
+    mock_get_platform,
+    mock_update_job_statuses,
+    mock_update_job_poll_schedules,
+    fake_db_session,
+):
+    due_job = make_job_record(
+        ProcessingStatusEnum.RUNNING, {"endpoint": "foo", "application": "bar"}
+    )
+    due_job.next_poll_at = datetime.datetime.utcnow() - datetime.timedelta(seconds=5)
+    due_job.poll_interval = 20.0
+    scheduled_job = make_job_record(
+        ProcessingStatusEnum.RUNNING, {"endpoint": "foo", "application": "bar"}
+    )
+    scheduled_job.id = 2
+    scheduled_job.platform_job_id = "platform-job-789"
+    scheduled_job.next_poll_at = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+
+    fake_platform = MagicMock()
+    fake_platform.get_job_statuses = AsyncMock(
+        return_value={due_job.platform_job_id: ProcessingStatusEnum.RUNNING}
+    )
+    mock_get_jobs.return_value = [due_job, scheduled_job]
+    mock_get_platform.return_value = fake_platform
+    mock_current_user.return_value = "foobar"
+
+    await get_processing_jobs_by_user_id("foobar-token", fake_db_session)
+
+    fake_platform.get_job_statuses.assert_called_once_with(
+        user_token="foobar-token",
+        job_ids=[due_job.platform_job_id],
+        details=ANY,
+    )
+    mock_update_job_statuses.assert_called_once_with(ANY, {})
+    # Unchanged status results in an exponential backoff
+    expected_interval = 20.0 * settings.status_poll_backoff_factor
+    mock_update_job_poll_schedules.assert_called_once_with(
+        ANY, {due_job.id: (due_job.next_poll_at, expected_interval)}
+    )
+    assert due_job.poll_interval == expected_interval
+    assert due_job.next_poll_at > datetime.datetime.utcnow()
+
+
+@pytest.mark.asyncio
+@patch("app.services.processing.update_job_statuses")
+@patch("app.services.processing.get_processing_platform")
+@patch("app.services.processing.get_jobs_by_user_id")
+@patch("app.services.processing.get_current_user_id")
+async def test_get_processing_jobs_skips_locally_queued_jobs(
+    mock_current_user,
+    mock_get_jobs,
+    mock_get_platform,
+    mock_update_job_statuses,
+    fake_db_session,
+):
+    queued_job = make_job_record(
+        ProcessingStatusEnum.QUEUED, {"endpoint": "foo", "application": "bar"}
+    )
+    queued_job.platform_job_id = None
+
+    mock_get_jobs.return_value = [queued_job]
+    mock_current_user.return_value = "foobar"
+
+    await get_processing_jobs_by_user_id("foobar-token", fake_db_session)
+
+    mock_get_platform.assert_not_called()
+    mock_update_job_statuses.assert_not_called()
+    assert queued_job.poll_interval is None
+    assert queued_job.next_poll_at is None
+
+
+@pytest.mark.parametrize(
+    "current_interval, new_status, expected_interval",
+    [
+        (None, ProcessingStatusEnum.CREATED, 10.0),
+        (40.0, ProcessingStatusEnum.RUNNING, 10.0),
+        (40.0, ProcessingStatusEnum.QUEUED, 80.0),
+        (1500.0, ProcessingStatusEnum.QUEUED, 1800.0),
+        (None, None, 10.0),
+        (40.0, None, 40.0),
+    ],
+)
+def test_schedule_next_poll(
+    current_interval, new_status, expected_interval, monkeypatch
+):
+    monkeypatch.setattr(settings, "status_poll_min_interval", 10.0)
+    monkeypatch.setattr(settings, "status_poll_max_interval", 1800.0)
+    monkeypatch.setattr(settings, "status_poll_backoff_factor", 2.0)
+    record = make_job_record(
+        ProcessingStatusEnum.QUEUED, {"endpoint": "foo", "application": "bar"}
+    )
+    record.poll_interval = current_interval
+    now = datetime.datetime(2025, 1, 1, 12, 0, 0)
+
+    next_poll_at, interval = _schedule_next_poll(record, new_status, now)
+
+    assert interval == expected_interval
+    assert next_poll_at == now + datetime.timedelta(seconds=expected_interval)
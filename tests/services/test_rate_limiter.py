@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from app.services.rate_limiter import (
+    RateLimiter,
+    get_concurrency_limiter,
+    get_rate_limiter,
+)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spreads_calls():
+    limiter = RateLimiter(rate=50)
+
+    start = time.monotonic()
+    for _ in range(4):
+        await limiter.acquire()
+
+    # The first call passes directly, the next three wait 20ms each
+    assert time.monotonic() - start >= 0.06
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_without_rate_does_not_wait():
+    limiter = RateLimiter(rate=0)
+
+    start = time.monotonic()
+    for _ in range(100):
+        await limiter.acquire()
+
+    assert time.monotonic() - start < 0.05
+
+
+def test_get_rate_limiter_is_shared_per_key():
+    first = get_rate_limiter("https://foo.bar", 1)
+    second = get_rate_limiter("https://foo.bar", 2)
+
+    assert first is second
+    assert second.rate == 2
+    assert get_rate_limiter("https://other.bar", 1) is not first
+
+
+@pytest.mark.asyncio
+async def test_get_concurrency_limiter_is_shared_per_key():
+    first = get_concurrency_limiter("status:https://foo.bar", 2)
+
+    assert get_concurrency_limiter("status:https://foo.bar", 2) is first
+    assert get_concurrency_limiter("status:https://other.bar", 2) is not first
+    # A changed limit takes effect through a new limiter
+    assert get_concurrency_limiter("status:https://foo.bar", 3) is not first
@@ -0,0 +1,95 @@
+import datetime
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.database.models.processing_job import ProcessingJobRecord
+from app.database.models.user_credential import UserCredentialRecord
+from app.error import AuthException
+from app.schemas.enum import ProcessTypeEnum, ProcessingStatusEnum
+from app.services.reconciler import reconcile_job_statuses
+
+
+def make_job_record(job_id: int, user_id: str) -> ProcessingJobRecord:
+    return ProcessingJobRecord(
+        id=job_id,
+        title=f"Job {job_id}",
+        label=ProcessTypeEnum.OPENEO,
+        status=ProcessingStatusEnum.RUNNING,
+        user_id=user_id,
+        platform_job_id=f"platform-job-{job_id}",
+        parameters="{}",
+        service=json.dumps({"endpoint": "foo", "application": "bar"}),
+    )
+
+
+def make_credential(user_id: str, expires_at=None) -> UserCredentialRecord:
+    return UserCredentialRecord(
+        user_id=user_id, token=f"{user_id}-credential", expires_at=expires_at
+    )
+
+
+@pytest.mark.asyncio
+@patch("app.services.reconciler.refresh_job_statuses", new_callable=AsyncMock)
+@patch("app.services.reconciler.get_submission_access_token", new_callable=AsyncMock)
+@patch("app.services.reconciler.get_user_credentials")
+@patch("app.services.reconciler.get_due_jobs")
+async def test_reconcile_refreshes_jobs_per_user(
+    mock_get_due_jobs, mock_get_credentials, mock_get_token, mock_refresh, fake_db_session
+):
+    alice_jobs = [make_job_record(1, "alice"), make_job_record(2, "alice")]
+    bob_jobs = [make_job_record(3, "bob")]
+    mock_get_due_jobs.return_value = [alice_jobs[0], bob_jobs[0], alice_jobs[1]]
+    mock_get_credentials.return_value = {
+        "alice": make_credential("alice"),
+        "bob": make_credential("bob"),
+    }
+    mock_get_token.side_effect = lambda credential: credential.replace("credential", "token")
+    mock_refresh.side_effect = lambda token, database, records: records
+
+    refreshed = await reconcile_job_statuses(fake_db_session)
+
+    assert refreshed == 3
+    mock_get_credentials.assert_called_once_with(fake_db_session, ["alice", "bob"])
+    mock_refresh.assert_any_await("alice-token", fake_db_session, alice_jobs)
+    mock_refresh.assert_any_await("bob-token", fake_db_session, bob_jobs)
+
+
+@pytest.mark.asyncio
+@patch("app.services.reconciler.refresh_job_statuses", new_callable=AsyncMock)
+@patch("app.services.reconciler.get_submission_access_token", new_callable=AsyncMock)
+@patch("app.services.reconciler.get_user_credentials")
+@patch("app.services.reconciler.get_due_jobs")
+async def test_reconcile_skips_users_without_valid_credential(
+    mock_get_due_jobs, mock_get_credentials, mock_get_token, mock_refresh, fake_db_session
+):
+    carol_jobs = [make_job_record(4, "carol")]
+    mock_get_due_jobs.return_value = [
+        make_job_record(1, "alice"),
+        make_job_record(2, "bob"),
+        make_job_record(3, "dave"),
+        carol_jobs[0],
+    ]
+    mock_get_credentials.return_value = {
+        "bob": make_credential(
+            "bob", expires_at=datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
+        ),
+        "dave": make_credential("dave"),
+        "carol": make_credential("carol"),
+    }
+
+    async def get_token(credential):
+        if credential == "dave-credential":
+            raise AuthException(message="Token refresh failed.")
+        return "carol-token"
+
+    mock_get_token.side_effect = get_token
+    mock_refresh.side_effect = lambda token, database, records: records
+
+    refreshed = await reconcile_job_statuses(fake_db_session)
+
+    # Alice has no credential, the credential of Bob expired and the one of Dave was rejected
+    assert refreshed == 1
+    assert mock_get_token.await_count == 2
+    mock_refresh.assert_awaited_once_with("carol-token", fake_db_session, carol_jobs)
@@ -0,0 +1,171 @@
+import datetime
+from unittest.mock import patch
+
+import pytest
+
+from app.config.schemas import BackendAuthConfig
+from app.config.settings import settings
+from app.database.models.job_submission import JobSubmissionRecord
+from app.schemas.enum import SubmissionPriorityEnum
+from app.services.scheduler import (
+    admit_job_submissions,
+    get_inflight_jobs,
+    get_saturated_backends,
+    get_submission_queue_metrics,
+    queue_job_submissions,
+)
+
+
+@pytest.fixture
+def inflight_limits(monkeypatch):
+    monkeypatch.setattr(
+        settings,
+        "backend_auth_config",
+        {
+            "https://limited.eo": BackendAuthConfig(
+                max_inflight_jobs=3, max_inflight_jobs_per_user=2
+            ),
+            "https://unlimited.eo": BackendAuthConfig(),
+        },
+    )
+
+
+def make_submissions(user_id, count):
+    return [
+        JobSubmissionRecord(user_id=user_id, token=f"{user_id}-token-{idx}", request="{}")
+        for idx in range(count)
+    ]
+
+
+@patch("app.services.scheduler.save_user_credentials")
+@patch("app.services.scheduler.save_job_submissions_to_db")
+@patch("app.services.scheduler.get_virtual_finish_times")
+def test_queue_job_submissions_continues_from_virtual_time(
+    mock_finish_times, mock_save, mock_save_credentials, fake_db_session
+):
+    mock_finish_times.return_value = (10.0, {})
+    submissions = make_submissions("alice", 3)
+
+    queue_job_submissions(fake_db_session, submissions, SubmissionPriorityEnum.BATCH)
+
+    mock_finish_times.assert_called_once_with(
+        fake_db_session, SubmissionPriorityEnum.BATCH, ["alice"]
+    )
+    assert [submission.virtual_finish for submission in submissions] == [11.0, 12.0, 13.0]
+    assert all(
+        submission.priority == SubmissionPriorityEnum.BATCH for submission in submissions
+    )
+    mock_save.assert_called_once_with(fake_db_session, submissions)
+
+
+@patch("app.services.scheduler.save_user_credentials")
+@patch("app.services.scheduler.save_job_submissions_to_db")
+@patch("app.services.scheduler.get_virtual_finish_times")
+def test_queue_job_submissions_continues_after_queued_jobs_of_user(
+    mock_finish_times, mock_save, mock_save_credentials, fake_db_session
+):
+    # Alice already has a large task queued, Bob's jobs are scheduled in between
+    mock_finish_times.return_value = (10.0, {"alice": 1000.0})
+    alice = make_submissions("alice", 1)
+    bob = make_submissions("bob", 2)
+
+    queue_job_submissions(fake_db_session, alice + bob, SubmissionPriorityEnum.BATCH)
+
+    assert [submission.virtual_finish for submission in alice] == [1001.0]
+    assert [submission.virtual_finish for submission in bob] == [11.0, 12.0]
+    # The latest credential of each user is stored for the status reconciler
+    mock_save_credentials.assert_called_once_with(
+        fake_db_session,
+        {"alice": ("alice-token-0", None), "bob": ("bob-token-1", None)},
+    )
+
+
+@patch("app.services.scheduler.save_user_credentials")
+@patch("app.services.scheduler.save_job_submissions_to_db")
+@patch("app.services.scheduler.get_virtual_finish_times")
+def test_queue_job_submissions_applies_user_weights(
+    mock_finish_times, mock_save, mock_save_credentials, fake_db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "submission_user_weights", {"alice": 2.0})
+    mock_finish_times.return_value = (0.0, {})
+    alice = make_submissions("alice", 2)
+    bob = make_submissions("bob", 2)
+
+    queue_job_submissions(fake_db_session, alice + bob, SubmissionPriorityEnum.BATCH)
+
+    assert [submission.virtual_finish for submission in alice] == [0.5, 1.0]
+    assert [submission.virtual_finish for submission in bob] == [1.0, 2.0]
+
+
+@patch("app.services.scheduler.get_job_submission_stats")
+def test_get_submission_queue_metrics(mock_stats, fake_db_session):
+    mock_stats.return_value = [
+        (
+            SubmissionPriorityEnum.BATCH,
+            5,
+            2,
+            datetime.datetime.utcnow() - datetime.timedelta(seconds=60),
+        )
+    ]
+
+    interactive, batch = get_submission_queue_metrics(fake_db_session)
+
+    assert (interactive.priority, interactive.depth, interactive.max_wait) == (
+        "interactive",
+        0,
+        0.0,
+    )
+    assert (batch.priority, batch.depth, batch.users) == ("batch", 5, 2)
+    assert 60 <= batch.max_wait < 65
+
+
+@patch("app.services.scheduler.count_claimed_job_submissions")
+@patch("app.services.scheduler.count_inflight_jobs")
+def test_get_inflight_jobs_includes_claimed_submissions(
+    mock_count_jobs, mock_count_claimed, inflight_limits, fake_db_session
+):
+    mock_count_jobs.return_value = {("https://limited.eo", "alice"): 1}
+    mock_count_claimed.return_value = {
+        ("https://limited.eo", "alice"): 1,
+        ("https://limited.eo", "bob"): 1,
+    }
+
+    assert get_inflight_jobs(fake_db_session) == {
+        ("https://limited.eo", "alice"): 2,
+        ("https://limited.eo", "bob"): 1,
+    }
+    mock_count_jobs.assert_called_once_with(
+        fake_db_session, ["https://limited.eo"], settings.inflight_stale_after
+    )
+
+
+def test_get_saturated_backends(inflight_limits):
+    assert get_saturated_backends({("https://limited.eo", "alice"): 1}) == []
+    assert get_saturated_backends({("https://limited.eo", "alice"): 2}) == [
+        ("https://limited.eo", "alice")
+    ]
+    assert get_saturated_backends(
+        {("https://limited.eo", "alice"): 2, ("https://limited.eo", "bob"): 1}
+    ) == [("https://limited.eo", None)]
+
+
+def test_admit_job_submissions_holds_back_over_limits(inflight_limits):
+    def make_submission(user_id, endpoint):
+        return JobSubmissionRecord(user_id=user_id, endpoint=endpoint)
+
+    submissions = [
+        make_submission("alice", "https://limited.eo"),
+        make_submission("alice", "https://limited.eo"),
+        make_submission("bob", "https://limited.eo"),
+        make_submission("bob", "https://limited.eo"),
+        make_submission("alice", "https://unlimited.eo"),
+        make_submission("alice", None),
+    ]
+
+    admitted, held = admit_job_submissions(
+        submissions, {("https://limited.eo", "alice"): 1}
+    )
+
+    # Alice reaches her own limit, after which Bob reaches the limit of the backend
+    assert admitted == [submissions[0], submissions[2], submissions[4], submissions[5]]
+    assert held == [submissions[1], submissions[3]]
@@ -0,0 +1,115 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.schemas.enum import ProcessingStatusEnum, ProcessTypeEnum
+from app.services.status_cache import StatusCache
+
+KEY_1 = (ProcessTypeEnum.OPENEO, "https://openeo.test", "job-1")
+KEY_2 = (ProcessTypeEnum.OPENEO, "https://openeo.test", "job-2")
+
+
+@pytest.mark.asyncio
+async def test_get_or_fetch_caches_status():
+    cache = StatusCache(ttl=60)
+    fetch = AsyncMock(return_value=ProcessingStatusEnum.RUNNING)
+
+    assert await cache.get_or_fetch(KEY_1, fetch) == ProcessingStatusEnum.RUNNING
+    assert await cache.get_or_fetch(KEY_1, fetch) == ProcessingStatusEnum.RUNNING
+    fetch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("app.services.status_cache.time.monotonic")
+async def test_get_or_fetch_refetches_expired_status(mock_monotonic):
+    cache = StatusCache(ttl=5)
+    fetch = AsyncMock(
+        side_effect=[ProcessingStatusEnum.RUNNING, ProcessingStatusEnum.FINISHED]
+    )
+
+    mock_monotonic.return_value = 100
+    assert await cache.get_or_fetch(KEY_1, fetch) == ProcessingStatusEnum.RUNNING
+    mock_monotonic.return_value = 106
+    assert await cache.get_or_fetch(KEY_1, fetch) == ProcessingStatusEnum.FINISHED
+    assert fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_or_fetch_does_not_cache_unknown_status():
+    cache = StatusCache(ttl=60)
+    fetch = AsyncMock(
+        side_effect=[ProcessingStatusEnum.UNKNOWN, ProcessingStatusEnum.RUNNING]
+    )
+
+    assert await cache.get_or_fetch(KEY_1, fetch) == ProcessingStatusEnum.UNKNOWN
+    assert await cache.get_or_fetch(KEY_1, fetch) == ProcessingStatusEnum.RUNNING
+
+
+@pytest.mark.asyncio
+async def test_get_or_fetch_coalesces_concurrent_requests():
+    cache = StatusCache(ttl=0)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ProcessingStatusEnum.QUEUED
+
+    results = await asyncio.gather(*[cache.get_or_fetch(KEY_1, fetch) for _ in range(5)])
+
+    assert results == [ProcessingStatusEnum.QUEUED] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_many_or_fetch_only_fetches_missing_keys():
+    cache = StatusCache(ttl=60)
+    await cache.get_or_fetch(KEY_1, AsyncMock(return_value=ProcessingStatusEnum.RUNNING))
+    fetch = AsyncMock(return_value={KEY_2: ProcessingStatusEnum.FAILED})
+
+    result = await cache.get_many_or_fetch([KEY_1, KEY_2], fetch)
+
+    assert result == {
+        KEY_1: ProcessingStatusEnum.RUNNING,
+        KEY_2: ProcessingStatusEnum.FAILED,
+    }
+    fetch.assert_awaited_once_with([KEY_2])
+
+
+@pytest.mark.asyncio
+async def test_get_many_or_fetch_releases_waiters_on_failure():
+    cache = StatusCache(ttl=60)
+
+    async def failing_fetch(keys):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("Platform unavailable")
+
+    results = await asyncio.gather(
+        cache.get_many_or_fetch([KEY_1], failing_fetch),
+        cache.get_many_or_fetch([KEY_1], AsyncMock()),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] == {}
+    # A new request retries the retrieval
+    fetch = AsyncMock(return_value={KEY_1: ProcessingStatusEnum.RUNNING})
+    assert await cache.get_many_or_fetch([KEY_1], fetch) == {
+        KEY_1: ProcessingStatusEnum.RUNNING
+    }
+
+
+@pytest.mark.asyncio
+@patch("app.services.status_cache.time.monotonic")
+async def test_store_purges_expired_statuses(mock_monotonic):
+    cache = StatusCache(ttl=5)
+    fetch = AsyncMock(return_value=ProcessingStatusEnum.FINISHED)
+
+    mock_monotonic.return_value = 100
+    await cache.get_or_fetch(KEY_1, fetch)
+    mock_monotonic.return_value = 106
+    await cache.get_or_fetch(KEY_2, fetch)
+
+    assert list(cache._entries) == [KEY_2]
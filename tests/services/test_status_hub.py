@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from app.services.status_hub import (
+    StatusDeltaEncoder,
+    StatusHub,
+    compute_status_delta,
+)
+
+
+async def next_status(updates: asyncio.Queue):
+    while True:
+        update = await asyncio.wait_for(updates.get(), timeout=1)
+        if update.type != "loading":
+            return update
+
+
+@pytest.mark.asyncio
+async def test_subscribers_share_status_computation():
+    hub = StatusHub()
+    calls = []
+
+    async def producer(token):
+        calls.append(token)
+        return {"count": len(calls)}
+
+    async with hub.subscribe("user-1", "token-1", producer, 60) as first:
+        assert (await next_status(first)).data == {"count": 1}
+
+        async with hub.subscribe("user-1", "token-2", producer, 60) as second:
+            # A new subscriber directly receives the latest status
+            assert (await next_status(second)).data == {"count": 1}
+            assert hub.subscriber_count("user-1") == 2
+
+    assert calls == ["token-1"]
+    assert hub.subscriber_count("user-1") == 0
+
+
+@pytest.mark.asyncio
+async def test_topics_are_computed_separately():
+    hub = StatusHub()
+
+    async def producer(token):
+        return token
+
+    async with hub.subscribe("user-1", "token-1", producer, 60) as first:
+        async with hub.subscribe("user-2", "token-2", producer, 60) as second:
+            assert (await next_status(first)).data == "token-1"
+            assert (await next_status(second)).data == "token-2"
+
+
+@pytest.mark.asyncio
+async def test_status_is_recomputed_every_interval():
+    hub = StatusHub()
+    calls = 0
+
+    async def producer(token):
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async with hub.subscribe("user-1", "token-1", producer, 0.01) as updates:
+        assert (await next_status(updates)).data == 1
+        assert (await next_status(updates)).data == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_broadcasted():
+    hub = StatusHub()
+
+    async def producer(token):
+        raise RuntimeError("Database connection lost")
+
+    async with hub.subscribe("user-1", "token-1", producer, 60) as updates:
+        update = await next_status(updates)
+
+    assert update.type == "error"
+    assert isinstance(update.error, RuntimeError)
+
+
+def make_status(*jobs):
+    return {
+        "upscaling_tasks": [],
+        "processing_jobs": [{"id": job_id, "status": status} for job_id, status in jobs],
+    }
+
+
+def test_compute_status_delta_only_contains_changes():
+    previous = make_status((1, "running"), (2, "queued"), (3, "running"))
+    current = make_status((1, "running"), (2, "running"), (4, "created"))
+
+    assert compute_status_delta(previous, current) == {
+        "processing_jobs": {
+            "updated": [{"id": 2, "status": "running"}, {"id": 4, "status": "created"}],
+            "removed": [3],
+        }
+    }
+
+
+def test_compute_status_delta_includes_changed_fields():
+    previous = {"id": 1, "status": "running", "jobs": [{"id": 1, "status": "running"}]}
+    current = {"id": 1, "status": "finished", "jobs": [{"id": 1, "status": "running"}]}
+
+    assert compute_status_delta(previous, current) == {"status": "finished"}
+
+
+def test_delta_encoder_sends_deltas_between_snapshots():
+    encoder = StatusDeltaEncoder(snapshot_interval=3)
+
+    first = make_status((1, "running"))
+    second = make_status((1, "finished"))
+
+    assert encoder.encode(first) == ("status", first, 1)
+    assert encoder.encode(second) == (
+        "delta",
+        {"processing_jobs": {"updated": [{"id": 1, "status": "finished"}], "removed": []}},
+        2,
+    )
+    # Nothing changed, nothing to send
+    assert encoder.encode(second) is None
+    # Periodic snapshot to allow clients to resync
+    assert encoder.encode(second) == ("status", second, 3)
@@ -0,0 +1,400 @@
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import status
+
+from app.config.schemas import BackendAuthConfig
+from app.config.settings import settings
+from app.database.models.job_submission import JobSubmissionRecord
+from app.error import AuthException
+from app.schemas.enum import ProcessingStatusEnum
+from app.services.submission import process_job_submissions
+
+
+def make_submission(idx, request, attempts=1, processing_job_id=None):
+    return JobSubmissionRecord(
+        id=idx,
+        upscaling_task_id=1,
+        processing_job_id=processing_job_id,
+        user_id="foobar",
+        token="foobar-token",
+        request=request.model_dump_json(),
+        attempts=attempts,
+        created=datetime.datetime.utcnow(),
+    )
+
+
+@pytest.mark.asyncio
+@patch("app.services.submission.remove_job_submissions")
+@patch("app.services.submission.update_submitted_jobs")
+@patch("app.services.submission.submit_processing_job")
+@patch("app.services.submission.claim_job_submissions")
+async def test_process_job_submissions_submits_concurrently(
+    mock_claim,
+    mock_submit,
+    mock_update_jobs,
+    mock_remove,
+    fake_processing_job_request,
+    fake_db_session,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "upscaling_submission_concurrency", 2)
+    mock_claim.return_value = [
+        make_submission(idx, fake_processing_job_request, processing_job_id=idx + 10)
+        for idx in range(1, 5)
+    ]
+    running = 0
+    max_running = 0
+
+    async def submit_job(token, request):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return f"platform-{request.title}"
+
+    mock_submit.side_effect = submit_job
+
+    assert await process_job_submissions(fake_db_session) == 4
+
+    assert max_running == 2
+    mock_submit.assert_called_with("foobar-token", fake_processing_job_request)
+    # The result of each job is stored as soon as it is submitted
+    assert [call.args[1] for call in mock_update_jobs.call_args_list] == [
+        {idx + 10: f"platform-{fake_processing_job_request.title}"} for idx in range(1, 5)
+    ]
+    assert [call.args[1] for call in mock_remove.call_args_list] == [
+        [idx] for idx in range(1, 5)
+    ]
+
+
+@pytest.mark.asyncio
+@patch("app.services.submission.remove_job_submissions")
+@patch("app.services.submission.update_submitted_jobs")
+@patch("app.services.submission.submit_processing_job")
+@patch("app.services.submission.claim_job_submissions")
+async def test_process_job_submissions_stores_each_job_once_submitted(
+    mock_claim,
+    mock_submit,
+    mock_update_jobs,
+    mock_remove,
+    fake_processing_job_request,
+    fake_db_session,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "upscaling_submission_concurrency", 1)
+    mock_claim.return_value = [
+        make_submission(idx, fake_processing_job_request, processing_job_id=idx + 10)
+        for idx in range(1, 3)
+    ]
+    stored_before_submit = []
+
+    async def submit_job(token, request):
+        stored_before_submit.append(mock_remove.call_count)
+        if len(stored_before_submit) == 2:
+            raise asyncio.CancelledError()
+        return "platform-job-1"
+
+    mock_submit.side_effect = submit_job
+
+    # The worker is stopped while submitting the second job
+    with pytest.raises(asyncio.CancelledError):
+        await process_job_submissions(fake_db_session)
+
+    assert stored_before_submit == [0, 1]
+    mock_update_jobs.assert_called_once_with(fake_db_session, {11: "platform-job-1"})
+    mock_remove.assert_called_once_with(fake_db_session, [1])
+
+
+@pytest.mark.asyncio
+@patch("app.services.submission.remove_job_submissions")
+@patch("app.services.submission.update_submitted_jobs")
+@patch("app.services.submission.submit_processing_job")
+@patch("app.services.submission.claim_job_submissions")
+async def test_process_job_submissions_retries_failed_submissions(
+    mock_claim,
+    mock_submit,
+    mock_update_jobs,
+    mock_remove,
+    fake_processing_job_request,
+    fake_db_session,
+):
+    mock_claim.return_value = [
+        make_submission(1, fake_processing_job_request, processing_job_id=10)
+    ]
+    mock_submit.side_effect = RuntimeError("Platform unavailable")
+
+    await process_job_submissions(fake_db_session)
+
+    # The submission stays queued and is claimed again once its lease expires
+    mock_update_jobs.assert_not_called()
+    mock_remove.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.services.submission.remove_job_submissions")
+@patch("app.services.submission.update_submitted_jobs")
+@patch("app.services.submission.submit_processing_job")
+@patch("app.services.submission.claim_job_submissions")
+async def test_process_job_submissions_fails_job_after_max_attempts(
+    mock_claim,
+    mock_submit,
+    mock_update_jobs,
+    mock_remove,
+    fake_processing_job_request,
+    fake_db_session,
+):
+    mock_claim.return_value = [
+        make_submission(
+            1,
+            fake_processing_job_request,
+            attempts=settings.submission_max_attempts,
+            processing_job_id=10,
+        )
+    ]
+    mock_submit.side_effect = RuntimeError("Platform unavailable")
+
+    await process_job_submissions(fake_db_session)
+
+    mock_update_jobs.assert_called_once_with(fake_db_session, {10: None})
+    mock_remove.assert_called_once_with(fake_db_session, [1])
+
+
+@pytest.mark.asyncio
+@patch("app.services.submission.remove_job_submissions")
+@patch("app.services.submission.update_submitted_jobs")
+@patch("app.services.submission.submit_processing_job")
+@patch("app.services.submission.claim_job_submissions")
+@patch("app.services.submission.fail_expired_job_submissions")
+async def test_process_job_submissions_fails_job_with_invalid_credential(
+    mock_fail_expired,
+    mock_claim,
+    mock_submit,
+    mock_update_jobs,
+    mock_remove,
+    fake_processing_job_request,
+    fake_db_session,
+    monkeypatch,
+):
+    mock_claim.return_value = [
+        make_submission(1, fake_processing_job_request, processing_job_id=10)
+    ]
+    monkeypatch.setattr(
+        "app.services.submission.get_submission_access_token",
+        AsyncMock(
+            side_effect=AuthException(
+                http_status=status.HTTP_401_UNAUTHORIZED, message="Invalid credential"
+            )
+        ),
+    )
+
+    await process_job_submissions(fake_db_session)
+
+    # Expired credentials are swept before claiming, invalid ones fail without retrying
+    mock_fail_expired.assert_called_once_with(fake_db_session, settings.submission_lease)
+    mock_submit.assert_not_called()
+    mock_update_jobs.assert_called_once_with(fake_db_session, {10: None})
+    mock_remove.assert_called_once_with(fake_db_session, [1])
+
+
+@pytest.mark.asyncio
+@patch("app.services.submission.remove_job_submissions")
+@patch("app.services.submission.update_submitted_jobs")
+@patch("app.services.submission.submit_processing_job")
+@patch("app.services.submission.claim_job_submissions")
+async def test_process_job_submissions_creates_job_of_legacy_submission(
+    mock_claim,
+    mock_submit,
+    mock_update_jobs,
+    mock_remove,
+    fake_processing_job_request,
+    fake_db_session,
+):
+    mock_claim.return_value = [make_submission(1, fake_processing_job_request)]
+    mock_submit.return_value = "platform-job-1"
+
+    await process_job_submissions(fake_db_session)
+
+    record = fake_db_session.add.call_args.args[0]
+    assert record.status == ProcessingStatusEnum.CREATED
+    assert record.platform_job_id == "platform-job-1"
+    assert record.upscaling_task_id == 1
+    assert record.title == fake_processing_job_request.title
+    mock_remove.assert_called_once_with(fake_db_session, [1])
+
+
+@pytest.mark.asyncio
+@patch("app.services.submission.remove_job_submissions")
+@patch("app.services.submission.update_submitted_jobs")
+@patch("app.services.submission.release_job_submissions")
+@patch("app.services.submission.submit_processing_job")
+@patch("app.services.submission.claim_job_submissions")
+@patch("app.services.submission.get_inflight_jobs")
+@patch("app.services.submission.lock_backends")
+async def test_process_job_submissions_holds_back_saturated_backends(
+    mock_lock,
+    mock_inflight,
+    mock_claim,
+    mock_submit,
+    mock_release,
+    mock_update_jobs,
+    mock_remove,
+    fake_processing_job_request,
+    fake_db_session,
+    monkeypatch,
+):
+    endpoint = fake_processing_job_request.service.endpoint
+    monkeypatch.setattr(
+        settings,
+        "backend_auth_config",
+        {endpoint: BackendAuthConfig(max_inflight_jobs_per_user=2)},
+    )
+    mock_lock.return_value = {endpoint}
+    mock_inflight.return_value = {(endpoint, "foobar"): 1}
+    submissions = [
+        make_submission(idx, fake_processing_job_request, processing_job_id=idx + 10)
+        for idx in range(1, 4)
+    ]
+    for submission in submissions:
+        submission.endpoint = endpoint
+    mock_claim.return_value = submissions
+    mock_submit.return_value = "platform-job"
+
+    assert await process_job_submissions(fake_db_session) == 1
+
+    assert mock_claim.call_args.args[3] == []
+    mock_release.assert_called_once_with(fake_db_session, submissions[1:])
+    mock_update_jobs.assert_called_once_with(fake_db_session, {11: "platform-job"})
+    mock_remove.assert_called_once_with(fake_db_session, [1])
+
+
+@pytest.mark.asyncio
+@patch("app.services.submission.claim_job_submissions")
+@patch("app.services.submission.get_inflight_jobs")
+@patch("app.services.submission.lock_backends")
+async def test_process_job_submissions_skips_backends_locked_by_other_workers(
+    mock_lock,
+    mock_inflight,
+    mock_claim,
+    fake_db_session,
+    monkeypatch,
+):
+    monkeypatch.setattr(
+        settings,
+        "backend_auth_config",
+        {
+            "https://openeo.a": BackendAuthConfig(max_inflight_jobs=2),
+            "https://openeo.b": BackendAuthConfig(max_inflight_jobs=2),
+        },
+    )
+    mock_lock.return_value = {"https://openeo.a"}
+    mock_inflight.return_value = {("https://openeo.a", "foobar"): 2}
+    mock_claim.return_value = []
+
+    assert await process_job_submissions(fake_db_session) == 0
+
+    mock_lock.assert_called_once_with(fake_db_session, ["https://openeo.a", "https://openeo.b"])
+    assert mock_claim.call_args.args[3] == [
+        ("https://openeo.a", None),
+        ("https://openeo.b", None),
+    ]
+
+
+@pytest.mark.asyncio
+@patch("app.services.submission.remove_job_submissions")
+@patch("app.services.submission.update_submitted_jobs")
+@patch("app.services.submission.submit_processing_job")
+@patch("app.services.submission.get_submitted_job_ids")
+@patch("app.services.submission.claim_job_submissions")
+async def test_process_job_submissions_skips_submitted_jobs(
+    mock_claim,
+    mock_get_submitted,
+    mock_submit,
+    mock_update_jobs,
+    mock_remove,
+    fake_processing_job_request,
+    fake_db_session,
+):
+    mock_claim.return_value = [
+        make_submission(idx, fake_processing_job_request, processing_job_id=idx + 10)
+        for idx in range(1, 3)
+    ]
+    mock_get_submitted.return_value = {11}
+    mock_submit.return_value = "platform-job"
+
+    assert await process_job_submissions(fake_db_session) == 1
+
+    mock_submit.assert_called_once()
+    mock_update_jobs.assert_called_once_with(fake_db_session, {12: "platform-job"})
+    assert [call.args[1] for call in mock_remove.call_args_list] == [[1], [2]]
+
+
+@pytest.mark.asyncio
+@patch("app.services.submission.remove_job_submissions")
+@patch("app.services.submission.update_submitted_jobs")
+@patch("app.services.submission.get_processing_platform")
+@patch("app.services.submission.submit_processing_job")
+@patch("app.services.submission.claim_job_submissions")
+async def test_process_job_submissions_cancels_rejected_jobs(
+    mock_claim,
+    mock_submit,
+    mock_get_platform,
+    mock_update_jobs,
+    mock_remove,
+    fake_processing_job_request,
+    fake_db_session,
+):
+    mock_claim.return_value = [
+        make_submission(idx, fake_processing_job_request, processing_job_id=idx + 10)
+        for idx in range(1, 3)
+    ]
+    mock_submit.side_effect = ["platform-job-1", "platform-job-2"]
+    # The first job was canceled while it was being submitted
+    mock_update_jobs.side_effect = [{11}, set()]
+    mock_get_platform.return_value.cancel_job = AsyncMock()
+
+    assert await process_job_submissions(fake_db_session) == 2
+
+    assert [call.args[1] for call in mock_update_jobs.call_args_list] == [
+        {11: "platform-job-1"},
+        {12: "platform-job-2"},
+    ]
+    assert [call.args[1] for call in mock_remove.call_args_list] == [[1], [2]]
+    mock_get_platform.return_value.cancel_job.assert_awaited_once_with(
+        "foobar-token", "platform-job-1", fake_processing_job_request.service
+    )
+
+
+@pytest.mark.asyncio
+@patch("app.services.submission.remove_job_submissions")
+@patch("app.services.submission.update_submitted_jobs")
+@patch("app.services.submission.submit_processing_job")
+@patch("app.services.submission.renew_job_submission_claim")
+@patch("app.services.submission.claim_job_submissions")
+async def test_process_job_submissions_skips_submissions_with_expired_lease(
+    mock_claim,
+    mock_renew,
+    mock_submit,
+    mock_update_jobs,
+    mock_remove,
+    fake_processing_job_request,
+    fake_db_session,
+):
+    submissions = [
+        make_submission(idx, fake_processing_job_request, processing_job_id=idx + 10)
+        for idx in range(1, 3)
+    ]
+    mock_claim.return_value = submissions
+    # The lease of the second submission expired while waiting for the rate limiter
+    mock_renew.side_effect = [True, False]
+    mock_submit.return_value = "platform-job-1"
+
+    await process_job_submissions(fake_db_session)
+
+    assert [call.args[1] for call in mock_renew.call_args_list] == submissions
+    mock_submit.assert_called_once()
+    mock_update_jobs.assert_called_once_with(fake_db_session, {11: "platform-job-1"})
+    mock_remove.assert_called_once_with(fake_db_session, [1])
@@ -1,8 +1,16 @@
+from typing import Iterator
+
 from geojson_pydantic import GeometryCollection, Polygon
 import pytest
 
+from app.config.settings import settings
+from app.error import TileLimitException
 from app.schemas.tiles import GridTypeEnum
-from app.services.tiles.base import split_polygon_by_grid
+from app.services.tiles.base import (
+    iter_polygon_by_grid,
+    split_polygon_by_grid,
+    validate_polygon_tiles,
+)
 
 
 def test_split_polygon_by_grid_known_grid():
@@ -21,3 +29,33 @@ def test_split_polygon_by_grid_unknown_grid_raises():
 
     with pytest.raises(ValueError):
         split_polygon_by_grid(polygon, "UNKNOWN_GRID")
+
+
+def test_iter_polygon_by_grid_yields_tiles_lazily():
+    coords = [[(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]]
+    polygon = Polygon(type="Polygon", coordinates=coords)
+
+    tiles = iter_polygon_by_grid(polygon, GridTypeEnum.KM_20)
+    assert isinstance(tiles, Iterator)
+    assert next(tiles) == split_polygon_by_grid(polygon, GridTypeEnum.KM_20).geometries[0]
+
+
+def test_split_polygon_by_grid_rejects_too_many_tiles(monkeypatch):
+    monkeypatch.setattr(settings, "max_grid_tiles", 35)
+    coords = [[(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]]
+    polygon = Polygon(type="Polygon", coordinates=coords)
+
+    with pytest.raises(TileLimitException):
+        split_polygon_by_grid(polygon, GridTypeEnum.KM_20)
+
+
+def test_validate_polygon_tiles(monkeypatch):
+    coords = [[(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]]
+    polygon = Polygon(type="Polygon", coordinates=coords)
+
+    monkeypatch.setattr(settings, "max_grid_tiles", 36)
+    validate_polygon_tiles(polygon, GridTypeEnum.KM_20)
+
+    monkeypatch.setattr(settings, "max_grid_tiles", 35)
+    with pytest.raises(TileLimitException):
+        validate_polygon_tiles(polygon, GridTypeEnum.KM_20)
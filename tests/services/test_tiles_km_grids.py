@@ -1,15 +1,17 @@
 from geojson_pydantic import GeometryCollection, Polygon
 
-from app.services.tiles.grids.km_grids import _split_by_km_grid, split_by_20x20_km_grid
+from app.schemas.tiles import GridTypeEnum
+from app.services.tiles.base import iter_polygon_by_grid
+from app.services.tiles.grids.km_grids import split_by_20x20_km_grid
 
 
-def test__split_by_km_grid_creates_multiple_cells():
+def test_iter_polygon_by_km_grid_creates_multiple_cells():
     coords = [[(0, 0), (0.36, 0), (0.36, 0.36), (0, 0.36), (0, 0)]]
     polygon = Polygon(type="Polygon", coordinates=coords)
 
-    result = _split_by_km_grid(polygon, 10.0)
+    result = list(iter_polygon_by_grid(polygon, GridTypeEnum.KM_20))
 
-    assert len(result) == 25
+    assert len(result) == 9
     for geom in result:
         assert geom.type == "Polygon"
 
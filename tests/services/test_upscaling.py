@@ -1,22 +1,47 @@
+import json
 from datetime import datetime
-from unittest.mock import call, patch
+from unittest.mock import patch
 
 import pytest
+from geojson_pydantic import Polygon
 
+from app.config.settings import settings
+from app.database.db import get_column_values
+from app.database.models.processing_job import ProcessingJobRecord
 from app.database.models.upscaling_task import UpscalingTaskRecord
-from app.schemas.enum import ProcessTypeEnum, ProcessingStatusEnum
+from app.error import TaskConflictException, TileLimitException
+from app.schemas.enum import (
+    ProcessTypeEnum,
+    ProcessingStatusEnum,
+    SubmissionPriorityEnum,
+)
+from app.schemas.tiles import GridTypeEnum
 from app.schemas.unit_job import (
     BaseJobRequest,
     ProcessingJobSummary,
     ServiceDetails,
 )
+from app.schemas.upscale_task import (
+    GridDimension,
+    ParameterDimension,
+    StreamedDimension,
+    UpscalingTaskRequest,
+    UpscalingTaskStreamRequest,
+)
+from app.services.processing import get_job_request_hash
 from app.services.upscaling import (
+    _get_progress,
     _get_upscale_status,
     _refresh_record_status,
-    create_upscaling_processing_jobs,
+    cancel_upscaling_task,
     create_upscaling_task,
     get_upscaling_task_by_user_id,
+    get_upscaling_job_requests,
+    get_upscaling_task_request_hash,
     get_upscaling_tasks_by_user_id,
+    queue_streamed_upscaling_processing_jobs,
+    queue_upscaling_processing_jobs,
+    resume_upscaling_task,
 )
 
 
@@ -62,44 +87,571 @@ def test_create_upscaling_task_creates_task(
     assert result == fake_upscaling_task_summary
 
 
-@pytest.mark.asyncio
-@patch("app.services.upscaling.create_processing_job")
+@patch("app.services.upscaling.save_upscaling_task_to_db")
+@patch("app.services.upscaling.get_current_user_id")
+def test_create_upscaling_task_rejects_too_many_tiles(
+    mock_current_user,
+    mock_save_upscaling_task,
+    fake_upscaling_task_request,
+    fake_db_session,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "max_grid_tiles", 10)
+    mock_current_user.return_value = "foobar"
+    request = fake_upscaling_task_request.model_copy(
+        update={
+            "dimension": GridDimension(
+                name="spatial_extent",
+                aoi=Polygon(
+                    type="Polygon",
+                    coordinates=[[(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]],
+                ),
+                grid=GridTypeEnum.KM_20,
+            )
+        }
+    )
+
+    with pytest.raises(TileLimitException):
+        create_upscaling_task("foobar-token", fake_db_session, request)
+    mock_save_upscaling_task.assert_not_called()
+
+
+@patch("app.services.upscaling.queue_job_submissions")
+@patch("app.services.upscaling.add_upscaling_jobs_to_db")
 @patch("app.services.upscaling.get_current_user_id")
-async def test_create_upscaling_task_creates_jobs(
+def test_queue_upscaling_processing_jobs(
     mock_current_user,
-    mock_create_processing_job,
+    mock_add_jobs,
+    mock_queue_submissions,
     fake_upscaling_task_request,
     fake_upscaling_task_record,
-    fake_processing_job_summary,
+    fake_submission_credential,
     fake_db_session,
 ):
     mock_current_user.return_value = "foobar"
-    mock_create_processing_job.return_value = fake_processing_job_summary
-    result = await create_upscaling_processing_jobs(
-        "foobar-token", fake_db_session, fake_upscaling_task_request, 1
+    mock_add_jobs.side_effect = lambda database, task_id, jobs: [
+        ProcessingJobRecord(id=idx + 10, **get_column_values(job))
+        for idx, job in enumerate(jobs)
+    ]
+
+    result = queue_upscaling_processing_jobs(
+        "foobar-token",
+        fake_db_session,
+        fake_upscaling_task_request,
+        fake_upscaling_task_record.id,
+        fake_submission_credential,
     )
 
-    expected_calls = [
-        call(
-            token="foobar-token",
-            database=fake_db_session,
-            request=BaseJobRequest(
-                title=f"{fake_upscaling_task_request.title} - Processing Job {idx + 1}",
-                label=fake_upscaling_task_request.label,
-                parameters={
-                    **fake_upscaling_task_request.parameters,
-                    fake_upscaling_task_request.dimension.name: value,
-                },
-                service=fake_upscaling_task_request.service,
-                format=fake_upscaling_task_request.format,
-            ),
-            upscaling_task_id=fake_upscaling_task_record.id,
+    expected_requests = [
+        BaseJobRequest(
+            title=f"{fake_upscaling_task_request.title} - Processing Job {idx + 1}",
+            label=fake_upscaling_task_request.label,
+            parameters={
+                **fake_upscaling_task_request.parameters,
+                fake_upscaling_task_request.dimension.name: value,
+            },
+            service=fake_upscaling_task_request.service,
+            format=fake_upscaling_task_request.format,
         )
         for idx, value in enumerate(fake_upscaling_task_request.dimension.values)
     ]
+    assert result == len(expected_requests)
+
+    # All jobs are created at once
+    task_id, jobs = mock_add_jobs.call_args.args[1:]
+    assert task_id == fake_upscaling_task_record.id
+    assert [job.title for job in jobs] == [request.title for request in expected_requests]
+    assert all(job.status == ProcessingStatusEnum.QUEUED for job in jobs)
+
+    submissions, priority = mock_queue_submissions.call_args.args[1:]
+    assert priority == SubmissionPriorityEnum.BATCH
+    assert [
+        BaseJobRequest.model_validate_json(submission.request) for submission in submissions
+    ] == expected_requests
+    assert [submission.processing_job_id for submission in submissions] == [
+        idx + 10 for idx in range(len(expected_requests))
+    ]
+    assert all(
+        submission.token == fake_submission_credential.token for submission in submissions
+    )
+
+
+@patch("app.services.upscaling.JOB_BATCH_SIZE", 2)
+@patch("app.services.upscaling.queue_job_submissions")
+@patch("app.services.upscaling.add_upscaling_jobs_to_db")
+@patch("app.services.upscaling.get_current_user_id")
+def test_queue_upscaling_processing_jobs_in_batches(
+    mock_current_user,
+    mock_add_jobs,
+    mock_queue_submissions,
+    fake_upscaling_task_request,
+    fake_submission_credential,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    mock_add_jobs.side_effect = lambda database, task_id, jobs: [
+        ProcessingJobRecord(id=idx, **get_column_values(job))
+        for idx, job in enumerate(jobs)
+    ]
+    request = fake_upscaling_task_request.model_copy(
+        update={
+            "dimension": fake_upscaling_task_request.dimension.model_copy(
+                update={"values": [1, 2, 3, 4, 5]}
+            )
+        }
+    )
+
+    result = queue_upscaling_processing_jobs(
+        "foobar-token", fake_db_session, request, 1, fake_submission_credential
+    )
+
+    assert result == 5
+    assert [len(call.args[2]) for call in mock_add_jobs.call_args_list] == [2, 2, 1]
+    assert [len(call.args[1]) for call in mock_queue_submissions.call_args_list] == [2, 2, 1]
+    titles = [job.title for call in mock_add_jobs.call_args_list for job in call.args[2]]
+    assert titles == [f"{request.title} - Processing Job {idx}" for idx in range(1, 6)]
+
+
+@pytest.mark.asyncio
+@patch("app.services.upscaling.JOB_BATCH_SIZE", 2)
+@patch("app.services.upscaling.update_upscale_task_request_hash")
+@patch("app.services.upscaling._refresh_record_status")
+@patch("app.services.upscaling.get_upscale_task_by_user_id")
+@patch("app.services.upscaling.queue_job_submissions")
+@patch("app.services.upscaling.add_upscaling_jobs_to_db")
+@patch("app.services.upscaling.get_current_user_id")
+async def test_queue_streamed_upscaling_processing_jobs(
+    mock_current_user,
+    mock_add_jobs,
+    mock_queue_submissions,
+    mock_get_task,
+    mock_refresh_status,
+    mock_update_hash,
+    fake_upscaling_task_request,
+    fake_upscaling_task_record,
+    fake_submission_credential,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    mock_add_jobs.side_effect = lambda database, task_id, jobs: [
+        ProcessingJobRecord(id=idx, **get_column_values(job))
+        for idx, job in enumerate(jobs)
+    ]
+    mock_get_task.return_value = fake_upscaling_task_record
+    request = UpscalingTaskStreamRequest(
+        **fake_upscaling_task_request.model_dump(exclude={"dimension"}),
+        dimension=StreamedDimension(name="spatial_extent"),
+    )
+
+    async def values():
+        for value in range(3):
+            # The first batch is queued before the remaining values are received
+            assert mock_add_jobs.call_count == (1 if value == 2 else 0)
+            yield value
+
+    result = await queue_streamed_upscaling_processing_jobs(
+        "foobar-token", fake_db_session, request, values(), 1, fake_submission_credential
+    )
+
+    assert result == 3
+    jobs = [job for call in mock_add_jobs.call_args_list for job in call.args[2]]
+    assert [job.title for job in jobs] == [
+        f"{request.title} - Processing Job {idx}" for idx in range(1, 4)
+    ]
+    assert [json.loads(job.parameters)["spatial_extent"] for job in jobs] == [0, 1, 2]
+    assert mock_queue_submissions.call_count == 2
+    mock_refresh_status.assert_called_once_with(fake_db_session, fake_upscaling_task_record)
+    # The streamed task can be resumed with the same values listed in the request
+    listed_request = fake_upscaling_task_request.model_copy(
+        update={"dimension": ParameterDimension(name="spatial_extent", values=[0, 1, 2])}
+    )
+    mock_update_hash.assert_called_once_with(
+        fake_db_session, 1, get_upscaling_task_request_hash(listed_request)
+    )
+
+
+@patch("app.services.upscaling.find_reusable_jobs")
+@patch("app.services.upscaling.queue_job_submissions")
+@patch("app.services.upscaling.add_upscaling_jobs_to_db")
+@patch("app.services.upscaling.get_current_user_id")
+def test_queue_upscaling_processing_jobs_reuses_finished_jobs(
+    mock_current_user,
+    mock_add_jobs,
+    mock_queue_submissions,
+    mock_find_reusable_jobs,
+    fake_upscaling_task_request,
+    fake_submission_credential,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    mock_add_jobs.side_effect = lambda database, task_id, jobs: [
+        ProcessingJobRecord(id=idx, **get_column_values(job))
+        for idx, job in enumerate(jobs)
+    ]
+    request = fake_upscaling_task_request.model_copy(update={"reuse_results": True})
+    first_request = next(get_upscaling_job_requests(request))
+    assert first_request.reuse_results
+    mock_find_reusable_jobs.return_value = {
+        get_job_request_hash(first_request): ProcessingJobRecord(
+            id=1, platform_job_id="finished-job"
+        )
+    }
+
+    queue_upscaling_processing_jobs(
+        "foobar-token", fake_db_session, request, 1, fake_submission_credential
+    )
+
+    jobs = mock_add_jobs.call_args.args[2]
+    assert jobs[0].status == ProcessingStatusEnum.FINISHED
+    assert jobs[0].platform_job_id == "finished-job"
+    assert all(job.status == ProcessingStatusEnum.QUEUED for job in jobs[1:])
+    submissions = mock_queue_submissions.call_args.args[1]
+    assert [submission.processing_job_id for submission in submissions] == list(
+        range(1, len(jobs))
+    )
+
+
+@patch("app.services.upscaling.get_upscaling_job_indices")
+@patch("app.services.upscaling.queue_job_submissions")
+@patch("app.services.upscaling.add_upscaling_jobs_to_db")
+@patch("app.services.upscaling.get_current_user_id")
+def test_queue_upscaling_processing_jobs_skips_existing_jobs(
+    mock_current_user,
+    mock_add_jobs,
+    mock_queue_submissions,
+    mock_get_indices,
+    fake_upscaling_task_request,
+    fake_submission_credential,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    mock_add_jobs.side_effect = lambda database, task_id, jobs: [
+        ProcessingJobRecord(id=idx + 10, **get_column_values(job))
+        for idx, job in enumerate(jobs)
+    ]
+    mock_get_indices.return_value = {0}
+
+    result = queue_upscaling_processing_jobs(
+        "foobar-token", fake_db_session, fake_upscaling_task_request, 1, fake_submission_credential
+    )
+
+    assert result == 1
+    assert mock_get_indices.call_args.args[1:] == (1, [0, 1])
+    jobs = mock_add_jobs.call_args.args[2]
+    assert [(job.dimension_index, job.idempotency_key) for job in jobs] == [(1, "1:1")]
+    assert jobs[0].title == f"{fake_upscaling_task_request.title} - Processing Job 2"
+    submissions = mock_queue_submissions.call_args.args[1]
+    assert [submission.processing_job_id for submission in submissions] == [10]
+
+
+@patch("app.services.upscaling._refresh_record_status")
+@patch("app.services.upscaling.queue_job_submissions")
+@patch("app.services.upscaling.get_unqueued_upscaling_jobs")
+@patch("app.services.upscaling.queue_upscaling_processing_jobs")
+@patch("app.services.upscaling.count_unindexed_upscaling_jobs")
+@patch("app.services.upscaling.get_upscale_task_by_user_id")
+@patch("app.services.upscaling.get_current_user_id")
+def test_resume_upscaling_task_queues_missing_jobs(
+    mock_current_user,
+    mock_get_task,
+    mock_count_unindexed,
+    mock_queue_jobs,
+    mock_get_unqueued,
+    mock_queue_submissions,
+    mock_refresh_status,
+    fake_upscaling_task_request,
+    fake_upscaling_task_record,
+    fake_processing_job_record,
+    fake_submission_credential,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    fake_upscaling_task_record.request_hash = get_upscaling_task_request_hash(
+        fake_upscaling_task_request
+    )
+    mock_get_task.return_value = fake_upscaling_task_record
+    mock_count_unindexed.return_value = 0
+    mock_queue_jobs.return_value = 1
+    fake_processing_job_record.platform_job_id = None
+    fake_processing_job_record.user_id = "foobar"
+    mock_get_unqueued.return_value = [fake_processing_job_record]
+    mock_refresh_status.return_value = fake_upscaling_task_record
+
+    result = resume_upscaling_task(
+        "foobar-token", fake_db_session, 1, fake_upscaling_task_request, fake_submission_credential
+    )
+
+    assert result.id == fake_upscaling_task_record.id
+    mock_queue_jobs.assert_called_once_with(
+        "foobar-token", fake_db_session, fake_upscaling_task_request, 1, fake_submission_credential
+    )
+    submissions, priority = mock_queue_submissions.call_args.args[1:]
+    assert priority == SubmissionPriorityEnum.BATCH
+    assert [submission.processing_job_id for submission in submissions] == [
+        fake_processing_job_record.id
+    ]
+    request = BaseJobRequest.model_validate_json(submissions[0].request)
+    assert request.title == fake_processing_job_record.title
+    assert request.format == fake_upscaling_task_request.format
 
-    mock_create_processing_job.assert_has_calls(expected_calls)
-    assert len(result) == len(fake_upscaling_task_request.dimension.values)
+
+@patch("app.services.upscaling.queue_upscaling_processing_jobs")
+@patch("app.services.upscaling.get_upscale_task_by_user_id")
+@patch("app.services.upscaling.get_current_user_id")
+def test_resume_upscaling_task_rejects_other_service(
+    mock_current_user,
+    mock_get_task,
+    mock_queue_jobs,
+    fake_upscaling_task_request,
+    fake_upscaling_task_record,
+    fake_submission_credential,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    mock_get_task.return_value = fake_upscaling_task_record
+    request = fake_upscaling_task_request.model_copy(
+        update={"service": ServiceDetails(endpoint="foo", application="other")}
+    )
+
+    with pytest.raises(TaskConflictException):
+        resume_upscaling_task(
+            "foobar-token", fake_db_session, 1, request, fake_submission_credential
+        )
+    mock_queue_jobs.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        {"parameters": {"temporal_extent": ["2025-01-01", "2025-01-31"]}},
+        {"dimension": ParameterDimension(name="spatial_extent", values=[1])},
+        {"title": "Other title"},
+    ],
+)
+@patch("app.services.upscaling.queue_upscaling_processing_jobs")
+@patch("app.services.upscaling.get_upscale_task_by_user_id")
+@patch("app.services.upscaling.get_current_user_id")
+def test_resume_upscaling_task_rejects_other_request(
+    mock_current_user,
+    mock_get_task,
+    mock_queue_jobs,
+    update,
+    fake_upscaling_task_request,
+    fake_upscaling_task_record,
+    fake_submission_credential,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    fake_upscaling_task_record.request_hash = get_upscaling_task_request_hash(
+        fake_upscaling_task_request
+    )
+    mock_get_task.return_value = fake_upscaling_task_record
+    request = fake_upscaling_task_request.model_copy(update=update)
+
+    with pytest.raises(TaskConflictException):
+        resume_upscaling_task(
+            "foobar-token", fake_db_session, 1, request, fake_submission_credential
+        )
+    mock_queue_jobs.assert_not_called()
+
+
+@patch("app.services.upscaling.queue_upscaling_processing_jobs")
+@patch("app.services.upscaling.count_unindexed_upscaling_jobs")
+@patch("app.services.upscaling.get_upscale_task_by_user_id")
+@patch("app.services.upscaling.get_current_user_id")
+def test_resume_upscaling_task_rejects_unindexed_jobs(
+    mock_current_user,
+    mock_get_task,
+    mock_count_unindexed,
+    mock_queue_jobs,
+    fake_upscaling_task_request,
+    fake_upscaling_task_record,
+    fake_submission_credential,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    mock_get_task.return_value = fake_upscaling_task_record
+    mock_count_unindexed.return_value = 2
+
+    with pytest.raises(TaskConflictException):
+        resume_upscaling_task(
+            "foobar-token",
+            fake_db_session,
+            1,
+            fake_upscaling_task_request,
+            fake_submission_credential,
+        )
+    mock_queue_jobs.assert_not_called()
+
+
+@patch("app.services.upscaling.queue_upscaling_processing_jobs")
+@patch("app.services.upscaling.get_upscale_task_by_user_id")
+@patch("app.services.upscaling.get_current_user_id")
+def test_resume_upscaling_task_rejects_canceled_task(
+    mock_current_user,
+    mock_get_task,
+    mock_queue_jobs,
+    fake_upscaling_task_request,
+    fake_upscaling_task_record,
+    fake_submission_credential,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    fake_upscaling_task_record.status = ProcessingStatusEnum.CANCELED
+    mock_get_task.return_value = fake_upscaling_task_record
+
+    with pytest.raises(TaskConflictException, match="canceled"):
+        resume_upscaling_task(
+            "foobar-token",
+            fake_db_session,
+            1,
+            fake_upscaling_task_request,
+            fake_submission_credential,
+        )
+    mock_queue_jobs.assert_not_called()
+
+
+@patch("app.services.upscaling.queue_upscaling_processing_jobs")
+@patch("app.services.upscaling.get_unqueued_upscaling_jobs")
+@patch("app.services.upscaling.count_unindexed_upscaling_jobs")
+@patch("app.services.upscaling.get_upscale_task_by_user_id")
+@patch("app.services.upscaling.get_current_user_id")
+def test_resume_upscaling_task_rejects_task_without_missing_jobs(
+    mock_current_user,
+    mock_get_task,
+    mock_count_unindexed,
+    mock_get_unqueued,
+    mock_queue_jobs,
+    fake_upscaling_task_request,
+    fake_upscaling_task_record,
+    fake_submission_credential,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    fake_upscaling_task_record.request_hash = get_upscaling_task_request_hash(
+        fake_upscaling_task_request
+    )
+    fake_upscaling_task_record.jobs_total = len(fake_upscaling_task_request.dimension.values)
+    mock_get_task.return_value = fake_upscaling_task_record
+    mock_count_unindexed.return_value = 0
+    mock_get_unqueued.return_value = []
+
+    with pytest.raises(TaskConflictException, match="no missing"):
+        resume_upscaling_task(
+            "foobar-token",
+            fake_db_session,
+            1,
+            fake_upscaling_task_request,
+            fake_submission_credential,
+        )
+    mock_queue_jobs.assert_not_called()
+
+
+@patch("app.services.upscaling.get_upscale_task_by_user_id")
+@patch("app.services.upscaling.get_current_user_id")
+def test_resume_upscaling_task_returns_none_if_not_found(
+    mock_current_user,
+    mock_get_task,
+    fake_upscaling_task_request,
+    fake_submission_credential,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    mock_get_task.return_value = None
+
+    assert (
+        resume_upscaling_task(
+            "foobar-token",
+            fake_db_session,
+            1,
+            fake_upscaling_task_request,
+            fake_submission_credential,
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+@patch("app.services.upscaling.update_upscale_task_statuses")
+@patch("app.services.upscaling.cancel_processing_jobs")
+@patch("app.services.upscaling.get_submitted_upscaling_jobs")
+@patch("app.services.upscaling.cancel_queued_upscaling_jobs")
+@patch("app.services.upscaling.remove_pending_job_submissions")
+@patch("app.services.upscaling.get_upscale_task_by_user_id")
+@patch("app.services.upscaling.get_current_user_id")
+async def test_cancel_upscaling_task_cancels_active_jobs(
+    mock_current_user,
+    mock_get_task,
+    mock_remove_submissions,
+    mock_cancel_queued,
+    mock_get_submitted,
+    mock_cancel_jobs,
+    mock_update_statuses,
+    fake_upscaling_task_record,
+    fake_processing_job_record,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    fake_upscaling_task_record.status = ProcessingStatusEnum.RUNNING
+    mock_get_task.return_value = fake_upscaling_task_record
+    mock_get_submitted.return_value = [fake_processing_job_record]
+    mock_cancel_jobs.return_value = [fake_processing_job_record]
+
+    result = await cancel_upscaling_task("foobar-token", fake_db_session, 1)
+
+    assert result.id == fake_upscaling_task_record.id
+    mock_remove_submissions.assert_called_once_with(
+        fake_db_session, settings.submission_lease, upscaling_task_id=1
+    )
+    mock_cancel_queued.assert_called_once_with(fake_db_session, 1)
+    mock_cancel_jobs.assert_called_once_with(
+        "foobar-token", fake_db_session, [fake_processing_job_record]
+    )
+    mock_update_statuses.assert_called_once_with(
+        fake_db_session, {1: ProcessingStatusEnum.CANCELED}
+    )
+
+
+@pytest.mark.asyncio
+@patch("app.services.upscaling.cancel_processing_jobs")
+@patch("app.services.upscaling.get_upscale_task_by_user_id")
+@patch("app.services.upscaling.get_current_user_id")
+async def test_cancel_upscaling_task_skips_inactive_task(
+    mock_current_user,
+    mock_get_task,
+    mock_cancel_jobs,
+    fake_upscaling_task_record,
+    fake_db_session,
+):
+    mock_current_user.return_value = "foobar"
+    fake_upscaling_task_record.status = ProcessingStatusEnum.FINISHED
+    mock_get_task.return_value = fake_upscaling_task_record
+
+    result = await cancel_upscaling_task("foobar-token", fake_db_session, 1)
+
+    assert result.status == ProcessingStatusEnum.FINISHED
+    mock_cancel_jobs.assert_not_called()
+
+
+def test_get_upscaling_job_requests_for_grid_dimension(fake_upscaling_task_request):
+    aoi = {
+        "type": "Polygon",
+        "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+    }
+    request = UpscalingTaskRequest(
+        **fake_upscaling_task_request.model_dump(exclude={"dimension"}),
+        dimension=GridDimension(
+            name="spatial_extent", aoi=aoi, grid=GridTypeEnum.KM_20
+        ),
+    )
+
+    requests = get_upscaling_job_requests(request)
+
+    first = next(requests)
+    assert first.title == f"{request.title} - Processing Job 1"
+    assert first.parameters["spatial_extent"]["type"] == "Polygon"
+    assert "bbox" not in first.parameters["spatial_extent"]
+    assert 1 + sum(1 for _ in requests) >= 36
 
 
 def test_returns_running_if_any_running():
@@ -141,40 +693,39 @@ def test_returns_created_when_no_jobs():
     assert _get_upscale_status(jobs) == ProcessingStatusEnum.CREATED
 
 
-@patch("app.services.upscaling.update_upscale_task_status_by_id")
+@patch("app.services.upscaling.update_upscale_task_statuses")
 def test_refresh_updates_status(
     mock_update, fake_db_session, fake_upscaling_task_record
 ):
-    jobs = [make_job(ProcessingStatusEnum.RUNNING)]
+    fake_upscaling_task_record.jobs_total = 2
+    fake_upscaling_task_record.jobs_running = 1
+    fake_upscaling_task_record.jobs_queued = 1
 
-    updated_record = _refresh_record_status(
-        fake_db_session, fake_upscaling_task_record, jobs
-    )
+    updated_record = _refresh_record_status(fake_db_session, fake_upscaling_task_record)
 
     assert updated_record.status == ProcessingStatusEnum.RUNNING
     mock_update.assert_called_once_with(
-        fake_db_session, fake_upscaling_task_record.id, ProcessingStatusEnum.RUNNING
+        fake_db_session, {fake_upscaling_task_record.id: ProcessingStatusEnum.RUNNING}
     )
 
 
-@patch("app.services.upscaling.update_upscale_task_status_by_id")
+@patch("app.services.upscaling.update_upscale_task_statuses")
 def test_refresh_does_not_update_if_same(
     mock_update, fake_db_session, fake_upscaling_task_record
 ):
-    jobs = [make_job(fake_upscaling_task_record.status)]
+    fake_upscaling_task_record.jobs_total = 1
+    fake_upscaling_task_record.jobs_created = 1
 
-    updated_record = _refresh_record_status(
-        fake_db_session, fake_upscaling_task_record, jobs
-    )
+    updated_record = _refresh_record_status(fake_db_session, fake_upscaling_task_record)
 
     assert updated_record.status == fake_upscaling_task_record.status
-    mock_update.assert_not_called()
+    mock_update.assert_called_once_with(fake_db_session, {})
 
 
 @pytest.mark.asyncio
 @patch("app.services.upscaling.get_processing_jobs_by_user_id")
 @patch("app.services.upscaling.get_upscale_task_by_user_id")
-@patch("app.services.upscaling.update_upscale_task_status_by_id")
+@patch("app.services.upscaling.update_upscale_task_statuses")
 @patch("app.services.upscaling.get_current_user_id")
 async def test_returns_none_if_task_not_found(
     mock_current_user, mock_update, mock_get_task, mock_get_jobs, fake_db_session
@@ -240,35 +791,82 @@ async def test_get_task_skips_refresh_if_inactive(
 
 
 @pytest.mark.asyncio
-@patch("app.services.upscaling._refresh_record_status")
-@patch("app.services.upscaling.get_processing_jobs_by_user_id")
+@patch("app.services.upscaling._refresh_record_statuses")
+@patch("app.services.upscaling.refresh_job_statuses")
+@patch("app.services.upscaling.get_jobs_by_upscaling_task_ids")
 @patch("app.services.upscaling.get_upscale_tasks_by_user_id")
 @patch("app.services.upscaling.get_current_user_id")
 async def test_get_upscaling_tasks_refreshes_active(
-    mock_current_user, mock_get_tasks, mock_get_jobs, mock_refresh, fake_db_session
+    mock_current_user,
+    mock_get_tasks,
+    mock_get_jobs,
+    mock_refresh_jobs,
+    mock_refresh,
+    fake_db_session,
 ):
-    record = make_upscaling_record(ProcessingStatusEnum.RUNNING)
-    mock_get_tasks.return_value = [record]
-    mock_get_jobs.return_value = [make_job(ProcessingStatusEnum.RUNNING)]
-    mock_refresh.return_value = record
+    running = make_upscaling_record(ProcessingStatusEnum.RUNNING)
+    created = make_upscaling_record(ProcessingStatusEnum.CREATED)
+    created.id = 2
+    finished = make_upscaling_record(ProcessingStatusEnum.FINISHED)
+    finished.id = 3
+    mock_get_tasks.return_value = [running, created, finished]
+    mock_get_jobs.return_value = ["job-1", "job-2"]
 
     mock_current_user.return_value = "foobar"
 
     result = await get_upscaling_tasks_by_user_id("foobar-token", fake_db_session)
 
-    assert len(result) == 1
-    assert result[0].id == record.id
-    assert result[0].status == record.status
+    assert [task.id for task in result] == [1, 2, 3]
+    assert result[0].status == running.status
 
-    mock_get_jobs.assert_called_once_with("foobar-token", fake_db_session, 1)
-    mock_refresh.assert_called_once_with(
-        fake_db_session, record, mock_get_jobs.return_value
+    # The jobs of all active tasks are loaded and refreshed at once
+    mock_get_jobs.assert_called_once_with(fake_db_session, "foobar", [1, 2])
+    mock_refresh_jobs.assert_called_once_with(
+        "foobar-token", fake_db_session, ["job-1", "job-2"]
     )
+    mock_refresh.assert_called_once_with(fake_db_session, [running, created])
 
 
 @pytest.mark.asyncio
-@patch("app.services.upscaling._refresh_record_status")
-@patch("app.services.upscaling.get_processing_jobs_by_user_id")
+@patch("app.services.upscaling.update_upscale_task_statuses")
+@patch("app.services.upscaling.get_jobs_by_upscaling_task_ids")
+@patch("app.services.upscaling.get_upscale_tasks_by_user_id")
+@patch("app.services.upscaling.get_current_user_id")
+async def test_get_upscaling_tasks_serves_counters_when_reconciler_enabled(
+    mock_current_user,
+    mock_get_tasks,
+    mock_get_jobs,
+    mock_update,
+    fake_db_session,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "status_reconciler_enabled", True)
+    record = make_upscaling_record(ProcessingStatusEnum.CREATED)
+    record.jobs_total = 4
+    record.jobs_running = 1
+    record.jobs_finished = 2
+    record.jobs_failed = 1
+    mock_get_tasks.return_value = [record]
+    mock_current_user.return_value = "foobar"
+
+    result = await get_upscaling_tasks_by_user_id("foobar-token", fake_db_session)
+
+    assert result[0].status == ProcessingStatusEnum.RUNNING
+    assert result[0].progress == 75.0
+    # The task is served from its own record, without loading its jobs
+    mock_get_jobs.assert_not_called()
+    mock_update.assert_called_once_with(
+        fake_db_session, {record.id: ProcessingStatusEnum.RUNNING}
+    )
+
+
+def test_get_progress_without_jobs():
+    assert _get_progress(make_upscaling_record(ProcessingStatusEnum.CREATED)) == 0.0
+
+
+@pytest.mark.asyncio
+@patch("app.services.upscaling._refresh_record_statuses")
+@patch("app.services.upscaling.get_jobs_by_upscaling_task_ids")
 @patch("app.services.upscaling.get_upscale_tasks_by_user_id")
 @patch("app.services.upscaling.get_current_user_id")
 async def test_get_upscaling_tasks_skips_inactive(
@@ -285,4 +883,4 @@ async def test_get_upscaling_tasks_skips_inactive(
     assert result[0].id == record.id
     assert result[0].status == record.status
     mock_get_jobs.assert_not_called()
-    mock_refresh.assert_not_called()
+    mock_refresh.assert_called_once_with(fake_db_session, [])
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import pytest
+
+from app.cache import TTLCache
+
+
+def test_get_returns_cached_value():
+    cache: TTLCache[str] = TTLCache(max_size=10)
+    cache.put("a", "connection-a", time.time() + 60)
+
+    assert cache.get("a") == "connection-a"
+    assert cache.get("b") is None
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_get_evicts_expired_value():
+    cache: TTLCache[str] = TTLCache(max_size=10)
+    cache.put("a", "connection-a", time.time() - 1)
+
+    assert cache.get("a") is None
+    assert cache.stats() == {"size": 0, "hits": 0, "misses": 1, "evictions": 1}
+
+
+def test_put_evicts_least_recently_used_value():
+    cache: TTLCache[str] = TTLCache(max_size=2)
+    expires_at = time.time() + 60
+    cache.put("a", "connection-a", expires_at)
+    cache.put("b", "connection-b", expires_at)
+    cache.get("a")
+    cache.put("c", "connection-c", expires_at)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_lock_serializes_coroutines_per_key():
+    cache: TTLCache[str] = TTLCache(max_size=10)
+    running = 0
+    max_running = 0
+
+    async def hold(key: str):
+        nonlocal running, max_running
+        async with cache.lock(key):
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*[hold("a") for _ in range(3)])
+    assert max_running == 1
+
+    await asyncio.gather(hold("a"), hold("b"))
+    assert max_running == 2
+    assert cache._key_locks == {}